@@ -13,8 +13,12 @@ setup(
         "pydantic>=2.0.0",
         "requests>=2.0.0",
         "python-dotenv>=1.0.0",
+        "orjson>=3.8.0",
     ],
     extras_require={
+        "zstd": [
+            "zstandard>=0.21.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -28,7 +32,7 @@ setup(
             "termora=termora.cli.main:app",
         ],
     },
-    python_requires=">=3.8",
+    python_requires=">=3.10",
     author="Ayman Fouad",
     author_email="shaikmoa@mcmaster.ca",
     description="The Agentic AI Terminal Assistant",
@@ -40,8 +44,7 @@ setup(
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
     ],
 ) 
\ No newline at end of file
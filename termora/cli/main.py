@@ -5,6 +5,7 @@ Termora CLI - Main user interface for the Termora terminal assistant.
 import os
 import sys
 import argparse
+import logging
 from typing import Optional, List, Dict, Any
 from rich.console import Console
 from rich.panel import Panel
@@ -29,7 +30,7 @@ termora_theme = Theme({
 class TermoraCLI:
     """Main CLI interface for Termora."""
     
-    def __init__(self, model: str = "groq", verbose: bool = False, debug: bool = False):
+    def __init__(self, model: str = "groq", verbose: bool = False, debug: bool = False, two_step: bool = False):
         """
         Initialize the Termora CLI.
         
@@ -37,6 +38,7 @@ class TermoraCLI:
             model: AI model to use ("openai", "groq", or "ollama")
             verbose: Whether to show verbose output
             debug: Whether to enable pipeline debug mode
+            two_step: Whether to extract intent and generate the plan with separate AI calls
         """
         self.verbose = verbose
         self.console = Console(theme=termora_theme)
@@ -48,7 +50,7 @@ class TermoraCLI:
             "temperature": 0.7,
             "max_tokens": 2000
         }
-        self.pipeline = TermoraPipeline.from_config(agent_config, debug=debug)
+        self.pipeline = TermoraPipeline.from_config(agent_config, debug=debug, fused=not two_step)
 
     def _display_welcome(self) -> None:
         """Display the welcome message."""
@@ -148,13 +150,23 @@ def parse_args(args: List[str]) -> Dict[str, Any]:
         action="store_true",
         help="Enable debug mode to inspect pipeline steps"
     )
+    parser.add_argument(
+        "--two-step",
+        action="store_true",
+        help="Extract intent and generate the plan with separate AI calls (slower; useful with --debug)"
+    )
     
     return vars(parser.parse_args(args))
 
 def main() -> None:
     """Main entry point for the CLI."""
     args = parse_args(sys.argv[1:])
-    cli = TermoraCLI(model=args["model"], verbose=args["verbose"], debug=args["debug"])
+    
+    # Pipeline progress is logged at debug level and only shown with --verbose
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("termora").setLevel(logging.DEBUG if args["verbose"] else logging.WARNING)
+    
+    cli = TermoraCLI(model=args["model"], verbose=args["verbose"], debug=args["debug"], two_step=args["two_step"])
     cli.start_repl()
 
 if __name__ == "__main__":
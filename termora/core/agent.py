@@ -9,15 +9,15 @@ Key functionality:
 - TermoraAgent: The main class that interacts with AI models
 - ActionPlan: A structured plan of actions to be executed
 - generate_plan: Creates an execution plan from natural language
+- get_raw_completions: Sends several prompts concurrently
 - process_request: Async version for creating execution plans
 """
 
 import os
-import json
 import sys
 import subprocess
 import tempfile
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Tuple, Any, Union, Iterator
 from pathlib import Path
 import re
 from dotenv import load_dotenv
@@ -25,6 +25,7 @@ import asyncio
 
 # For AI model integration
 import litellm
+import orjson
 import requests
 
 # Internal imports
@@ -33,6 +34,37 @@ from termora.core.history import HistoryManager
 from termora.utils.helpers import get_termora_dir
 from termora.utils.helpers import is_destructive_command
 
+# Widest {...} span in a response, which is parsed as the plan JSON
+_JSON_BLOCK_RE = re.compile(r'{.*}', re.DOTALL)
+
+# Command-line flags such as -f or --force
+_FLAG_RE = re.compile(r'\s-[a-zA-Z]|\s--[a-zA-Z]')
+
+# Input starting with one of these is treated as a shell command
+_COMMAND_PREFIXES = (
+    'ls', 'cd', 'mkdir', 'rm', 'cp', 'mv', 'cat', 'echo',
+    'grep', 'find', 'git', 'python', 'pip', 'npm', 'ssh',
+    'curl', 'wget', 'sudo', 'apt', 'brew', 'open', 'touch'
+)
+
+# Request headers for JSON bodies serialized with orjson
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Canned responses don't change, so they are serialized once
+_OFFLINE_FALLBACK_RESPONSE = orjson.dumps({
+    "explanation": "API requests are disabled. Using offline fallback mode with limited functionality.",
+    "commands": ["echo 'API requests are disabled. Please enable SEND_TO_API in your .env file or use --allow-api flag.'"],
+    "requires_backup": False,
+    "backup_paths": []
+}).decode()
+
+_ERROR_FALLBACK_RESPONSE = orjson.dumps({
+    "explanation": "There was an error processing your request. Please check your API key and internet connection.",
+    "commands": ["echo 'Error: Could not connect to AI service. Please check your configuration.'"],
+    "requires_backup": False,
+    "backup_paths": []
+}).decode()
+
 class ActionPlan:
     """
     Represents a structured plan of actions to be executed.
@@ -143,7 +175,8 @@ class TermoraAgent:
             "max_tokens": int(os.getenv("MAX_TOKENS", "2000")),  # Increased for code generation
             "temperature": float(os.getenv("TEMPERATURE", "0.7")),
             "send_to_api": os.getenv("SEND_TO_API", "True").lower() == "true",
-            "ollama_host": os.getenv("OLLAMA_HOST", "http://localhost:11434")
+            "ollama_host": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
+            "draft_model": os.getenv("DRAFT_AI_MODEL")  # Optional smaller model tried first for intent extraction
         }
         
         # Override defaults with provided config
@@ -157,6 +190,16 @@ class TermoraAgent:
         
         # Create history manager
         self.history_manager = HistoryManager()
+        
+        # Keep-alive connection pool shared by all direct HTTP calls (Ollama), so only the
+        # first request to the server pays for the TCP handshake
+        self._session = requests.Session()
+        self._session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=20))
+        self._session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=20))
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self._session.close()
     
     @staticmethod
     def is_direct_command(input_text: str) -> bool:
@@ -195,13 +238,9 @@ class TermoraAgent:
             # Contains semicolon or &&
             ';' in input_text or '&&' in input_text,
             # Starts with common command name
-            any(input_text.startswith(cmd) for cmd in [
-                'ls', 'cd', 'mkdir', 'rm', 'cp', 'mv', 'cat', 'echo',
-                'grep', 'find', 'git', 'python', 'pip', 'npm', 'ssh',
-                'curl', 'wget', 'sudo', 'apt', 'brew', 'open', 'touch'
-            ]),
+            input_text.startswith(_COMMAND_PREFIXES),
             # Contains flag pattern (-f, --flag)
-            bool(re.search(r'\s-[a-zA-Z]|\s--[a-zA-Z]', input_text))
+            bool(_FLAG_RE.search(input_text))
         ]
         
         # If any pattern matches, it's likely a direct command
@@ -215,6 +254,8 @@ class TermoraAgent:
             self.config["api_key"] = os.getenv("GROQ_API_KEY")
         elif provider == "openai":
             self.config["api_key"] = os.getenv("OPENAI_API_KEY")
+        elif provider == "anthropic":
+            self.config["api_key"] = os.getenv("ANTHROPIC_API_KEY")
         elif provider == "ollama":
             # No API key needed for local Ollama
             pass
@@ -463,18 +504,21 @@ class TermoraAgent:
         # Parse the response
         return self._parse_response(response, user_request)
     
-    async def _call_ai_provider(self, prompt: str) -> str:
+    async def _call_ai_provider(self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None) -> str:
         """
         Call the AI provider with the given prompt.
         
         Args:
             prompt: The prepared prompt string
+            system_prompt: Static instructions sent ahead of the prompt (optional).
+                Keeping them identical across calls lets providers reuse their prefix cache.
+            model: Model to use instead of the configured one (optional)
             
         Returns:
             The AI response as a string
         """
         provider = self.config["ai_provider"].lower()
-        model = self.config["ai_model"]
+        model = model or self.config["ai_model"]
         
         # Check if we should send to API
         if not self.config["send_to_api"]:
@@ -482,12 +526,12 @@ class TermoraAgent:
         
         try:
             if provider == "ollama":
-                return await self._call_ollama(prompt)
+                return await self._call_ollama(prompt, system_prompt, model)
             else:
                 # Use litellm for other providers
                 response = await litellm.acompletion(
                     model=f"{provider}/{model}",
-                    messages=[{"role": "user", "content": prompt}],
+                    messages=self._build_messages(prompt, system_prompt),
                     api_key=self.config["api_key"],
                     max_tokens=self.config["max_tokens"],
                     temperature=self.config["temperature"]
@@ -500,33 +544,63 @@ class TermoraAgent:
             # Return a fallback response
             return self._get_error_fallback_response()
         
-    async def _call_ollama(self, prompt: str) -> str:
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Build the chat messages for a prompt.
+        
+        The static system prompt goes first so that requests share the longest possible prefix.
+        OpenAI and Groq cache such prefixes automatically; Anthropic only caches blocks
+        marked with cache_control, so the system prompt is marked for it.
+        
+        Args:
+            prompt: The prepared prompt string
+            system_prompt: Static instructions sent ahead of the prompt (optional)
+            
+        Returns:
+            List of chat messages
+        """
+        messages: List[Dict[str, Any]] = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            if self.config["ai_provider"].lower() == "anthropic":
+                content = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+            else:
+                content = system_prompt
+            messages.insert(0, {"role": "system", "content": content})
+        return messages
+    
+    def _ollama_payload(self, prompt: str, system_prompt: Optional[str], model: Optional[str], stream: bool) -> Dict[str, Any]:
+        """Build the request body for Ollama's generate endpoint."""
+        payload = {
+            "model": model or self.config["ai_model"],
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": self.config["temperature"],
+                "num_predict": self.config["max_tokens"],
+            }
+        }
+        if system_prompt:
+            payload["system"] = system_prompt
+        return payload
+    
+    async def _call_ollama(self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None) -> str:
         """
         Call a local Ollama instance with the given prompt.
         
         Args:
             prompt: The prepared prompt string
+            system_prompt: Static instructions sent ahead of the prompt (optional)
+            model: Model to use instead of the configured one (optional)
             
         Returns:
             The AI response as a string
         """
         try:
             ollama_url = f"{self.config['ollama_host']}/api/generate"
-            response = requests.post(
-                ollama_url,
-                json={
-                    "model": self.config["ai_model"],
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": self.config["temperature"],
-                        "num_predict": self.config["max_tokens"],
-                    }
-                },
-                timeout=30
-            )
+            payload = self._ollama_payload(prompt, system_prompt, model, stream=False)
+            response = self._session.post(ollama_url, data=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=30)
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             return result.get("response", "")
             
         except Exception as e:
@@ -543,12 +617,7 @@ class TermoraAgent:
         Returns:
             A simple fallback response
         """
-        return json.dumps({
-            "explanation": "API requests are disabled. Using offline fallback mode with limited functionality.",
-            "commands": ["echo 'API requests are disabled. Please enable SEND_TO_API in your .env file or use --allow-api flag.'"],
-            "requires_backup": False,
-            "backup_paths": []
-        })
+        return _OFFLINE_FALLBACK_RESPONSE
     
     def _get_error_fallback_response(self) -> str:
         """
@@ -557,12 +626,7 @@ class TermoraAgent:
         Returns:
             A simple error response
         """
-        return json.dumps({
-            "explanation": "There was an error processing your request. Please check your API key and internet connection.",
-            "commands": ["echo 'Error: Could not connect to AI service. Please check your configuration.'"],
-            "requires_backup": False,
-            "backup_paths": []
-        })
+        return _ERROR_FALLBACK_RESPONSE
         
     def _parse_response(self, response: str, original_request: str) -> ActionPlan:
         """
@@ -578,10 +642,10 @@ class TermoraAgent:
         
         try:
             # Try to extract JSON from the response
-            json_match = re.search(r'{.*}', response, re.DOTALL)
+            json_match = _JSON_BLOCK_RE.search(response)
             if json_match:
                 json_str = json_match.group(0)
-                data = json.loads(json_str)
+                data = orjson.loads(json_str)
                 
                 # Create ActionPlan from the data
                 return ActionPlan(
@@ -649,12 +713,14 @@ class TermoraAgent:
                 "return_code": 1
             }
     
-    def get_raw_completion(self, prompt: str) -> str:
+    def get_raw_completion(self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None) -> str:
         """
         Get a raw completion from the AI without parsing into an action plan.
         
         Args:
             prompt: The prompt to send to the AI
+            system_prompt: Static instructions sent as the system message (optional)
+            model: Model to use instead of the configured one (optional)
             
         Returns:
             Raw AI response as string
@@ -669,6 +735,107 @@ class TermoraAgent:
                 asyncio.set_event_loop(loop)
                 
             # Call AI provider directly
-            return loop.run_until_complete(self._call_ai_provider(prompt))
+            return loop.run_until_complete(self._call_ai_provider(prompt, system_prompt, model))
         except Exception as e:
-            return f"Error getting completion: {str(e)}"
\ No newline at end of file
+            return f"Error getting completion: {str(e)}"
+    
+    def get_raw_completions(self, prompts: List[Tuple[str, Optional[str]]], model: Optional[str] = None) -> List[str]:
+        """
+        Get raw completions for several prompts with concurrent requests.
+        
+        Args:
+            prompts: (prompt, system_prompt) pairs
+            model: Model to use instead of the configured one (optional)
+            
+        Returns:
+            Raw AI responses, in the same order as the prompts
+        """
+        async def gather():
+            return await asyncio.gather(
+                *(self._call_ai_provider(prompt, system_prompt, model) for prompt, system_prompt in prompts)
+            )
+        
+        try:
+            try:
+                loop = asyncio.get_event_loop()
+            except RuntimeError:
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+            
+            return list(loop.run_until_complete(gather()))
+        except Exception as e:
+            return [f"Error getting completion: {str(e)}"] * len(prompts)
+    
+    def stream_raw_completion(self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None) -> Iterator[str]:
+        """
+        Stream a raw completion from the AI as it is generated.
+        
+        Closing the returned generator early closes the underlying connection, so callers
+        can stop reading once they have what they need.
+        
+        Args:
+            prompt: The prompt to send to the AI
+            system_prompt: Static instructions sent as the system message (optional)
+            model: Model to use instead of the configured one (optional)
+            
+        Yields:
+            Pieces of the response text
+        """
+        provider = self.config["ai_provider"].lower()
+        model = model or self.config["ai_model"]
+        
+        # Check if we should send to API
+        if not self.config["send_to_api"]:
+            yield self._get_offline_fallback_response(prompt)
+            return
+        
+        try:
+            if provider == "ollama":
+                yield from self._stream_ollama(prompt, system_prompt, model)
+            else:
+                # Use litellm for other providers
+                response = litellm.completion(
+                    model=f"{provider}/{model}",
+                    messages=self._build_messages(prompt, system_prompt),
+                    api_key=self.config["api_key"],
+                    max_tokens=self.config["max_tokens"],
+                    temperature=self.config["temperature"],
+                    stream=True
+                )
+                for chunk in response:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
+        except Exception as e:
+            # Log the error
+            print(f"Error calling AI provider: {str(e)}")
+            
+            # Return a fallback response
+            yield self._get_error_fallback_response()
+    
+    def _stream_ollama(self, prompt: str, system_prompt: Optional[str], model: Optional[str]) -> Iterator[str]:
+        """
+        Stream a completion from a local Ollama instance.
+        
+        Args:
+            prompt: The prepared prompt string
+            system_prompt: Static instructions sent ahead of the prompt (optional)
+            model: Model to use instead of the configured one (optional)
+            
+        Yields:
+            Pieces of the response text
+        """
+        ollama_url = f"{self.config['ollama_host']}/api/generate"
+        payload = self._ollama_payload(prompt, system_prompt, model, stream=True)
+        
+        # Ollama streams one JSON object per line
+        with self._session.post(ollama_url, data=orjson.dumps(payload), headers=_JSON_HEADERS, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = orjson.loads(line)
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    break
@@ -0,0 +1,168 @@
+"""
+Backup archive format for Termora.
+
+Backups are tar archives compressed with Zstandard when the optional zstandard
+package is installed (pip install termora[zstd]) and with gzip otherwise. Zstandard
+compresses several times faster and on all cores, and decompresses about twice as
+fast, at a similar ratio. Archives are recognized by their first bytes, so existing
+.tar.gz backups keep restoring after zstandard is installed.
+
+Key functionality:
+- backup_suffix: File suffix for new backups
+- write_archive: Archive a directory
+- extract_archive: Extract a backup of either format
+- gnu_tar / restore_with_tar: Restore a backup in place with the system's GNU tar
+"""
+
+import shutil
+import subprocess
+import tarfile
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Union
+
+# Suffixes of backup archives, in order of preference
+BACKUP_SUFFIXES = (".tar.zst", ".tar.gz")
+
+# Magic numbers at the start of each compressed format
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Archives are read in blocks of this size when extracting
+_READ_BUFFER_SIZE = 1024 * 1024
+
+# Zstandard level for backups; level 3 is the library default and balances speed and size
+_ZSTD_LEVEL = 3
+
+
+@lru_cache(maxsize=1)
+def _zstandard():
+    """Import zstandard once, returning None if it isn't installed."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def backup_suffix() -> str:
+    """
+    Get the file suffix for new backups.
+
+    Returns:
+        ".tar.zst" if zstandard is installed, ".tar.gz" otherwise
+    """
+    return BACKUP_SUFFIXES[0] if _zstandard() is not None else BACKUP_SUFFIXES[1]
+
+
+def write_archive(source_dir: Union[str, Path], archive_path: Union[str, Path]) -> None:
+    """
+    Archive the contents of a directory.
+
+    The compression is chosen by the suffix of archive_path (see backup_suffix).
+
+    Args:
+        source_dir: Directory whose contents are archived, relative to the archive root
+        archive_path: Archive file to create
+    """
+    if not str(archive_path).endswith(".tar.zst"):
+        with tarfile.open(archive_path, "w:gz") as tar:
+            tar.add(source_dir, arcname="")
+        return
+
+    zstandard = _zstandard()
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to write .tar.zst backups")
+
+    compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL, threads=-1)
+    with open(archive_path, "wb") as f, compressor.stream_writer(f) as stream:
+        with tarfile.open(fileobj=stream, mode="w|") as tar:
+            tar.add(source_dir, arcname="")
+
+
+def extract_archive(archive_path: Union[str, Path], dest: Union[str, Path]) -> List[str]:
+    """
+    Extract a backup archive, gzip or Zstandard.
+
+    The archive is read as a single stream, through a large buffer so decompression
+    isn't fed by many small reads.
+
+    Args:
+        archive_path: Backup archive
+        dest: Directory to extract into
+        
+    Returns:
+        Paths of the regular files extracted, relative to dest
+    """
+    with open(archive_path, "rb", buffering=_READ_BUFFER_SIZE) as f:
+        # Peeking leaves the magic number in the buffer for the decompressor
+        magic = f.peek(len(_ZSTD_MAGIC))[:len(_ZSTD_MAGIC)]
+
+        if not magic.startswith(_ZSTD_MAGIC):
+            # gzip, and anything else tarfile can make sense of
+            mode = "r|gz" if magic.startswith(_GZIP_MAGIC) else "r|*"
+            with tarfile.open(fileobj=f, mode=mode, bufsize=_READ_BUFFER_SIZE) as tar:
+                return _extract_members(tar, dest)
+
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to restore {Path(archive_path).name}; "
+                               "install it with: pip install zstandard")
+
+        with zstandard.ZstdDecompressor().stream_reader(f, read_size=_READ_BUFFER_SIZE) as stream:
+            with tarfile.open(fileobj=stream, mode="r|", bufsize=_READ_BUFFER_SIZE) as tar:
+                return _extract_members(tar, dest)
+
+
+def _extract_members(tar: tarfile.TarFile, dest: Union[str, Path]) -> List[str]:
+    """Extract every member of an open archive and list its regular files from the archive's own index."""
+    tar.extractall(path=dest)
+    # Extraction has already read every header, so this doesn't read the archive again
+    return [member.name for member in tar.getmembers() if member.isfile()]
+
+
+@lru_cache(maxsize=1)
+def gnu_tar() -> Optional[str]:
+    """
+    Find the system's GNU tar.
+
+    Other tar implementations are ignored, since restores rely on GNU options.
+
+    Returns:
+        Path to GNU tar, or None if it isn't installed
+    """
+    tar = shutil.which("tar")
+    if tar is None:
+        return None
+    try:
+        version = subprocess.run([tar, "--version"], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return tar if "GNU tar" in version else None
+
+
+def restore_with_tar(archive_path: Union[str, Path], root: Union[str, Path] = "/") -> None:
+    """
+    Extract a backup straight to its original locations with GNU tar.
+
+    This skips extracting to a temporary directory and copying the files back, and
+    GNU tar detects the compression (gzip or zstd) by itself. Existing directories keep
+    their permissions and timestamps: backups contain the directories they were staged
+    in, down to the root itself.
+
+    Args:
+        archive_path: Backup archive
+        root: Directory the archive's paths are relative to
+
+    Raises:
+        RuntimeError: If GNU tar isn't available or the extraction fails
+    """
+    tar = gnu_tar()
+    if tar is None:
+        raise RuntimeError("GNU tar is not available")
+    result = subprocess.run(
+        [tar, "--extract", "--file", str(archive_path), "--directory", str(root), "--no-overwrite-dir"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"tar failed: {result.stderr.strip()}")
@@ -0,0 +1,127 @@
+"""
+Request batching module for Termora.
+
+When one pipeline serves several users at once, each request would otherwise wait
+for its own model call. This module collects prompts that arrive within a short
+window and sends them together, so the provider sees one burst of requests that
+share the same system prompt.
+
+Key functionality:
+- BatchingAgent: Agent wrapper that batches concurrent raw completion requests
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class BatchingAgent:
+    """
+    Wraps a TermoraAgent and batches concurrent get_raw_completion calls.
+    
+    Calls block until their batch has been answered. A batch is sent once it holds
+    max_batch prompts or the oldest prompt has waited max_wait seconds.
+    """
+    
+    def __init__(self, agent, max_batch: int = 8, max_wait: float = 0.005):
+        """
+        Initialize the batching wrapper.
+        
+        Args:
+            agent: Agent providing get_raw_completions
+            max_batch: Maximum number of prompts sent in one batch
+            max_wait: Seconds the first prompt of a batch waits for others to join
+        """
+        self.agent = agent
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        
+        self._pending: List[Tuple[str, Optional[str], Optional[str], Future]] = []
+        self._batch_start = 0.0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="termora-batcher")
+        self._flusher.start()
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuration of the wrapped agent."""
+        return self.agent.config
+    
+    def get_raw_completion(self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None) -> str:
+        """
+        Get a raw completion, sent together with other prompts queued at the same time.
+        
+        Args:
+            prompt: The prompt to send to the AI
+            system_prompt: Static instructions sent as the system message (optional)
+            model: Model to use instead of the configured one (optional)
+            
+        Returns:
+            Raw AI response as string
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BatchingAgent is closed")
+            if not self._pending:
+                self._batch_start = time.monotonic()
+            self._pending.append((prompt, system_prompt, model, future))
+            self._condition.notify()
+        return future.result()
+    
+    def close(self) -> None:
+        """Send any queued prompts, stop the flusher thread and close the wrapped agent."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._flusher.join()
+        if hasattr(self.agent, "close"):
+            self.agent.close()
+    
+    def _flush_loop(self) -> None:
+        """Wait for prompts and send them in batches until closed."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                
+                # Give other requests a moment to join the batch
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = self._batch_start + self.max_wait - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                self._batch_start = time.monotonic()
+            
+            self._send(batch)
+    
+    def _send(self, batch: List[Tuple[str, Optional[str], Optional[str], Future]]) -> None:
+        """
+        Send one batch, grouped by model, and resolve the callers' futures.
+        
+        Args:
+            batch: Queued (prompt, system_prompt, model, future) entries
+        """
+        by_model: Dict[Optional[str], List[Tuple[str, Optional[str], Optional[str], Future]]] = {}
+        for entry in batch:
+            by_model.setdefault(entry[2], []).append(entry)
+        
+        for model, entries in by_model.items():
+            try:
+                responses = self.agent.get_raw_completions(
+                    [(prompt, system_prompt) for prompt, system_prompt, _, _ in entries], model=model
+                )
+            except Exception as e:
+                for *_, future in entries:
+                    future.set_exception(e)
+                continue
+            
+            for (*_, future), response in zip(entries, responses):
+                future.set_result(response)
@@ -0,0 +1,351 @@
+"""
+Caching module for Termora.
+
+This module provides small in-memory caches used to skip repeated AI model calls
+when the same request is processed more than once.
+
+Key functionality:
+- LRUCache: Bounded mapping that evicts the least recently used entry
+- make_cache_key: Stable hash key built from request components
+- FrozenDict: Immutable, hashable dictionary for use inside cache keys
+- PromptCache: Model responses keyed by the exact prompt, with expiry and optional persistence
+- SimilarityCache: Values looked up by the normalized wording of a previous request
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+
+import orjson
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from JSON-serializable parts.
+
+    Args:
+        parts: Values identifying the cached item (strings, dicts, lists, ...)
+
+    Returns:
+        Hex digest of the serialized parts
+    """
+    return hashlib.sha256(orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class FrozenDict(dict):
+    """
+    Immutable dictionary that can be hashed and used as (part of) a cache key.
+    
+    It is still a dict, so it serializes and reads like the dictionaries it replaces.
+    """
+    
+    __slots__ = ("_hash",)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Nested values are frozen too so the whole mapping is hashable
+        for key, value in dict.items(self):
+            dict.__setitem__(self, key, freeze(value))
+        self._hash = None
+    
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+    
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenDict is immutable")
+    
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+    
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """
+    Convert dictionaries and lists (recursively) into hashable equivalents.
+    
+    Args:
+        value: Value to freeze
+        
+    Returns:
+        FrozenDict for dictionaries, tuple for lists, and the value itself otherwise
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class LRUCache:
+    """
+    Bounded in-memory cache with least-recently-used eviction.
+
+    Values are stored as serialized JSON and decoded on every hit, so callers
+    always get a fresh copy they are free to modify.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before the oldest are evicted
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            A copy of the cached value, or None on a miss
+        """
+        data = self._entries.get(key)
+        if data is None:
+            return None
+        self._entries.move_to_end(key)
+        return orjson.loads(data)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        self._entries[key] = orjson.dumps(value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+class PromptCache:
+    """
+    Model responses keyed by a hash of the exact prompt that produced them.
+    
+    Entries expire after ttl seconds and the least recently used entries are evicted
+    once maxsize is reached. Safe to use from several threads. When a path is given,
+    entries are loaded from it on creation and written back by save(), so responses
+    survive restarts.
+    """
+    
+    def __init__(self, maxsize: int = 1000, ttl: float = 3600.0, path: Optional[Path] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of responses kept
+            ttl: Seconds a response stays valid
+            path: File the cache is persisted to (optional)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path is not None:
+            self._load()
+    
+    @staticmethod
+    def key(prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None) -> bytes:
+        """
+        Build the cache key for a rendered prompt.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt sent with it (optional)
+            model: Model override the prompt is sent to (optional)
+            
+        Returns:
+            SHA-256 digest of the prompt parts
+        """
+        digest = hashlib.sha256()
+        for part in (model or "", system_prompt or "", prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.digest()
+    
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Key from PromptCache.key
+            
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, response = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+    
+    def put(self, key: bytes, response: str) -> None:
+        """
+        Store a response.
+        
+        Args:
+            key: Key from PromptCache.key
+            response: Model response for the prompt
+        """
+        with self._lock:
+            # Wall-clock time, so expiry still holds for entries loaded after a restart
+            self._entries[key] = (time.time(), response)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._dirty = True
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+    
+    def save(self) -> None:
+        """Write the unexpired entries to the cache file, if there is one and anything changed."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            now = time.time()
+            rows = [[key.hex(), stored_at, response] for key, (stored_at, response) in self._entries.items()
+                    if now - stored_at <= self.ttl]
+            self._dirty = False
+        
+        # Write to a temporary file first so an interrupted save can't corrupt the cache
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(orjson.dumps(rows))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+    
+    def _load(self) -> None:
+        """Read unexpired entries from the cache file, oldest first."""
+        try:
+            rows = orjson.loads(self.path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return
+        
+        now = time.time()
+        for row in rows[-self.maxsize:]:
+            try:
+                key, stored_at, response = row
+                if now - stored_at <= self.ttl:
+                    self._entries[bytes.fromhex(key)] = (stored_at, response)
+            except (TypeError, ValueError):
+                continue
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Words, paths and globs in a request
+_WORD_RE = re.compile(r"[\w.~/*-]+")
+
+# Filler words that don't change what a request asks for. Prepositions such as "to",
+# "from" and "into" are kept: they decide which way a command works.
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "my", "me", "i", "all", "please", "can", "could", "you", "would",
+})
+
+
+def _normalize_request(text: str) -> Tuple[str, ...]:
+    """The words of a request that matter, lowercased and in their original order."""
+    return tuple(word for word in _WORD_RE.findall(text.lower()) if word not in _STOP_WORDS)
+
+
+class SimilarityCache:
+    """
+    Values looked up by the normalized wording of a request.
+    
+    Requests match when they differ only in case, spacing, punctuation and filler
+    words ("list all the python files" / "please list python files"). Word order,
+    numbers and paths must be identical, since reordering arguments ("copy a to b" /
+    "copy b to a") or changing a number changes what the command does. Entries are
+    grouped by scope (such as the working directory) and never match across scopes.
+    """
+    
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self._entries = LRUCache(maxsize=maxsize)
+    
+    def get(self, text: str, scope: Hashable = None) -> Optional[Any]:
+        """
+        Find the value stored for an equivalently worded request.
+        
+        Args:
+            text: Request text
+            scope: Scope the request was made in
+            
+        Returns:
+            A copy of the stored value, or None if no request matches
+        """
+        words = _normalize_request(text)
+        if not words:
+            return None
+        return self._entries.get((scope, words))
+    
+    def put(self, text: str, value: Any, scope: Hashable = None) -> None:
+        """
+        Store a JSON-serializable value for a request.
+        
+        Args:
+            text: Request text
+            value: Value to cache
+            scope: Scope the request was made in
+        """
+        words = _normalize_request(text)
+        if words:
+            self._entries.put((scope, words), value)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
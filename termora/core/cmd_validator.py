@@ -0,0 +1,116 @@
+"""
+Deterministic checks for generated commands.
+
+Model-generated commands are checked here before they reach the executor, instead of
+asking the model to double-check its own syntax. The checks are cheap and catch the
+mistakes that make a command fail outright, or make it catastrophic.
+
+Key functionality:
+- validate_command: Check a shell command's quoting and nesting, and reject known-fatal operations
+- validate_python: Check that Python code compiles
+"""
+
+import re
+from typing import Optional
+
+# Operations that are never part of a reasonable plan: wiping the root or home directory,
+# formatting or overwriting disks, fork bombs and making everything world-writable
+_FORBIDDEN_RE = re.compile(
+    r"""
+    \brm\s+(?:-[a-zA-Z]+\s+|--[a-z-]+\s+)*(["']?)(?:/|/\*|~/?|\$HOME/?)\1(?=\s|;|&|\||$)   # rm -rf / or ~
+    | \bmkfs(?:\.\w+)?\b                                                          # make a filesystem
+    | \bdd\b[^;&|]*\bof=/dev/(?:sd|hd|nvme|disk|mmcblk)                           # overwrite a disk
+    | >\s*/dev/(?:sd|hd|nvme|disk|mmcblk)                                         # redirect onto a disk
+    | :\s*\(\s*\)\s*\{\s*:\s*\|\s*:\s*&\s*\}\s*;\s*:                              # fork bomb
+    | \bchmod\s+(?:-[a-zA-Z]+\s+)*0?777\s+/(?=\s|;|&|\||$)                        # chmod 777 /
+    """,
+    re.VERBOSE,
+)
+
+# Characters that change the scanner's state; everything else is skipped in bulk
+_SHELL_SPECIAL_RE = re.compile(r"""[\\'"`()]|\$\(""")
+
+
+def validate_command(command: str) -> Optional[str]:
+    """
+    Check a generated shell command before it is run.
+
+    Quotes, backticks and parentheses are matched with a single pass over the command
+    (following the shell's quoting rules closely enough for generated commands), and the
+    command is checked against a list of forbidden operations.
+
+    Args:
+        command: Shell command
+
+    Returns:
+        Description of the problem, or None if the command looks valid
+    """
+    if not command.strip():
+        return "empty command"
+
+    forbidden = _FORBIDDEN_RE.search(command)
+    if forbidden:
+        return f"forbidden operation: {forbidden.group(0).strip()}"
+
+    # Here-documents contain free text the scanner can't follow
+    if "<<" in command:
+        return None
+
+    quote = None  # "'" or '"' while inside quotes
+    depth = 0  # Open ( and $( groups
+    backtick = False
+    pos = 0
+    while True:
+        match = _SHELL_SPECIAL_RE.search(command, pos)
+        if match is None:
+            break
+        token = match.group(0)
+        pos = match.end()
+
+        if quote == "'":
+            # Nothing is special inside single quotes except the closing quote
+            if token == "'":
+                quote = None
+            continue
+
+        if token == "\\":
+            pos += 1  # Skip the escaped character
+        elif token in ("'", '"'):
+            if quote == '"' and token == "'":
+                continue
+            quote = None if quote == token else token
+        elif token == "`":
+            backtick = not backtick
+        elif token == "$(":
+            depth += 1
+        elif quote is None and token == "(":
+            depth += 1
+        elif token == ")" and depth:
+            depth -= 1
+
+    if quote == "'":
+        return "unmatched single quote"
+    if quote == '"':
+        return "unmatched double quote"
+    if backtick:
+        return "unmatched backtick"
+    if depth:
+        return "unclosed parenthesis or $( substitution"
+    return None
+
+
+def validate_python(code: str) -> Optional[str]:
+    """
+    Check that generated Python code compiles.
+
+    Args:
+        code: Python source
+
+    Returns:
+        Description of the syntax error, or None if the code compiles
+    """
+    try:
+        compile(code, "<plan>", "exec")
+    except (SyntaxError, ValueError) as e:
+        return f"invalid Python: {e}"
+    return None
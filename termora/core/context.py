@@ -9,6 +9,7 @@ Key functionality:
 - TerminalContext: Main class for gathering context information
 - get_context: Collects all context data into a dictionary
 - to_string: Formats context information for inclusion in AI prompts
+- to_static_string / to_dynamic_string: The parts of to_string that rarely and often change
 - get_directory_contents: Lists files in the current directory
 - get_command_history: Retrieves recent command history
 - get_git_status: Gets information about git repositories
@@ -17,11 +18,100 @@ Key functionality:
 import os
 import platform
 import subprocess
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Callable
 import shutil
 import json
 
+from termora.utils.helpers import read_tail_lines
+
+# Maps the two-character XY status code of `git status --porcelain` to a change category
+_STATUS_MAP = {
+    ' M': 'modified',
+    'M ': 'modified',
+    'A ': 'added',
+    ' D': 'deleted',
+    'D ': 'deleted',
+    '??': 'untracked',
+}
+
+# How many parent directories to probe for a .git entry before giving up
+_GIT_ROOT_MAX_DEPTH = 20
+
+# Never scan more than this many bytes from the end of a shell history file
+_HISTORY_TAIL_BYTES = 1024 * 1024
+
+# Shell history files read for context, in order of preference
+_SHELL_HISTORY_FILES = ('~/.bash_history', '~/.zsh_history')
+
+# Seconds a gathered context is reused while nothing it depends on has visibly changed.
+# Edits inside existing files don't change any of the checked timestamps, so this bounds
+# how stale the git status can get.
+_CONTEXT_TTL = 30.0
+
+def dedupe_recent(items: List[Any], limit: int, key: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """
+    Drop repeated items, keeping the most recent occurrence of each.
+    
+    Repeated commands (``ls``, ``cd ..``) add nothing to a prompt but still cost tokens.
+    
+    Args:
+        items: Items ordered from oldest to newest
+        limit: Maximum number of items to return
+        key: Optional function returning the value used to detect duplicates
+        
+    Returns:
+        Up to ``limit`` distinct items, still ordered from oldest to newest
+    """
+    seen = set()
+    result = []
+    for item in reversed(items):
+        k = key(item) if key else item
+        if k in seen:
+            continue
+        seen.add(k)
+        result.append(item)
+        if len(result) >= limit:
+            break
+    result.reverse()
+    return result
+
+
+def history_entry_text(entry: Dict[str, Any]) -> str:
+    """
+    Describe a Termora history entry in one line, for prompts and for spotting repeats.
+    
+    Args:
+        entry: Entry from HistoryManager (shell command, Python code or action plan)
+        
+    Returns:
+        The command, the first line of the code, or the plan's commands joined with ';'
+        (its explanation if it has none)
+    """
+    if entry.get("command"):
+        return f"$ {entry['command']}"
+    if entry.get("code"):
+        code_lines = entry["code"].strip().splitlines()
+        return f"python: {code_lines[0] if code_lines else ''}"
+    contents = [action.get("content", "") for action in entry.get("actions") or () if isinstance(action, dict)]
+    if any(contents):
+        return "; ".join(content for content in contents if content)
+    return entry.get("explanation") or ""
+
+
+@lru_cache(maxsize=4)
+def _static_context_string(os_name: str, shell: Optional[str], home: Optional[str], host: str) -> str:
+    """Format the part of the context that only changes with the machine or login environment."""
+    lines = ["SYSTEM CONTEXT:", f"OS: {os_name}"]
+    if shell:
+        lines.append(f"Shell: {os.path.basename(shell)}")
+    if home:
+        lines.append(f"Home: {home}")
+    return "\n".join(lines)
+
+
 class TerminalContext:
     """
     Gathers and manages context information about the terminal environment.
@@ -46,28 +136,77 @@ class TerminalContext:
         self.max_history = max_history
         self.max_files = max_files
         self.os_name = platform.system()  # 'Linux', 'Darwin' (macOS), 'Windows'
+        self.os_version = platform.release()  # Kernel/OS release, looked up once
+        
+        # Git root lookups as (root or None, time looked up), keyed by the directory the walk started from
+        self._git_root_cache: Dict[str, Tuple[Optional[Path], float]] = {}
+        
+        # Last gathered context as (fingerprint, time gathered, context)
+        self._context_cache: Optional[Tuple[Tuple, float, Dict[str, Any]]] = None
     
-    def get_context(self) -> Dict[str, Any]:
+    def get_context(self, cwd: Optional[str] = None) -> Dict[str, Any]:
         """
         Gather all context information from the terminal environment.
         
+        The result is reused while the working directory, its modification time, the shell
+        history files and the git index are unchanged (for at most _CONTEXT_TTL seconds).
+        
+        Args:
+            cwd: Working directory the caller already looked up (optional)
+        
         Returns:
             A dictionary containing context information with enhanced directory context
         """
-        current_dir = self.get_current_directory()
+        current_dir = cwd or self.get_current_directory()
+        fingerprint = self._context_fingerprint(current_dir)
+        cached = self._context_cache
+        if cached is not None and cached[0] == fingerprint and time.monotonic() - cached[1] < _CONTEXT_TTL:
+            # Callers add their own keys, so hand out a copy
+            return dict(cached[2])
         
-        return {
+        context = {
             "os": self.os_name,
             "cwd": current_dir,
             "cwd_name": os.path.basename(current_dir),  # Add the directory name
             "cwd_parent": os.path.dirname(current_dir),  # Add parent directory
-            "files": self.get_directory_contents(),
+            "files": self.get_directory_contents(current_dir),
             "history": self.get_command_history(),
-            "git_status": self.get_git_status(),
+            "git_status": self.get_git_status(current_dir),
             "environment": self.get_environment_info(),
             "is_root": current_dir == os.path.expanduser("~"),  # Add whether we're in home directory
             "is_git_root": self._is_git_root(current_dir)  # Add whether we're in a git root
         }
+        self._context_cache = (fingerprint, time.monotonic(), context)
+        return dict(context)
+    
+    def invalidate(self) -> None:
+        """Forget the cached context, e.g. after running commands that may have changed files."""
+        self._context_cache = None
+    
+    def _context_fingerprint(self, current_dir: str) -> Tuple:
+        """
+        Cheap summary of what the context depends on, used to tell whether it may have changed.
+        
+        Args:
+            current_dir: Current working directory
+            
+        Returns:
+            Tuple of the directory and the modification times of the files the context reads
+        """
+        paths = [current_dir]
+        paths.extend(os.path.expanduser(path) for path in _SHELL_HISTORY_FILES)
+        git_root = self._find_git_root(Path(current_dir))
+        if git_root is not None:
+            paths.append(str(git_root / '.git' / 'index'))
+            paths.append(str(git_root / '.git' / 'HEAD'))
+        
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return (current_dir, tuple(mtimes))
     
     def get_current_directory(self) -> str:
         """
@@ -78,15 +217,18 @@ class TerminalContext:
         """
         return os.getcwd()
     
-    def get_directory_contents(self) -> List[Dict[str,str]]:
+    def get_directory_contents(self, cwd: Optional[str] = None) -> List[Dict[str,str]]:
         """
         Get information about files in the current directory.
         
+        Args:
+            cwd: Current directory, if the caller already looked it up (optional)
+        
         Returns:
             A list of dictionaries with file information
         """
         contents = []
-        cwd =  Path(self.get_current_directory())
+        cwd = Path(cwd or self.get_current_directory())
         
         try:
             # Get directory entries 
@@ -134,15 +276,11 @@ class TerminalContext:
         # Different approaches based on OS
         if self.os_name in ('Linux', 'Darwin'):  # Currently supporting Linux or macOS
             # Try to get history from bash or zsh
-            for shell_history in [
-                os.path.expanduser('~/.bash_history'),
-                os.path.expanduser('~/.zsh_history')
-            ]:
+            for shell_history in map(os.path.expanduser, _SHELL_HISTORY_FILES):
                 if os.path.exists(shell_history):
                     try:
-                        # Read history file
-                        with open(shell_history, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = f.readlines()
+                        # Read only the tail of the history file, extra lines cover entries dropped below
+                        lines = read_tail_lines(shell_history, self.max_history * 4, _HISTORY_TAIL_BYTES)
                             
                         # Process the lines based on shell format
                         if shell_history.endswith('zsh_history'):
@@ -157,8 +295,8 @@ class TerminalContext:
                             # bash history is simpler
                             commands = [line.strip() for line in lines]
                             
-                        # Get the most recent commands
-                        history = commands[-self.max_history:]
+                        # Get the most recent distinct commands
+                        history = dedupe_recent(commands, self.max_history)
                         break
                     except Exception:
                         # If we can't read the history file, continue to the next method
@@ -183,12 +321,15 @@ class TerminalContext:
                     # If history command fails, we'll return an empty list
                     pass
                 
-        return history[-self.max_history:] if history else []
+        return dedupe_recent(history, self.max_history) if history else []
     
-    def get_git_status(self) -> Optional[Dict[str, Any]]:
+    def get_git_status(self, cwd: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get git status information if in a git repository.
         
+        Args:
+            cwd: Current directory, if the caller already looked it up (optional)
+        
         Returns:
             A dictionary with git status info, or None if not in a git repo
         """
@@ -196,10 +337,17 @@ class TerminalContext:
         if not shutil.which('git'):
             return None
         
+        cwd = cwd or self.get_current_directory()
+        
+        # Without a .git entry above us there is no repository, so skip spawning git at all
+        if self._find_git_root(Path(cwd)) is None:
+            return None
+        
         # Check if current directory is a git repository
         try:
             result = subprocess.run(
                 ['git', 'rev-parse', '--is-inside-work-tree'],
+                cwd=cwd,
                 capture_output=True,
                 text=True,
                 check=False
@@ -216,6 +364,7 @@ class TerminalContext:
         try:
             result = subprocess.run(
                 ['git', 'branch', '--show-current'],
+                cwd=cwd,
                 capture_output=True,
                 text=True,
                 check=False
@@ -229,6 +378,7 @@ class TerminalContext:
         try:
             result = subprocess.run(
                 ['git', 'status', '--porcelain'],
+                cwd=cwd,
                 capture_output=True,
                 text=True,
                 check=False
@@ -246,14 +396,9 @@ class TerminalContext:
                 }
                 
                 for line in status_lines:
-                    if line.startswith(' M') or line.startswith('M '):
-                        status_counts['modified'] += 1
-                    elif line.startswith('A '):
-                        status_counts['added'] += 1
-                    elif line.startswith(' D') or line.startswith('D '):
-                        status_counts['deleted'] += 1
-                    elif line.startswith('??'):
-                        status_counts['untracked'] += 1
+                    category = _STATUS_MAP.get(line[:2])
+                    if category:
+                        status_counts[category] += 1
                     
                 git_info['status_counts'] = status_counts
         
@@ -284,6 +429,40 @@ class TerminalContext:
                 
         return env_info
     
+    def _find_git_root(self, start: Path) -> Optional[Path]:
+        """
+        Find the closest directory at or above start that contains a .git entry.
+        
+        This is a cheap filesystem probe used to avoid spawning git outside of repositories.
+        Lookups are cached for _CONTEXT_TTL seconds, like the context itself, so a repository
+        created or removed later is noticed.
+        
+        Args:
+            start: Directory to start searching from
+            
+        Returns:
+            The repository root, or None if no .git entry was found
+        """
+        key = str(start)
+        now = time.monotonic()
+        cached = self._git_root_cache.get(key)
+        if cached is not None and now - cached[1] < _CONTEXT_TTL:
+            return cached[0]
+        
+        root = None
+        current = start
+        for _ in range(_GIT_ROOT_MAX_DEPTH):
+            # .git is a directory for normal repos and a file for worktrees/submodules
+            if (current / '.git').exists():
+                root = current
+                break
+            if current.parent == current:
+                break
+            current = current.parent
+        
+        self._git_root_cache[key] = (root, now)
+        return root
+    
     def _is_git_root(self, directory: str) -> bool:
         """
         Check if the given directory is a git repository root.
@@ -294,6 +473,9 @@ class TerminalContext:
         Returns:
             True if the directory is a git repository root, False otherwise
         """
+        if self._find_git_root(Path(directory)) is None:
+            return False
+        
         try:
             result = subprocess.run(
                 ['git', 'rev-parse', '--show-toplevel'],
@@ -309,20 +491,54 @@ class TerminalContext:
             pass
         return False
     
-    def to_string(self) -> str:
+    def to_string(self, context: Optional[Dict[str, Any]] = None) -> str:
         """
         Convert the context to a formatted string for inclusion in prompts.
         
+        Args:
+            context: Context previously returned by get_context (optional).
+                Passing it avoids gathering the context again.
+        
         Returns:
             A formatted string representation of the context
         """
         
-        context = self.get_context()
+        if context is None:
+            context = self.get_context()
+        
+        return f"{self.to_static_string(context)}\n{self.to_dynamic_string(context)}"
+    
+    def to_static_string(self, context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Format the machine and login details of the context (OS, shell, home directory).
+        
+        These rarely change between requests, so the text is built once per environment
+        and leads the context, keeping the start of prompts identical across turns.
+        
+        Args:
+            context: Context previously returned by get_context (optional)
+            
+        Returns:
+            The formatted static part of the context
+        """
+        os_name = context['os'] if context is not None else self.os_name
+        return _static_context_string(os_name, os.environ.get('SHELL'), os.environ.get('HOME'), platform.node())
+    
+    def to_dynamic_string(self, context: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Format the parts of the context that change between requests (directory, files, history, git).
+        
+        Args:
+            context: Context previously returned by get_context (optional)
+            
+        Returns:
+            The formatted dynamic part of the context
+        """
+        if context is None:
+            context = self.get_context()
         
         # Build a human-readable representation
         lines = [
-            "SYSTEM CONTEXT:",
-            f"OS: {context['os']}",
             f"Current Directory: {context['cwd']}",
             "",
             "Recent Files:",
@@ -344,6 +560,13 @@ class TerminalContext:
         for cmd in context['history']:
             lines.append(f"  $ {cmd}")
             
+        # Add what Termora itself ran recently, when the pipeline supplied it
+        if context.get('command_history'):
+            lines.append("")
+            lines.append("Recent Termora Actions:")
+            for entry in context['command_history']:
+                lines.append(f"  {history_entry_text(entry)}")
+        
         # Add git information if available
         if context['git_status']:
             lines.append("")
@@ -25,10 +25,11 @@ _infer_backup_paths: Figures out what files to back up
 """
 
 import os
+import hashlib
 import subprocess
 import tempfile
-import tarfile
 import shutil
+import stat
 import re
 from datetime import datetime
 from pathlib import Path
@@ -36,13 +37,69 @@ from typing import List, Dict, Optional, Tuple, Any, Union
 import sys
 import time
 
+import orjson
+
 from rich.console import Console
 from rich.prompt import Confirm
 from rich.panel import Panel
 from rich.syntax import Syntax
 
+from termora.core.archive import backup_suffix, write_archive
 from termora.utils.helpers import get_termora_dir, get_timestamp, resolve_path, is_destructive_command
 
+# Patterns locating the paths a destructive command touches, with the group holding them
+_BACKUP_PATH_PATTERNS = [
+    # rm/rmdir commands: extract paths after the command and options
+    (re.compile(r'rm\s+(?:-[rf]+\s+)*(.+)'), 1),
+    # mv commands: extract the source path (not the destination)
+    (re.compile(r'mv\s+(?:-[if]+\s+)*(.+?)\s+[^\s]+$'), 1),
+    # redirect operations: extract the file being written to
+    (re.compile(r'>\s*(.+)'), 1),
+    # sed -i: extract the file being modified
+    (re.compile(r'sed\s+.*\s+([^\s]+)$'), 1),
+]
+
+# Files are read in chunks of this size when fingerprinting a backup
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Maps the content digest of each backup to its archive, so unchanged files aren't archived twice
+_DIGEST_INDEX = "digests.json"
+
+
+def _tree_digest(root: Path) -> str:
+    """
+    Fingerprint the files staged for a backup.
+    
+    Staging copies permissions and modification times along with the content, and a
+    restore puts them back, so they are part of the fingerprint too. Directory mtimes
+    are left out: the staging directories above the backed-up paths are created anew
+    for every backup.
+    
+    Args:
+        root: Directory holding the staged files
+        
+    Returns:
+        SHA-256 hex digest of every path under root, its mode, and each file's mtime and content
+    """
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(dirnames + filenames):
+            path = os.path.join(dirpath, name)
+            st = os.lstat(path)
+            digest.update(os.path.relpath(path, root).encode("utf-8", "surrogateescape") + b"\0")
+            digest.update(b"%o\0" % st.st_mode)
+            if stat.S_ISLNK(st.st_mode):
+                digest.update(b"L" + os.readlink(path).encode("utf-8", "surrogateescape") + b"\0")
+            elif stat.S_ISREG(st.st_mode):
+                digest.update(b"F%d\0" % st.st_mtime_ns)
+                with open(path, "rb") as f:
+                    while chunk := f.read(_HASH_CHUNK_SIZE):
+                        digest.update(chunk)
+                digest.update(b"\0")
+    return digest.hexdigest()
+
+
 class CommandExecutor:
     """
     Executes command plans with safety measures.
@@ -71,6 +128,24 @@ class CommandExecutor:
         # Last executed command info for rollback
         self.last_execution = None
     
+    def prewarm(self, paths: List[str]) -> None:
+        """
+        Get ready to execute a plan that is still being generated.
+        
+        Loads the backup compressor and looks up the paths the plan is likely to touch,
+        so the work is done while waiting for the model rather than after it replies.
+        Safe to call from a worker thread.
+        
+        Args:
+            paths: Paths the request refers to (target directory, destination, ...)
+        """
+        backup_suffix()
+        for path_str in paths:
+            try:
+                resolve_path(path_str).exists()
+            except (OSError, RuntimeError):
+                continue
+    
     def display_plan(self, plan):
         """
         Display a command plan to the user.
@@ -160,7 +235,7 @@ class CommandExecutor:
         
         # Creating unique backup filename 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"backup_{timestamp}.tar.gz"
+        backup_filename = f"backup_{timestamp}{backup_suffix()}"
         backup_path = self.backup_dir / backup_filename
         
         self.console.print(f"[blue]Creating backup at {backup_path}...[/blue]")
@@ -201,12 +276,53 @@ class CommandExecutor:
                 except Exception as e:
                     self.console.print(f"[red]Error backing up {path}: {str(e)}[/red]")
             
-            with tarfile.open(backup_path, "w:gz") as tar:
-                tar.add(temp_dir, arcname="")
+            # Backing up the same unchanged files again (e.g. before each of several small
+            # edits) reuses the earlier archive instead of compressing another copy
+            digest = _tree_digest(temp_path)
+            existing = self._backup_with_digest(digest)
+            if existing is not None:
+                self.console.print(f"[green]Files unchanged since backup {existing.name}, reusing it[/green]")
+                return str(existing)
+            
+            write_archive(temp_dir, backup_path)
+            self._record_backup_digest(digest, backup_filename)
         
         self.console.print(f"[green]Backup completed: {backup_path}[/green]")
         return str(backup_path)
     
+    def _load_digest_index(self) -> Dict[str, str]:
+        """Load the digest to backup file name index, or an empty one if it is missing or unreadable."""
+        try:
+            index = orjson.loads((self.backup_dir / _DIGEST_INDEX).read_bytes())
+            return index if isinstance(index, dict) else {}
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+    
+    def _backup_with_digest(self, digest: str) -> Optional[Path]:
+        """
+        Find an existing backup of exactly the same files.
+        
+        Args:
+            digest: Digest of the staged files
+            
+        Returns:
+            Path to the backup archive, or None if there is none (or it was deleted)
+        """
+        name = self._load_digest_index().get(digest)
+        if not name:
+            return None
+        path = self.backup_dir / name
+        return path if path.exists() else None
+    
+    def _record_backup_digest(self, digest: str, backup_filename: str) -> None:
+        """Remember the digest of a new backup, dropping entries whose archives no longer exist."""
+        index = {key: name for key, name in self._load_digest_index().items() if (self.backup_dir / name).exists()}
+        index[digest] = backup_filename
+        try:
+            (self.backup_dir / _DIGEST_INDEX).write_bytes(orjson.dumps(index))
+        except OSError:
+            pass
+    
     def execute_plan(self, plan) -> Dict[str, Any]:
         """
         Execute an action plan.
@@ -335,22 +451,10 @@ class CommandExecutor:
         """
         backup_paths = set()
         
-        # Patterns to look for in destructive commands
-        patterns = [
-            # rm/rmdir commands: extract paths after the command and options
-            (r'rm\s+(?:-[rf]+\s+)*(.+)', 1),
-            # mv commands: extract the source path (not the destination)
-            (r'mv\s+(?:-[if]+\s+)*(.+?)\s+[^\s]+$', 1),
-            # redirect operations: extract the file being written to
-            (r'>\s*(.+)', 1),
-            # sed -i: extract the file being modified
-            (r'sed\s+.*\s+([^\s]+)$', 1),
-        ]
-        
         for cmd in commands:
             if is_destructive_command(cmd):
-                for pattern, group in patterns:
-                    match = re.search(pattern, cmd)
+                for pattern, group in _BACKUP_PATH_PATTERNS:
+                    match = pattern.search(cmd)
                     if match:
                         # Extract the path and split if multiple paths
                         paths = match.group(group).split()
@@ -0,0 +1,128 @@
+"""
+Rule-based recognition of common requests.
+
+Many requests ("list files", "where am i", "show disk usage of build") are worded
+predictably and have one obvious answer. Recognizing them with a few regular
+expressions lets the pipeline skip the AI model entirely, or at least skip
+intent extraction.
+
+Key functionality:
+- FastMatch: Intent fields, and a command when one fully answers the request
+- try_fast_match: Match a request against the built-in rules
+"""
+
+import re
+import shlex
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# A single path or name, optionally quoted. Unquoted targets can't start with '-' so
+# options are never mistaken for paths.
+_TARGET = r"""(?P<target>'[^']+'|"[^"]+"|[^\s'"-][^\s'"]*)"""
+
+# Each rule is (first words, pattern, intent fields, command, explanation). Patterns must
+# match the whole request (case-insensitively). String values in the intent fields, the
+# command and the explanation may refer to the matched {target}; a target that isn't used
+# by the intent fields becomes the target directory. Rules without a command only
+# recognize the intent, leaving the plan to the model.
+_RULES = (
+    # Fully handled requests
+    (("ls", "list", "show"), r"(?:ls|(?:list|show)(?: me)?(?: all)?(?: the)? files)",
+     {"action": "list", "target_dir": "."}, "ls -la", "List all files in the current directory"),
+    (("ls", "list", "show"), rf"(?:ls|(?:list|show)(?: me)?(?: all)?(?: the)? (?:files|contents) (?:in|of)) {_TARGET}",
+     {"action": "list"}, "ls -la -- {target}", "List all files in {target}"),
+    (("list", "show"), r"(?:list|show)(?: me)?(?: all)?(?: the)? hidden files",
+     {"action": "list", "target_dir": ".", "file_filter": {"hidden": True}}, "ls -la",
+     "List all files in the current directory, including hidden ones"),
+    (("pwd", "where", "show", "print"), r"(?:pwd|where am i|(?:show|print)(?: me)?(?: the)? current directory)",
+     {"action": "pwd", "recursive": False}, "pwd", "Print the current working directory"),
+    (("git", "show"), r"(?:show(?: me)?(?: the)? )?git status",
+     {"action": "status", "target_dir": ".", "recursive": False}, "git status", "Show the git status"),
+    (("du", "show", "check"), r"(?:du|(?:show|check)(?: the)? disk usage)",
+     {"action": "disk_usage", "target_dir": "."}, "du -sh .", "Show the disk usage of the current directory"),
+    (("du", "show", "check"), rf"(?:du|(?:show|check)(?: the)? disk usage (?:of|for|in)) {_TARGET}",
+     {"action": "disk_usage"}, "du -sh -- {target}", "Show the disk usage of {target}"),
+    (("mkdir", "make", "create"),
+     rf"(?:mkdir|(?:make|create)(?: a)?(?: new)? (?:directory|folder)(?: (?:called|named))?) {_TARGET}",
+     {"action": "create", "recursive": False}, "mkdir -p -- {target}", "Create the directory {target}"),
+    (("find", "search"), rf"(?:find|search for)(?: all)?(?: the)? files (?:named|called) {_TARGET}",
+     {"action": "find", "target_dir": ".", "file_filter": {"name": "{target}"}}, "find . -name {target}",
+     "Find files named {target} in the current directory"),
+
+    # Requests whose intent is clear but whose plan still depends on the details
+    (("count", "how"), rf"(?:count|how many) (?:files|items)(?: are there)?(?: in {_TARGET})?",
+     {"action": "count", "target_dir": "."}, None, ""),
+    (("show", "list"), rf"(?:show|list)(?: me)?(?: the)? (?:largest|biggest) files(?: in {_TARGET})?",
+     {"action": "find", "target_dir": ".", "sort_by": "size"}, None, ""),
+)
+
+# Rules indexed by the first word of the requests they match, so each request is only
+# tried against the few patterns that can apply
+_RULES_BY_WORD: Dict[str, List[Tuple[re.Pattern, Dict[str, Any], Optional[str], str]]] = {}
+for _words, _pattern, _fields, _command, _explanation in _RULES:
+    for _word in _words:
+        _RULES_BY_WORD.setdefault(_word, []).append(
+            (re.compile(_pattern, re.IGNORECASE), _fields, _command, _explanation)
+        )
+del _words, _word, _pattern, _fields, _command, _explanation
+
+
+@dataclass(frozen=True, slots=True)
+class FastMatch:
+    """A request recognized by a built-in rule."""
+    intent: Dict[str, Any]  # Intent fields for the request
+    command: Optional[str] = None  # Shell command that fully answers the request, if any
+    explanation: str = ""  # What the command does
+
+
+def _shell_path(path: str) -> str:
+    """Quote a path for the shell, leaving a leading ~/ unquoted so it still expands."""
+    if path.startswith("~/"):
+        return "~/" + shlex.quote(path[2:])
+    return shlex.quote(path)
+
+
+def _fill(value: Any, target: str) -> Any:
+    """Substitute the matched target into intent field values."""
+    if isinstance(value, str):
+        return value.replace("{target}", target)
+    if isinstance(value, dict):
+        return {key: _fill(item, target) for key, item in value.items()}
+    return value
+
+
+def try_fast_match(user_input: str) -> Optional[FastMatch]:
+    """
+    Match a request against the built-in rules.
+
+    Args:
+        user_input: Parsed user request
+
+    Returns:
+        FastMatch for the request, or None if no rule matches it
+    """
+    text = " ".join(user_input.strip().rstrip(".?!").split())
+    if not text:
+        return None
+
+    for pattern, fields, command, explanation in _RULES_BY_WORD.get(text.split(" ", 1)[0].lower(), ()):
+        match = pattern.fullmatch(text)
+        if not match:
+            continue
+
+        target = match.groupdict().get("target")
+        if target is None:
+            return FastMatch(dict(fields), command, explanation)
+
+        # Paths keep their case; only the surrounding quotes are dropped
+        target = target.strip("'\"")
+        intent = _fill(fields, target)
+        if not any("{target}" in str(value) for value in fields.values()):
+            intent["target_dir"] = target
+        return FastMatch(
+            intent,
+            command.format(target=_shell_path(target)) if command else None,
+            explanation.format(target=target)
+        )
+    return None
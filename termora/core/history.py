@@ -12,13 +12,121 @@ Key functionality:
 """
 
 import os
-import json
+import re
+import logging
 import time
+import queue
+import atexit
+import threading
+import orjson
+from functools import lru_cache
+from collections import Counter, defaultdict, deque
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Iterator
 
-from termora.utils.helpers import get_termora_dir, get_timestamp
+from termora.utils.helpers import get_termora_dir, get_timestamp, read_tail_lines
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of history entries kept in memory
+MAX_HISTORY_ENTRIES = 10000
+
+# Maximum number of REPL commands kept in memory (and loaded from disk)
+MAX_REPL_ENTRIES = 1000
+
+# The REPL history file is rewritten with only the latest commands once it holds this many times more
+_REPL_COMPACT_FACTOR = 2
+
+# Pending history entries are coalesced into writes of up to this many bytes
+_WRITE_BATCH_BYTES = 64 * 1024
+
+# Queued by cleanup() to stop the background history writer
+_STOP_WRITER = object()
+
+# Command category for each known command name
+_CMD_CATEGORY = {
+    "git": "version_control", "svn": "version_control", "hg": "version_control",
+    "cd": "filesystem", "ls": "filesystem", "dir": "filesystem", "pwd": "filesystem",
+    "mv": "filesystem", "cp": "filesystem", "rm": "filesystem",
+    "python": "python_dev", "python3": "python_dev", "pip": "python_dev",
+    "pipenv": "python_dev", "venv": "python_dev",
+    "npm": "node_dev", "yarn": "node_dev", "node": "node_dev",
+    "docker": "container", "docker-compose": "container", "kubectl": "container",
+}
+
+# Markers the Python code categories are recognized by, matched anywhere in the lowercased code.
+# The lookahead finds overlapping markers too, e.g. both "import os" and "os.path" in "import os.path".
+_CODE_MARKER_RE = re.compile(r"(?=(import os|open\(|os\.path|import requests|urllib|import pandas|numpy|matplotlib|subprocess))")
+
+# Matches a whole import statement line in Python code
+_IMPORT_RE = re.compile(r"^[ \t]*(?:import|from)[ \t][^\n]*", re.MULTILINE)
+
+# Length of the substrings used as keys in the search index
+_NGRAM = 3
+
+# Number of bits in the per-entry Bloom filter of trigrams
+_BLOOM_BITS = 128
+
+
+def _ngrams(text: str) -> set:
+    """Return the set of distinct _NGRAM-character substrings of text."""
+    return {text[i:i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
+def _bloom_mask(grams) -> int:
+    """
+    Build a Bloom filter bit mask for a set of trigrams, using two hash functions.
+    
+    The masks only live in memory, so the per-process randomized str hash is fine.
+    """
+    mask = 0
+    for gram in grams:
+        h = hash(gram)
+        mask |= (1 << (h % _BLOOM_BITS)) | (1 << ((h >> 7) % _BLOOM_BITS))
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def _categorize_command(command: str) -> str:
+    """
+    Categorize a command by type.
+    
+    Args:
+        command: The command string
+        
+    Returns:
+        Command category as string
+    """
+    # This is a simple categorization that will be expanded later
+    words = command.split(None, 1)
+    return _CMD_CATEGORY.get(words[0], "other") if words else "other"
+
+
+@lru_cache(maxsize=4096)
+def _categorize_python_code(code: str) -> str:
+    """
+    Categorize Python code by type/purpose.
+    
+    Args:
+        code: The Python code
+        
+    Returns:
+        Code category as string
+    """
+    # One scan collects every marker; the rules below then only test set membership
+    markers = set(_CODE_MARKER_RE.findall(code.lower()))
+    
+    if "import os" in markers and ("open(" in markers or "os.path" in markers):
+        return "file_operation"
+    elif "import requests" in markers or "urllib" in markers:
+        return "networking"
+    elif "import pandas" in markers or "numpy" in markers or "matplotlib" in markers:
+        return "data_analysis"
+    elif "subprocess" in markers:
+        return "system_command"
+    else:
+        return "general"
 
 
 class HistoryManager:
@@ -40,15 +148,55 @@ class HistoryManager:
         
         # Define paths for history storage
         self.history_dir = self.termora_dir / "history"
-        self.history_file = self.history_dir / "command_history.json"
-        self.repl_history_file = self.termora_dir / "repl_history.json"
+        self.history_file = self.history_dir / "command_history.jsonl"  # One JSON entry per line, append-only
+        self.legacy_history_file = self.history_dir / "command_history.json"
+        self.repl_history_file = self.termora_dir / "repl_history.jsonl"  # One command per line, append-only
+        self.legacy_repl_history_file = self.termora_dir / "repl_history.json"
         
         # Create directories if they don't exist
         self._ensure_directories()
         
-        # Load existing history or initialize empty history
-        self.history = self._load_history()
-        self.repl_history = self._load_repl_history()
+        # Load existing history or initialize empty history, bounded to the most recent entries
+        self._history_file_lines = 0
+        self.history = deque(self._load_history(), maxlen=MAX_HISTORY_ENTRIES)
+        # The history file is only ever appended to, so cut it back to the kept entries once it outgrows them
+        if self._history_file_lines > MAX_HISTORY_ENTRIES:
+            self._compact_history()
+        self.repl_history = deque(self._load_repl_history(), maxlen=MAX_REPL_ENTRIES)
+        
+        # Occurrence counts for get_command_patterns, per action type and per (action type, directory)
+        self._pattern_counts: Dict[str, Counter] = defaultdict(Counter)
+        self._pattern_counts_by_dir: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+        
+        # Search index: maps each trigram of an entry's searchable text to the sequence numbers
+        # of the entries containing it, oldest first. Sequence numbers only grow, self.history[0] is _first_seq.
+        self._first_seq = 0
+        self._search_index: Dict[str, deque] = defaultdict(deque)
+        # Lowercased search text and Bloom filter of its trigrams for each entry, parallel to self.history
+        self._search_texts: deque = deque(maxlen=MAX_HISTORY_ENTRIES)
+        self._blooms: deque = deque(maxlen=MAX_HISTORY_ENTRIES)
+        for seq, entry in enumerate(self.history):
+            self._count_entry(entry)
+            self._index_entry(seq, entry)
+        
+        # Guards the in-memory history and its derived indexes, which are updated from
+        # the pipeline's logging thread while other threads search them
+        self._lock = threading.RLock()
+        
+        # Detected project per directory, with the mtimes it was detected at
+        self._project_cache: Dict[str, Tuple[Tuple[int, Optional[int]], Optional[str]]] = {}
+        
+        # REPL history file, opened for appending on the first new command
+        self._repl_file = None
+        
+        # New history entries are written to disk by a background thread
+        self._io_queue: queue.Queue = queue.Queue()
+        self._io_thread = threading.Thread(target=self._io_loop, name="termora-history-writer", daemon=True)
+        self._io_thread.start()
+        
+        # Make sure queued entries and buffered REPL commands reach disk on shutdown;
+        # cleanup() unregisters this again
+        atexit.register(self.cleanup)
     
     def _ensure_directories(self):
         """Ensure that required directories exist."""
@@ -57,49 +205,276 @@ class HistoryManager:
         if not self.history_dir.exists():
             self.history_dir.mkdir(parents=True, exist_ok=True)
     
-    def _load_history(self) -> List[Dict[str, Any]]:
+    def _load_history(self) -> Iterator[Dict[str, Any]]:
         """
-        Load command history from file or initialize if it doesn't exist.
+        Stream command history entries from file, migrating the legacy format if needed.
         
-        Returns:
-            List of command history entries
+        Entries are parsed one line at a time so that only the ones kept by the
+        bounded in-memory history stay alive.
+        
+        Yields:
+            Command history entries, oldest first
         """
         if not self.history_file.exists():
+            yield from self._migrate_legacy_history()
+            return
+        
+        try:
+            with open(self.history_file, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    self._history_file_lines += 1
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # Skip lines that were only partially written
+                        continue
+                    yield entry
+        except FileNotFoundError:
+            return
+    
+    def _migrate_legacy_history(self) -> List[Dict[str, Any]]:
+        """
+        Convert a history file from the old single JSON array format to JSON lines.
+        
+        Returns:
+            List of migrated history entries (empty if there was nothing to migrate)
+        """
+        if not self.legacy_history_file.exists():
             return []
         
         try:
-            with open(self.history_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            entries = orjson.loads(self.legacy_history_file.read_bytes())
+        except (orjson.JSONDecodeError, FileNotFoundError):
             # If file is corrupted or doesn't exist, return empty history
             return []
+        
+        self._save_history(entries)
+        self.legacy_history_file.unlink()
+        return entries
+    
+    def _save_history(self, entries) -> None:
+        """
+        Rewrite the whole history file with the given entries.
+        
+        The entries are written to a temporary file that then replaces the history file,
+        so an interrupted rewrite never loses the existing history.
+        
+        Args:
+            entries: History entries to write, oldest first
+        """
+        tmp_file = self.history_file.with_name(self.history_file.name + ".tmp")
+        tmp_file.write_bytes(b"".join(orjson.dumps(entry) + b"\n" for entry in entries))
+        os.replace(tmp_file, self.history_file)
+    
+    def _compact_history(self) -> None:
+        """Rewrite the history file with only the entries kept in memory."""
+        try:
+            self._save_history(self.history)
+        except OSError as e:
+            logger.warning("Could not compact command history: %s", e)
+    
+    def _record_entry(self, entry: Dict[str, Any]) -> None:
+        """
+        Add a new entry to the in-memory history, update derived statistics and persist it.
+        
+        Args:
+            entry: The history entry to record
+        """
+        with self._lock:
+            if len(self.history) == self.history.maxlen:
+                # The oldest entry is about to be evicted by the append
+                self._forget_oldest_entry()
+            self.history.append(entry)
+            self._count_entry(entry)
+            self._index_entry(self._first_seq + len(self.history) - 1, entry)
+        self._append_entry(entry)
+    
+    def _forget_oldest_entry(self) -> None:
+        """Remove the oldest history entry's contribution to the pattern counters and search index."""
+        entry = self.history[0]
+        self._count_entry(entry, -1)
+        
+        # Postings are in insertion order and older entries were already pruned,
+        # so this entry is at the front of every posting list it appears in
+        for gram in _ngrams(self._search_texts[0]):
+            posting = self._search_index[gram]
+            posting.popleft()
+            if not posting:
+                del self._search_index[gram]
+        
+        self._first_seq += 1
+    
+    def _count_entry(self, entry: Dict[str, Any], delta: int = 1) -> None:
+        """
+        Add an entry to (or remove it from) the pattern counters used by get_command_patterns.
+        
+        Args:
+            entry: The history entry to count
+            delta: 1 when the entry is added, -1 when it is evicted
+        """
+        action_type = entry.get("action_type")
+        if action_type == "shell_command":
+            content = entry.get("command", "")
+        elif action_type == "python_code":
+            content = entry.get("code", "")[:50]  # First 50 chars as identifier
+        else:
+            return
+        
+        for counts in (self._pattern_counts[action_type],
+                       self._pattern_counts_by_dir[(action_type, entry.get("directory"))]):
+            counts[content] += delta
+            if counts[content] <= 0:
+                # Drop evicted patterns so most_common doesn't report zero counts
+                del counts[content]
     
-    def _save_history(self):
-        """Save command history to file."""
-        with open(self.history_file, "w") as f:
-            json.dump(self.history, f, indent=2)
+    @staticmethod
+    def _search_text(entry: Dict[str, Any]) -> str:
+        """
+        Get the lowercased text that search_history matches queries against.
+        
+        Args:
+            entry: The history entry
+            
+        Returns:
+            The command, code or explanation of the entry, depending on its type
+        """
+        entry_type = entry.get("action_type", "shell_command")
+        if entry_type == "shell_command":
+            return entry.get("command", "").lower()
+        elif entry_type == "python_code":
+            return entry.get("code", "").lower()
+        elif entry_type == "action_plan":
+            return entry.get("explanation", "").lower()
+        return ""
+    
+    def _index_entry(self, seq: int, entry: Dict[str, Any]) -> None:
+        """
+        Add an entry to the search index.
+        
+        Args:
+            seq: Sequence number of the entry
+            entry: The history entry to index
+        """
+        text = self._search_text(entry)
+        grams = _ngrams(text)
+        for gram in grams:
+            self._search_index[gram].append(seq)
+        self._search_texts.append(text)
+        self._blooms.append(_bloom_mask(grams))
+    
+    def _append_entry(self, entry: Dict[str, Any]) -> None:
+        """
+        Queue a single entry to be appended to the history file.
+        
+        Once cleanup() has stopped the background writer, the entry is appended directly.
+        
+        Args:
+            entry: The history entry to persist
+        """
+        if self._io_thread is None:
+            line = self._encode_entry(entry)
+            if line is not None:
+                self._write_lines([line])
+            return
+        self._io_queue.put(entry)
+    
+    @staticmethod
+    def _encode_entry(entry: Dict[str, Any]) -> Optional[bytes]:
+        """Serialize an entry as one line of the history file, or return None if it can't be."""
+        try:
+            return orjson.dumps(entry) + b"\n"
+        except orjson.JSONEncodeError as e:
+            logger.warning("Could not serialize history entry: %s", e)
+            return None
+    
+    def _write_lines(self, lines: List[bytes]) -> None:
+        """Append serialized entries to the history file in a single write."""
+        try:
+            with open(self.history_file, "ab") as f:
+                f.write(b"".join(lines))
+        except IOError as e:
+            logger.warning("Could not save command history: %s", e)
+    
+    def _io_loop(self) -> None:
+        """Append queued history entries to the history file, coalescing them into batched writes."""
+        stopping = False
+        while not stopping:
+            entry = self._io_queue.get()
+            batch = []
+            taken = 0
+            size = 0
+            
+            # Drain whatever else is already waiting, up to the batch size
+            while True:
+                taken += 1
+                if entry is _STOP_WRITER:
+                    # Everything queued before cleanup() is in this batch or already written
+                    stopping = True
+                    break
+                line = self._encode_entry(entry)
+                if line is not None:
+                    batch.append(line)
+                    size += len(line)
+                
+                if size >= _WRITE_BATCH_BYTES:
+                    break
+                try:
+                    entry = self._io_queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            try:
+                if batch:
+                    self._write_lines(batch)
+            finally:
+                for _ in range(taken):
+                    self._io_queue.task_done()
     
     def _load_repl_history(self) -> List[str]:
-        """Load REPL command history from file."""
+        """Load the latest REPL commands from file, migrating the legacy format if needed."""
+        if self.legacy_repl_history_file.exists():
+            self._migrate_legacy_repl_history()
         if not self.repl_history_file.exists():
             return []
-            
+        
         try:
-            with open(self.repl_history_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            # Read only as many lines as are kept; older commands stay on disk until compaction
+            lines = read_tail_lines(self.repl_history_file, MAX_REPL_ENTRIES * _REPL_COMPACT_FACTOR)
+        except (OSError, ValueError):
             return []
+        
+        commands = []
+        for line in lines:
+            try:
+                commands.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                # Skip a line cut short by an interrupted write
+                continue
+        
+        if len(commands) >= MAX_REPL_ENTRIES * _REPL_COMPACT_FACTOR:
+            commands = commands[-MAX_REPL_ENTRIES:]
+            self._write_repl_history(commands)
+        return commands[-MAX_REPL_ENTRIES:]
     
-    def _save_repl_history(self) -> None:
-        """Save REPL command history to file."""
+    def _migrate_legacy_repl_history(self) -> None:
+        """Convert the REPL history from a single JSON array to one command per line."""
         try:
-            # Keep only the latest 1000 commands
-            history_to_save = self.repl_history[-1000:] if len(self.repl_history) > 1000 else self.repl_history
-            
-            with open(self.repl_history_file, 'w') as f:
-                json.dump(history_to_save, f)
+            commands = orjson.loads(self.legacy_repl_history_file.read_bytes())
+        except (orjson.JSONDecodeError, IOError):
+            commands = []
+        if self._write_repl_history(commands[-MAX_REPL_ENTRIES:]):
+            self.legacy_repl_history_file.unlink()
+    
+    def _write_repl_history(self, commands: List[str]) -> bool:
+        """Replace the REPL history file with the given commands."""
+        try:
+            self.repl_history_file.write_bytes(b"".join(orjson.dumps(command) + b"\n" for command in commands))
+            return True
         except IOError as e:
-            print(f"Warning: Could not save REPL history: {str(e)}")
+            logger.warning("Could not save REPL history: %s", e)
+            return False
     
     def add_command(self, command: str, directory: str, output: str = "", exit_code: int = 0, duration: float = 0.0) -> Dict[str, Any]:
         """
@@ -116,13 +491,14 @@ class HistoryManager:
             The newly created history entry
         """
         
+        now = time.time()  # Read the clock once for both timestamp fields
         # Create entry with rich metadata context
         entry = {
             "action_type": "shell_command",  # Specifing this is a shell command for compatibility
             "command": command,
             "directory": directory,
-            "timestamp": get_timestamp(),
-            "unix_timestamp": time.time(),
+            "timestamp": get_timestamp(unix_ts=now),
+            "unix_timestamp": now,
             "output": output[:1000] if output else "",  # Limiting output size
             "exit_code": exit_code,
             "duration": duration
@@ -132,8 +508,7 @@ class HistoryManager:
         entry["context"] = self._gather_command_context(command, directory)
         
         # Add to history and save
-        self.history.append(entry)
-        self._save_history()
+        self._record_entry(entry)
         
         return entry
     
@@ -152,12 +527,13 @@ class HistoryManager:
             The newly created history entry
         """
 
+        now = time.time()  # Read the clock once for both timestamp fields
         entry = {
             "action_type": "python_code",  # Specifing this is Python code
             "code": code[:2000],  # Limiting the code size
             "directory": directory,
-            "timestamp": get_timestamp(),
-            "unix_timestamp": time.time(),
+            "timestamp": get_timestamp(unix_ts=now),
+            "unix_timestamp": now,
             "output": output[:1000] if output else "",  # Limiting output size
             "exit_code": exit_code,
             "duration": duration
@@ -165,8 +541,7 @@ class HistoryManager:
         
         entry["context"] = self._gather_python_context(code, directory)
         
-        self.history.append(entry)
-        self._save_history()
+        self._record_entry(entry)
         
         return entry
     
@@ -183,13 +558,14 @@ class HistoryManager:
             The newly created history entry
         """
         
+        now = time.time()  # Read the clock once for both timestamp fields
         # Creating an entry for the overall action plan
         entry = {
             "action_type": "action_plan",
             "explanation": plan.explanation,
             "directory": directory,
-            "timestamp": get_timestamp(),
-            "unix_timestamp": time.time(),
+            "timestamp": get_timestamp(unix_ts=now),
+            "unix_timestamp": now,
             "actions": plan.actions,
             "success": results.get("executed", False) and all(
                 output.get("success", False) for output in results.get("outputs", [])
@@ -197,8 +573,7 @@ class HistoryManager:
             "backup_path": results.get("backup_path")
         }
         
-        self.history.append(entry)
-        self._save_history()
+        self._record_entry(entry)
         
         return entry
     
@@ -217,7 +592,7 @@ class HistoryManager:
         context = {
             "project": self._detect_project(directory),
             "files_affected": [],  # Will be populated later
-            "command_type": self._categorize_command(command)
+            "command_type": _categorize_command(command)
         }
         
         return context
@@ -238,42 +613,51 @@ class HistoryManager:
             "project": self._detect_project(directory),
             "files_affected": [],  # Will be populated later
             "imports": self._extract_python_imports(code),
-            "code_type": self._categorize_python_code(code)
+            "code_type": _categorize_python_code(code)
         }
         
         return context
     
     def _extract_python_imports(self, code: str) -> List[str]:
         """Extract import statements from Python code."""
-        imports = []
-        
         # Very simple approach - will need improvement for complex imports
-        for line in code.split('\n'):
-            line = line.strip()
-            if line.startswith('import ') or line.startswith('from '):
-                imports.append(line)
-                
-        return imports
-    
-    def _categorize_python_code(self, code: str) -> str:
-        """Categorize Python code by type/purpose."""
-        code_lower = code.lower()
-        
-        if 'import os' in code_lower and ('open(' in code_lower or 'os.path' in code_lower):
-            return "file_operation"
-        elif 'import requests' in code_lower or 'urllib' in code_lower:
-            return "networking"
-        elif 'import pandas' in code_lower or 'numpy' in code_lower or 'matplotlib' in code_lower:
-            return "data_analysis"
-        elif 'subprocess' in code_lower:
-            return "system_command"
-        else:
-            return "general"
+        return [match.group(0).strip() for match in _IMPORT_RE.finditer(code)]
     
     def _detect_project(self, directory: str) -> Optional[str]:
         """
         Attempt to detect which project the directory belongs to.
         
+        Results are cached per directory and reused while neither the directory
+        nor its .git/config has been modified.
+        
+        Args:
+            directory: Directory path
+            
+        Returns:
+            Project name if detected, None otherwise
+        """
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            config_mtime = os.stat(os.path.join(directory, ".git", "config")).st_mtime_ns
+        except OSError:
+            config_mtime = None
+        
+        stamp = (dir_mtime, config_mtime)
+        cached = self._project_cache.get(directory)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        
+        project = self._scan_project(directory)
+        self._project_cache[directory] = (stamp, project)
+        return project
+    
+    def _scan_project(self, directory: str) -> Optional[str]:
+        """
+        Detect the project of a directory by looking for common project files.
+        
         Args:
             directory: Directory path
             
@@ -288,18 +672,17 @@ class HistoryManager:
         git_dir = dir_path / ".git"
         if git_dir.exists():
             # Try to get repository name from config
-            git_config = dir_path / ".git" / "config"
-            if git_config.exists():
-                try:
-                    with open(git_config, "r") as f:
-                        for line in f:
-                            if "url = " in line:
-                                # Extract repo name from URL
-                                url = line.split("url = ")[1].strip()
-                                repo_name = url.split("/")[-1].replace(".git", "")
-                                return repo_name
-                except:
-                    pass
+            try:
+                config_text = (git_dir / "config").read_text()
+            except (OSError, UnicodeDecodeError):
+                config_text = ""
+            
+            _, found, rest = config_text.partition("url = ")
+            if found:
+                # Extract repo name from URL
+                url = rest.partition("\n")[0].strip()
+                repo_name = url.rsplit("/", 1)[-1]
+                return repo_name[:-4] if repo_name.endswith(".git") else repo_name
             
             # Fallback to directory name
             return dir_path.name
@@ -314,34 +697,6 @@ class HistoryManager:
         # No project detected
         return None
     
-    def _categorize_command(self, command: str) -> str:
-        """
-        Categorize a command by type.
-        
-        Args:
-            command: The command string
-            
-        Returns:
-            Command category as string
-        """
-        
-        # This is a simple categorization that will be expanded later
-        command = command.strip().split()[0] if command.strip() else ""
-        
-        # Common command categories
-        if command in ["git", "svn", "hg"]:
-            return "version_control"
-        elif command in ["cd", "ls", "dir", "pwd", "mv", "cp", "rm"]:
-            return "filesystem"
-        elif command in ["python", "python3", "pip", "pipenv", "venv"]:
-            return "python_dev"
-        elif command in ["npm", "yarn", "node"]:
-            return "node_dev"
-        elif command in ["docker", "docker-compose", "kubectl"]:
-            return "container"
-        else:
-            return "other"
-        
     def search_history(self, query: str = "", 
                       directory: Optional[str] = None,
                       limit: int = 10,
@@ -358,33 +713,71 @@ class HistoryManager:
         Returns:
             List of matching history entries
         """
-        results = []
-        
-        for entry in reversed(self.history):  # Most recent first
-            # Check action type filter
-            if action_type and entry.get("action_type") != action_type:
-                continue
-                
-            # Apply content filters based on action type
-            entry_type = entry.get("action_type", "shell_command")
-            
-            if query:
-                if entry_type == "shell_command" and query.lower() not in entry.get("command", "").lower():
+        query = query.lower()
+        
+        # Entries may be recorded from another thread while we search
+        with self._lock:
+            if not (query or directory or action_type) and limit > 0:
+                # Unfiltered: the most recent entries, indexed from the tail of the deque
+                history = self.history
+                return [history[-i] for i in range(1, min(limit, len(history)) + 1)]
+        
+            results = []
+            for entry, text in self._search_candidates(query):  # Most recent first
+                # Check action type filter
+                if action_type and entry.get("action_type") != action_type:
                     continue
-                elif entry_type == "python_code" and query.lower() not in entry.get("code", "").lower():
-                    continue
-                elif entry_type == "action_plan" and query.lower() not in entry.get("explanation", "").lower():
+                
+                # Apply content filter against the cached lowercased text
+                if query and query not in text:
                     continue
                 
-            if directory and entry.get("directory") != directory:
-                continue
+                if directory and entry.get("directory") != directory:
+                    continue
             
-            results.append(entry)
+                results.append(entry)
             
-            if len(results) >= limit:
-                break
+                if len(results) >= limit:
+                    break
                 
-        return results
+            return results
+    
+    def _search_candidates(self, query: str):
+        """
+        Yield the history entries that may contain the query with their search text, most recent first.
+        
+        Queries of at least _NGRAM characters are narrowed down with the search index;
+        shorter ones fall back to scanning the whole history.
+        
+        Args:
+            query: Lowercased search term
+            
+        Yields:
+            Tuples of (candidate history entry, its lowercased search text)
+        """
+        if len(query) < _NGRAM:
+            yield from zip(reversed(self.history), reversed(self._search_texts))
+            return
+        
+        grams = _ngrams(query)
+        postings = []
+        for gram in grams:
+            posting = self._search_index.get(gram)
+            if not posting:
+                # No entry contains this trigram, so nothing can match
+                return
+            postings.append(posting)
+        
+        # Walk the shortest posting list and reject entries missing any other trigram
+        # with a single mask test instead of intersecting every posting list
+        query_mask = _bloom_mask(grams)
+        blooms = self._blooms
+        first_seq = self._first_seq
+        for seq in reversed(min(postings, key=len)):
+            position = seq - first_seq
+            if blooms[position] & query_mask != query_mask:
+                continue
+            yield self.history[position], self._search_texts[position]
     
     def get_command_patterns(self, directory: Optional[str] = None, action_type: str = "shell_command") -> List[Dict[str, Any]]:
         """
@@ -397,45 +790,20 @@ class HistoryManager:
         Returns:
             List of command patterns with frequency information
         """
-        # This is a placeholder for more sophisticated pattern analysis
-        content_counts = {}
+        content_key = "command" if action_type == "shell_command" else "code"
         
-        for entry in self.history:
-            # Skip if we're filtering by directory and this doesn't match
-            if directory and entry.get("directory") != directory:
-                continue
-                
-            # Skip if entry type doesn't match
-            if entry.get("action_type") != action_type:
-                continue
-                
-            if action_type == "shell_command":
-                content = entry.get("command", "")
-            elif action_type == "python_code":
-                content = entry.get("code", "")[:50]  # First 50 chars as identifier
-            else:
-                continue
-                
-            # Count content occurrences
-            if content in content_counts:
-                content_counts[content] += 1
+        # Counts are maintained incrementally as entries are recorded
+        with self._lock:
+            if directory:
+                counts = self._pattern_counts_by_dir.get((action_type, directory))
             else:
-                content_counts[content] = 1
-        
-        # Convert to sorted list
-        patterns = []
-        for content, count in content_counts.items():
-            item = {"count": count}
-            if action_type == "shell_command":
-                item["command"] = content
-            elif action_type == "python_code":
-                item["code"] = content
-            patterns.append(item)
-        
-        # Sort by frequency (most frequent first)
-        patterns.sort(key=lambda x: x["count"], reverse=True)
-        
-        return patterns[:10]  # Return top 10 patterns
+                counts = self._pattern_counts.get(action_type)
+            
+            if not counts:
+                return []
+            
+            # Most frequent first, top 10 patterns
+            return [{"count": count, content_key: content} for content, count in counts.most_common(10)]
     
     def add_repl_command(self, command: str) -> None:
         """
@@ -445,9 +813,16 @@ class HistoryManager:
             command: The command string to add
         """
         self.repl_history.append(command)
-        self._save_repl_history()
+        
+        # A single appended line; the rest of the file is never rewritten here
+        try:
+            if self._repl_file is None:
+                self._repl_file = open(self.repl_history_file, "ab", buffering=0)
+            self._repl_file.write(orjson.dumps(command) + b"\n")
+        except IOError as e:
+            logger.warning("Could not save REPL history: %s", e)
     
-    def get_repl_history(self, limit: int = 1000) -> List[str]:
+    def get_repl_history(self, limit: int = MAX_REPL_ENTRIES) -> List[str]:
         """
         Get the REPL command history.
         
@@ -457,9 +832,17 @@ class HistoryManager:
         Returns:
             List of recent commands
         """
-        return self.repl_history[-limit:]
+        return list(self.repl_history)[-limit:]
     
     def cleanup(self) -> None:
         """Perform cleanup operations when shutting down."""
-        self._save_history()
-        self._save_repl_history()
\ No newline at end of file
+        # Stop the background writer once it has appended the entries queued so far
+        if self._io_thread is not None:
+            self._io_queue.put(_STOP_WRITER)
+            self._io_thread.join()
+            self._io_thread = None
+        atexit.unregister(self.cleanup)
+        
+        if self._repl_file is not None:
+            self._repl_file.close()
+            self._repl_file = None
\ No newline at end of file
@@ -16,50 +16,515 @@ The pipeline follows a clear sequence:
 1. Input Parsing -> 2. Context Gathering -> 3. Intent Extraction -> 4. Plan Generation -> 5. Execution -> 6. History Logging
 """
 
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
-from enum import Enum
+from typing import Dict, Any, List, Optional, Tuple
+import dataclasses
+from dataclasses import dataclass, field
 import os
-import json
+import re
+import sys
+import platform
+import logging
+import time
+import asyncio
 import traceback
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from pathlib import Path
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.prompt import Confirm
+from pydantic import BaseModel, ConfigDict, ValidationError
 
 from termora.core.agent import ActionPlan, TermoraAgent
 from termora.core.executor import CommandExecutor
-from termora.core.context import TerminalContext
+from termora.core.context import TerminalContext, history_entry_text
 from termora.core.history import HistoryManager
 from termora.core.rollback import RollbackManager
+from termora.core.batching import BatchingAgent
+from termora.core.fast_intents import try_fast_match
+from termora.core.cmd_validator import validate_command, validate_python
+from termora.core.cache import LRUCache, FrozenDict, PromptCache, SimilarityCache, freeze, make_cache_key
+from termora.utils.helpers import get_termora_dir, is_destructive_command
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Number of extracted intents and generated plans remembered for repeated requests
+_CACHE_SIZE = 256
+
+# Model responses remembered by exact prompt, and for how many seconds
+_PROMPT_CACHE_SIZE = 1000
+_PROMPT_CACHE_TTL = 3600.0
+
+# Built user prompts kept for repeated requests
+_PROMPT_MEMO_SIZE = 128
+
+# Distinct history entries added to the context; extra entries are fetched to cover duplicates
+_HISTORY_LIMIT = 10
+_HISTORY_FETCH = 20
+
+# Canonical action name for common synonyms and command names the model may return
+_ACTION_ALIASES = {
+    "mv": "move", "relocate": "move",
+    "cp": "copy", "duplicate": "copy",
+    "ls": "list", "show": "list",
+    "rm": "delete", "remove": "delete", "trash": "delete", "del": "delete",
+    "search": "find", "locate": "find",
+    "wc": "count",
+    "mkdir": "create", "touch": "create", "make": "create",
+    "ren": "rename",
+}
+
+
+def _normalize_action(action: Any) -> str:
+    """
+    Map an action name from the model to its canonical, interned form.
+    
+    Interning makes repeated comparisons against the same action names identity checks,
+    and canonical names let synonymous requests share cache entries.
+    
+    Args:
+        action: Action name as returned by the model
+        
+    Returns:
+        Canonical action name, or "unknown" if there is none
+    """
+    if not isinstance(action, str) or not action.strip():
+        return "unknown"
+    action = action.strip().lower()
+    return sys.intern(_ACTION_ALIASES.get(action, action))
+
+# Canonical actions a draft model intent may have to be accepted without asking the main model
+_DRAFT_ACTIONS = frozenset({"move", "copy", "rename", "find", "list", "count", "delete", "create", "open"})
+
+# The draft model is disabled once this share of its intents had to be redone by the main model
+_DRAFT_MAX_MISS_RATE = 0.3
+
+# Draft attempts observed before the miss rate is trusted
+_DRAFT_MIN_ATTEMPTS = 10
+
+# Characters that matter when locating a JSON object: braces and string delimiters
+_JSON_STRUCTURE_RE = re.compile(r'[{}"]')
+
+# Brace-delimited blocks tried before giving up on finding JSON in a response
+_MAX_JSON_BLOCKS = 8
+
+# Characters that can end (or escape within) a JSON string
+_JSON_STRING_END_RE = re.compile(r'["\\]')
+
+# Extra plan generation guidance for each operating system (platform.system() names)
+_OS_GUIDANCE = {
+    "Darwin": """IMPORTANT: You're generating commands for macOS which uses BSD versions of utilities:
+1. macOS 'find' doesn't support -printf, use -exec or pipe to another command instead
+2. Some GNU-style parameters may not work; use BSD variants
+3. For complex file operations, consider using 'stat', 'ls -la', or other macOS compatible commands
+""",
+    "Linux": """You're generating commands for Linux which typically uses GNU utilities.
+""",
+    "Windows": """IMPORTANT: You're generating commands for Windows. Use PowerShell commands when possible as they are more consistent.
+""",
+}
+
+# Minified JSON shapes the model is asked to return. Terse schemas are followed as well
+# as long prose descriptions and cost far fewer prompt tokens.
+_INTENT_SCHEMA = (
+    '{"action":"str","target_dir":"str|null","file_filter":"obj|null","time_filter":"obj|null",'
+    '"destination":"str|null","limit":"int|null","sort_by":"str|null","recursive":"bool","reasoning":"str"}'
+)
+_PLAN_SCHEMA = (
+    '{"plan":[{"type":"shell_command","content":"str","explanation":"str","fallback":"str|null"}],'
+    '"preview":{"natural_language":"str","safety_notes":"str"},"requires_backup":"bool","backup_paths":["str"]}'
+)
+_COMBINED_SCHEMA = '{"intent":' + _INTENT_SCHEMA + ',' + _PLAN_SCHEMA[1:]
+
+_INTENT_GUIDE = (
+    "Identify the primary action (move, find, list, count, delete, ...) and its parameters, "
+    "mapping vague references to concrete paths, filters and dates. Explain your reasoning briefly.\n"
+    'Example intent for "Move all screenshots from March into an archive folder" -> '
+    '{"action":"move","file_filter":{"name_pattern":"*screenshot*"},'
+    '"time_filter":{"from":"2024-03-01","to":"2024-04-01"},"destination":"~/archive","reasoning":"..."}'
+)
+
+_PLAN_RULES = (
+    "Commands must suit the user's OS, resolve every referenced path and check for errors. "
+    "Chain dependent commands with && and give a || fallback. Use safe alternatives for "
+    "dangerous operations and move files to the trash instead of deleting them."
+)
+
+# Static instructions for intent extraction. Sent as the system prompt so that providers
+# with prefix caching can reuse it across requests; only the user message changes.
+_INTENT_SYSTEM_PROMPT = f"""You are Termora, a terminal assistant. Extract the intent of the user request.
+{_INTENT_GUIDE}
+Reply with only JSON matching: {_INTENT_SCHEMA}
+"""
+
+# Static instructions for plan generation, sent as the system prompt
+_PLAN_SYSTEM_PROMPT = f"""You are Termora, a terminal assistant. Generate a safe shell plan for the extracted intent.
+{_PLAN_RULES}
+Reply with only JSON matching: {_PLAN_SCHEMA}
+"""
+
+# Static instructions for extracting the intent and generating the plan in a single call
+_COMBINED_SYSTEM_PROMPT = f"""You are Termora, a terminal assistant. Extract the intent of the user request, then generate a safe shell plan for it.
+{_INTENT_GUIDE}
+{_PLAN_RULES}
+Reply with only JSON matching: {_COMBINED_SCHEMA}
+"""
+
+# Request-specific user prompts. Only the slots change between requests, and the context
+# comes first, so consecutive prompts in one directory share a long common prefix.
+_REQUEST_TEMPLATE = """{context}
+
+USER REQUEST: {user_input}
+"""
+
+_PLAN_REQUEST_TEMPLATE = _REQUEST_TEMPLATE + """
+EXTRACTED INTENT:
+{intent_json}
+
+REASONING:
+{reasoning}
+"""
+
+
+class _IntentSchema(BaseModel):
+    """Expected shape of an extracted intent. Unknown keys are kept."""
+    model_config = ConfigDict(extra="allow")
+    
+    action: str = "unknown"
+    target_dir: Optional[str] = None
+    file_filter: Optional[Dict[str, Any]] = None
+    time_filter: Optional[Dict[str, Any]] = None
+    destination: Optional[str] = None
+    limit: Optional[int] = None
+    sort_by: Optional[str] = None
+    recursive: bool = True
+    reasoning: str = ""
+
+
+class _ActionSchema(BaseModel):
+    """Expected shape of one planned action."""
+    model_config = ConfigDict(extra="allow")
+    
+    type: str = "shell_command"
+    content: str
+    explanation: str = ""
+    fallback: Optional[str] = None
+
+
+class _PlanSchema(BaseModel):
+    """Expected shape of a generated plan, optionally with the intent it was made for."""
+    model_config = ConfigDict(extra="allow")
+    
+    intent: Optional[_IntentSchema] = None
+    plan: List[_ActionSchema] = []
+    preview: Dict[str, Any] = {}
+    requires_backup: bool = False
+    backup_paths: List[str] = []
+
+
+def _validate_model_output(schema: type, data: Any, required: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    """
+    Check parsed model output against its expected shape.
+    
+    Optional fields with the wrong type are dropped rather than failing the whole
+    response; a response whose required fields are invalid is rejected.
+    
+    Args:
+        schema: Pydantic model describing the output
+        data: Parsed JSON
+        required: Top-level keys that must be valid for the output to be usable
+        
+    Returns:
+        The validated data (only the keys the model provided), or None if it is unusable
+    """
+    if not isinstance(data, dict):
+        return None
+    try:
+        return schema.model_validate(data).model_dump(exclude_unset=True)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+        if not invalid or invalid.intersection(required):
+            return None
+    try:
+        return schema.model_validate(
+            {key: value for key, value in data.items() if key not in invalid}
+        ).model_dump(exclude_unset=True)
+    except ValidationError:
+        return None
+
+def _format_os_information(os_name: str, os_version: str) -> str:
+    """Build the operating system section of plan prompts."""
+    return f"""OPERATING SYSTEM INFORMATION:
+OS: {os_name}
+Version: {os_version}
+{_OS_GUIDANCE.get(os_name, "")}
+"""
+
+
+class _JsonObjectScanner:
+    """
+    Incrementally locates the first complete JSON object in text that arrives in pieces.
+    
+    Tracks nesting depth from the first '{', skipping over braces inside string
+    literals, and jumps between structural characters with precompiled regexes
+    rather than stepping through every character in Python. State persists
+    across feed() calls and only the new piece is scanned, so a streamed response
+    costs time linear in its length. Pieces are kept in a list and only joined
+    when the object (or the full text) is needed.
+    """
+    
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._length = 0  # Characters received so far
+        self._start = -1  # Absolute index of the opening brace, -1 until one has been seen
+        self._pos = 0  # Absolute index where scanning resumes
+        self._depth = 0
+        self._in_string = False
+    
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Add more text and continue scanning.
+        
+        Args:
+            chunk: Next piece of the response
+            
+        Returns:
+            The JSON object text once it is complete, otherwise None
+        """
+        if chunk:
+            self._chunks.append(chunk)
+            self._length += len(chunk)
+        
+        # Scan only the newest piece unless scanning stopped inside an earlier one
+        # (an escape split across pieces, or a skip() mid-piece)
+        base = self._length - len(self._chunks[-1]) if self._chunks else 0
+        if self._pos < base:
+            segment = self.text
+            base = 0
+        else:
+            segment = self._chunks[-1] if self._chunks else ""
+        pos = self._pos - base
+        
+        if self._start < 0:
+            start = segment.find("{", pos)
+            if start < 0:
+                self._pos = self._length
+                return None
+            self._start = base + start
+            pos = start
+        
+        while True:
+            if self._in_string:
+                # Skip to the closing quote, stepping over escaped characters
+                match = _JSON_STRING_END_RE.search(segment, pos)
+                if match is None:
+                    self._pos = self._length
+                    return None
+                if match.group() == '"':
+                    self._in_string = False
+                    pos = match.end()
+                elif match.end() < len(segment):
+                    pos = match.end() + 1
+                else:
+                    # The escaped character hasn't arrived yet
+                    self._pos = base + match.start()
+                    return None
+                continue
+            
+            match = _JSON_STRUCTURE_RE.search(segment, pos)
+            if match is None:
+                self._pos = self._length
+                return None
+            pos = match.end()
+            
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pos = base + pos
+                    return self.text[self._start:self._pos]
+    
+    def skip(self) -> None:
+        """Discard the object just found and look for the next one on the following feed()."""
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+
+
+def _extract_json(text: str) -> Optional[str]:
+    """
+    Find the first complete JSON object in a model response.
+    
+    Args:
+        text: Raw model response that may contain prose around the JSON
+        
+    Returns:
+        The JSON object text, or None if no complete object was found
+    """
+    return _JsonObjectScanner().feed(text)
+
+
+def _load_json_object(text: str, marker: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parse the first JSON object in a model response that is actually valid JSON.
+    
+    Models sometimes put brace-delimited placeholders or snippets in their prose
+    before the real answer, so blocks that fail to parse are skipped.
+    
+    Args:
+        text: Raw model response that may contain prose around the JSON
+        marker: Text the wanted object must contain, such as '"plan"'. Blocks without it
+            are skipped without being parsed (optional)
+        
+    Returns:
+        The parsed object, or None if no block parses to a JSON object
+    """
+    # Most responses are nothing but the object, which orjson can parse without scanning
+    stripped = text.strip()
+    if stripped[:1] == "{" and stripped[-1:] == "}" and (marker is None or marker in stripped):
+        try:
+            data = orjson.loads(stripped)
+            if isinstance(data, dict):
+                return data
+        except orjson.JSONDecodeError:
+            pass
+    
+    scanner = _JsonObjectScanner()
+    json_str = scanner.feed(text)
+    for _ in range(_MAX_JSON_BLOCKS):
+        if json_str is None:
+            return None
+        if marker is not None and marker not in json_str:
+            scanner.skip()
+            json_str = scanner.feed("")
+            continue
+        try:
+            data = orjson.loads(json_str)
+            if isinstance(data, dict):
+                return data
+        except orjson.JSONDecodeError:
+            pass
+        scanner.skip()
+        json_str = scanner.feed("")
+    return None
+
+
+@dataclass(frozen=True, slots=True)
 class Intent:
-    """Represents the extracted intent from user input."""
+    """
+    Represents the extracted intent from user input.
+    
+    Intents are immutable and hashable, so they can be used directly in cache keys.
+    """
     action: str  # Primary action (move, find, count, etc.)
     target_dir: Optional[str] = None  # Target directory for operations
-    file_filter: Optional[Dict[str, Any]] = None  # File selection criteria
-    time_filter: Optional[Dict[str, Any]] = None  # Time-based constraints
+    file_filter: Optional[FrozenDict] = None  # File selection criteria
+    time_filter: Optional[FrozenDict] = None  # Time-based constraints
     destination: Optional[str] = None  # Destination for move/copy operations
     limit: Optional[int] = None  # Result limit
     sort_by: Optional[str] = None  # Sorting criteria
     recursive: bool = True  # Whether to operate recursively
+    # Serialized form for plan prompts, filled in on first use
+    _prompt_json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Model output may put dicts or lists in any field; freeze them so the intent stays hashable
+        for name in _INTENT_FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, (dict, list)):
+                object.__setattr__(self, name, freeze(value))
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert intent to dictionary for serialization."""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        return {field: value for field in _INTENT_FIELDS if (value := getattr(self, field)) is not None}
     
-@dataclass
+    def as_prompt_json(self) -> str:
+        """
+        Get the intent as indented JSON for prompts.
+        
+        The intent is immutable, so it is serialized once and reused by later prompts,
+        such as retries after a failed plan generation call. Equal intents rebuilt from
+        the intent cache share the serialized form as well.
+        """
+        if self._prompt_json is None:
+            object.__setattr__(self, "_prompt_json", _intent_prompt_json(self))
+        return self._prompt_json
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _intent_prompt_json(intent: Intent) -> str:
+    """Serialize an intent for prompts, once per distinct intent. No indentation, which would only cost tokens."""
+    return orjson.dumps(intent.to_dict()).decode()
+
+
+# Prompts are memoized on their (already formatted) parts, so a repeated request in an
+# unchanged directory reuses the exact same string instead of building another copy
+@lru_cache(maxsize=_PROMPT_MEMO_SIZE)
+def _request_prompt(context: str, user_input: str) -> str:
+    """Build the user prompt for intent extraction or the combined call."""
+    return _REQUEST_TEMPLATE.format_map({"context": context, "user_input": user_input})
+
+
+@lru_cache(maxsize=_PROMPT_MEMO_SIZE)
+def _plan_request_prompt(context: str, user_input: str, intent_json: str, reasoning: str) -> str:
+    """Build the user prompt for plan generation."""
+    return _PLAN_REQUEST_TEMPLATE.format_map({
+        "context": context,
+        "user_input": user_input,
+        "intent_json": intent_json,
+        "reasoning": reasoning,
+    })
+
+
+@dataclass(slots=True)
+class Action:
+    """A single step of a plan."""
+    type: str  # shell_command or python_code
+    content: str  # Command or code to run
+    explanation: str = ""  # What the step does
+    fallback: Optional[str] = None  # Command to try if this one fails
+    
+    def __post_init__(self):
+        # Plans repeat the same few action types, so share one string for each
+        self.type = sys.intern(self.type)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Action":
+        """Create an action from a (validated) plan entry."""
+        return cls(
+            type=data.get("type") or "shell_command",
+            content=data.get("content", ""),
+            explanation=data.get("explanation") or "",
+            fallback=data.get("fallback")
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert action to the dictionary form used by the executor and history."""
+        return {"type": self.type, "content": self.content, "explanation": self.explanation, "fallback": self.fallback}
+
+
+@dataclass(slots=True)
 class TermoraPlan:
     """Complete execution plan with all metadata."""
     user_input: str
     intent: Intent
     reasoning: str
-    plan: List[Dict[str, Any]]  # List of action objects
+    plan: List[Action]  # Actions to run, in order
     preview: Dict[str, str]
     requires_backup: bool = False
-    backup_paths: List[str] = None
+    backup_paths: List[str] = field(default_factory=list)
+    # ActionPlan built on first use by as_action_plan()
+    _action_plan: Optional[ActionPlan] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert plan to dictionary for serialization."""
@@ -67,11 +532,130 @@ class TermoraPlan:
             "user_input": self.user_input,
             "intent": self.intent.to_dict(),
             "reasoning": self.reasoning,
-            "plan": self.plan,
+            "plan": [action.to_dict() for action in self.plan],
             "preview": self.preview,
             "requires_backup": self.requires_backup,
-            "backup_paths": self.backup_paths or []
+            "backup_paths": self.backup_paths
         }
+    
+    def as_action_plan(self) -> ActionPlan:
+        """
+        Get the ActionPlan used for execution.
+        
+        It is built once and reused; its actions are the dictionaries the executor works with.
+        
+        Returns:
+            ActionPlan object
+        """
+        if self._action_plan is not None:
+            return self._action_plan
+        
+        # Create explanation from preview
+        explanation = self.preview.get("natural_language", "")
+        if "safety_notes" in self.preview:
+            explanation = "\n\n".join((explanation, self.preview["safety_notes"]))
+        
+        self._action_plan = ActionPlan(
+            explanation=explanation,
+            actions=[action.to_dict() for action in self.plan],
+            requires_confirmation=True,  # Always confirm
+            requires_backup=self.requires_backup,
+            backup_paths=self.backup_paths,
+            reasoning=self.reasoning
+        )
+        return self._action_plan
+
+# Intent fields in declaration order, read from the dataclass once and used for serialization
+_INTENT_FIELDS = tuple(f.name for f in dataclasses.fields(Intent) if f.init)
+
+# Intent fields that may be taken from model output
+_INTENT_KEYS = frozenset(_INTENT_FIELDS)
+
+# TermoraPlan fields that come from the plan part of model output
+_PLAN_DATA_KEYS = frozenset(
+    f.name for f in dataclasses.fields(TermoraPlan) if f.init and f.name not in ("user_input", "intent", "reasoning")
+)
+
+def _match_fast_rule(user_input: str) -> Optional[TermoraPlan]:
+    """
+    Build the plan for a trivial request without calling the AI model.
+    
+    Args:
+        user_input: Parsed user request
+        
+    Returns:
+        TermoraPlan for the request, or None if no built-in command answers it
+    """
+    # The built-in commands are POSIX
+    if os.name == "nt":
+        return None
+    
+    match = try_fast_match(user_input)
+    if match is None or match.command is None:
+        return None
+    return TermoraPlan(
+        user_input=user_input,
+        intent=Intent(**match.intent),
+        reasoning="Matched a built-in rule for a common request.",
+        plan=[Action(type="shell_command", content=match.command, explanation=match.explanation)],
+        preview={"natural_language": match.explanation}
+    )
+
+
+def _match_fast_intent(user_input: str) -> Optional[Tuple[Intent, str]]:
+    """
+    Recognize the intent of a common request without calling the AI model.
+    
+    Args:
+        user_input: Parsed user request
+        
+    Returns:
+        Tuple of (Intent object, reasoning string), or None if no rule matches
+    """
+    match = try_fast_match(user_input)
+    if match is None:
+        return None
+    return Intent(**match.intent), "Matched a built-in pattern for a common request."
+
+
+
+def _plan_problems(plan: "TermoraPlan") -> List[str]:
+    """
+    Check every action of a plan before it is handed to the executor.
+    
+    Args:
+        plan: Plan to check
+        
+    Returns:
+        Descriptions of the invalid actions (empty if the plan is valid)
+    """
+    problems = []
+    for i, action in enumerate(plan.plan, 1):
+        if action.type == "python_code":
+            problem = validate_python(action.content)
+        else:
+            problem = validate_command(action.content)
+        if problem:
+            problems.append(f"step {i}: {problem}")
+    return problems
+
+
+def _intent_paths(intent: Intent, cwd: str) -> List[str]:
+    """Paths a request with this intent is likely to touch, relative paths resolved against cwd."""
+    return [os.path.join(cwd, os.path.expanduser(path)) for path in (intent.target_dir, intent.destination) if path] or [cwd]
+
+
+def _is_replayable(plan: TermoraPlan) -> bool:
+    """
+    Check whether a plan is safe to reuse for an equivalently worded request.
+    
+    Only plans made purely of non-destructive shell commands qualify, as a second
+    safeguard on top of the exact wording match.
+    """
+    return bool(plan.plan) and all(
+        action.type == "shell_command" and not is_destructive_command(action.content)
+        for action in plan.plan
+    )
 
 class TermoraPipeline:
     """
@@ -79,27 +663,71 @@ class TermoraPipeline:
     This acts as a facade coordinating the different components.
     """
     
-    def __init__(self, agent, executor, context_provider, history_manager, rollback_manager, debug: bool = False):
-        """Initialize the pipeline with required components."""
+    def __init__(self, agent, executor, context_provider, history_manager, rollback_manager, debug: bool = False,
+                 fused: bool = True, prompt_cache_path: Optional[Path] = None):
+        """
+        Initialize the pipeline with required components.
+        
+        Args:
+            fused: Extract the intent and generate the plan with a single AI call.
+                When False, the plan is generated in a second call from the extracted intent.
+            prompt_cache_path: File model responses are kept in between sessions (optional)
+        """
         self.agent = agent
         self.executor = executor
         self.context_provider = context_provider
         self.history_manager = history_manager
         self.debug = debug
         self.rollback_manager = rollback_manager
+        self.fused = fused
+        
+        # Debug steps of this session, for dump_trace() and the session's trace file
+        self._trace: List[Dict[str, Any]] = []
+        self._trace_file = None
+        
+        # Formatted context from the previous request, reused while the directory, shell
+        # history and git status are unchanged
+        self._ctx_sig = None
+        self._ctx_str = None
+        
+        # Parsed model responses for requests already seen, to skip repeated AI calls
+        self._similar_plans = SimilarityCache(maxsize=_CACHE_SIZE)
+        self._prompt_cache = PromptCache(maxsize=_PROMPT_CACHE_SIZE, ttl=_PROMPT_CACHE_TTL, path=prompt_cache_path)
+        self._intent_cache = LRUCache(maxsize=_CACHE_SIZE)
+        self._plan_cache = LRUCache(maxsize=_CACHE_SIZE)
+        
+        # Optional smaller model for intent extraction, with its acceptance statistics
+        self.draft_model = getattr(agent, "config", {}).get("draft_model")
+        self._draft_attempts = 0
+        self._draft_misses = 0
+        
+        # Runs independent context gathering steps concurrently
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="termora-pipeline")
+        
+        # Execution and history logging happens in the background after results are returned.
+        # A single worker keeps the writes in execution order. cleanup() shuts it down; without
+        # that, the interpreter still lets queued writes finish before exiting.
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="termora-io")
     
     @classmethod
-    def from_config(cls, agent_config: Dict[str, Any], debug: bool = False) -> 'TermoraPipeline':
+    def from_config(cls, agent_config: Dict[str, Any], debug: bool = False, fused: bool = True,
+                    batched: bool = False) -> 'TermoraPipeline':
         """
         Create a new pipeline instance from configuration.
         
         Args:
             agent_config: Configuration for the AI agent
+            debug: Whether to enable pipeline debug mode
+            fused: Whether to extract intent and generate the plan in a single AI call
+            batched: Whether to batch AI calls from concurrent requests (for pipelines
+                shared between several users)
             
         Returns:
             New TermoraPipeline instance
         """
         agent = TermoraAgent(config=agent_config)
+        if batched:
+            agent = BatchingAgent(agent)
         executor = CommandExecutor()
         context_provider = TerminalContext()
         history_manager = HistoryManager()
@@ -111,28 +739,70 @@ class TermoraPipeline:
             context_provider=context_provider,
             history_manager=history_manager,
             rollback_manager=rollback_manager,
-            debug=debug
+            debug=debug,
+            fused=fused,
+            prompt_cache_path=get_termora_dir() / "prompt_cache.json"
         )
         
+    @cached_property
+    def console(self):
+        """Console for debug output, created on first use."""
+        from rich.console import Console
+        return Console()
+    
     def _debug_step(self, step_name: str, data: Any = None, pause: bool = True) -> None:
-        """Print debug information for a pipeline step."""
+        """
+        Record and print debug information for a pipeline step.
+        
+        Steps are kept for dump_trace() and appended to a JSONL file in ~/.termora/traces,
+        so requests can be replayed and inspected at full speed. Set TERMORA_DEBUG_PAUSE=1
+        to wait for Enter after each step.
+        """
         if not self.debug:
             return
         
+        entry = {"step": step_name, "data": data, "timestamp": time.time()}
+        self._trace.append(entry)
+        self._write_trace(entry)
+        
+        # Only needed in debug mode; rich.syntax in particular is slow to import
+        from rich.panel import Panel
+        from rich.syntax import Syntax
+        
         self.console.print(f"\n[bold cyan]=== Pipeline Step: {step_name} ===[/bold cyan]")
         
         if data is not None:
             if isinstance(data, (dict, list)):
                 # Pretty print JSON data
-                self.console.print(Syntax(json.dumps(data, indent=2), "json", theme="monokai"))
+                self.console.print(Syntax(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str).decode(), "json", theme="monokai"))
             else:
                 # Print other data types
                 self.console.print(Panel(str(data), title="Data"))
         
-        if pause:
+        if pause and os.environ.get("TERMORA_DEBUG_PAUSE") == "1":
             self.console.print("\n[bold yellow]Press Enter to continue to next step...[/bold yellow]")
             input()
+    
+    def _write_trace(self, entry: Dict[str, Any]) -> None:
+        """Append a debug step to this session's trace file, creating it on first use."""
+        try:
+            if self._trace_file is None:
+                trace_dir = get_termora_dir() / "traces"
+                trace_dir.mkdir(exist_ok=True)
+                trace_name = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.jsonl"
+                self._trace_file = open(trace_dir / trace_name, "ab", buffering=0)
+            self._trace_file.write(orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS, default=str) + b"\n")
+        except (OSError, TypeError) as e:
+            logger.warning("Could not write debug trace: %s", e)
+    
+    def dump_trace(self) -> List[Dict[str, Any]]:
+        """
+        Get the debug steps recorded in this session.
         
+        Returns:
+            List of {"step", "data", "timestamp"} entries, oldest first (empty unless debugging)
+        """
+        return list(self._trace)
     
     def process(self, user_input: str) -> Dict[str, Any]:
         """
@@ -147,57 +817,121 @@ class TermoraPipeline:
         try:
             self._debug_step("Input", {"user_input": user_input})
             
-            # Add to REPL history
-            self.history_manager.add_repl_command(user_input)
+            # Working directory for this request, looked up once
+            cwd = os.getcwd()
             
             # 1. Parse input 
             parsed_input = self._parse_input(user_input)
+            
+            # Trivial requests map straight to a built-in plan and repeats of earlier requests in
+            # this directory reuse their safe plan. Both are checked before anything else, so
+            # they never start context gathering or call the AI model.
+            plan = _match_fast_rule(parsed_input)
+            path = "fast"
+            if plan is None:
+                plan = self._similar_plan(parsed_input, cwd)
+                path = "similar"
+            if plan is None:
+                path = "llm"
+                # Start gathering context right away (file system, git and shell history reads run
+                # alongside the history search) so it overlaps with recording the input
+                context_future = self._pool.submit(self.context_provider.get_context, cwd)
+                history_future = self._pool.submit(self.history_manager.search_history, limit=_HISTORY_FETCH)
+            
+            # Add to REPL history
+            self.history_manager.add_repl_command(user_input)
             self._debug_step("Parsed Input", {"parsed_input": parsed_input})
             
-            # 2. Gather context
-            print("Pipeline: Gathering context")
-            context_data = self.context_provider.get_context()
-            context_data["command_history"] = self.history_manager.search_history(limit=10)
-            self._debug_step("Context", context_data)
+            if path == "fast":
+                if self.debug:
+                    self._debug_step("Fast Path", {"plan": plan.to_dict()})
+            elif path == "similar":
+                if self.debug:
+                    self._debug_step("Similar Request", {"plan": plan.to_dict()})
+            else:
+                # 2. Collect the gathered context
+                logger.debug("Pipeline: Gathering context")
+                context_data = context_future.result()
+                context_data["command_history"] = self._distinct_history(history_future.result())
+                # Formatted once here and shared by every prompt built for this request
+                context_data["prompt_context"] = self._format_context(context_data)
+                self._debug_step("Context", context_data)
             
-            # 3. Extract intent via AI model
-            print("Pipeline: Extracting intent")
-            try:
-                intent, reasoning = self._extract_intent(parsed_input, context_data)
-                self._debug_step("Intent Extraction", {
-                    "intent": intent.to_dict(),
-                    "reasoning": reasoning
-                })
-            except Exception as e:
-                self._debug_step("Intent Extraction Error", str(e))
-                raise Exception(f"Failed to extract intent: {str(e)}") from e
+                # Common requests have a recognizable intent, leaving only the plan for the model
+                known_intent = _match_fast_intent(parsed_input)
+                
+                if self.fused and known_intent is None:
+                    # The intent is only known once the reply arrives; prepare for the working directory
+                    self._pool.submit(self.executor.prewarm, [cwd])
+                    
+                    # 3+4. Extract intent and generate plan with a single AI call
+                    logger.debug("Pipeline: Extracting intent and generating plan")
+                    try:
+                        plan = self._extract_intent_and_plan(parsed_input, context_data)
+                        # Same debug steps as the two-step path, so both can be compared
+                        if self.debug:
+                            self._debug_step("Intent Extraction", {
+                                "intent": plan.intent.to_dict(),
+                                "reasoning": plan.reasoning
+                            })
+                            self._debug_step("Plan Generation", {
+                                "plan": plan.to_dict(),
+                                "action_count": len(plan.plan)
+                            })
+                    except Exception as e:
+                        self._debug_step("Intent and Plan Generation Error", str(e))
+                        raise Exception(f"Failed to generate plan: {str(e)}") from e
+                else:
+                    # 3. Extract intent via AI model, unless a built-in pattern recognized it
+                    logger.debug("Pipeline: Extracting intent")
+                    try:
+                        intent, reasoning = known_intent or self._extract_intent(parsed_input, context_data)
+                        if self.debug:
+                            self._debug_step("Intent Extraction", {
+                                "intent": intent.to_dict(),
+                                "reasoning": reasoning
+                            })
+                    except Exception as e:
+                        self._debug_step("Intent Extraction Error", str(e))
+                        raise Exception(f"Failed to extract intent: {str(e)}") from e
             
-            # 4. Generate plan
-            try:
-                plan = self._generate_plan(intent, reasoning, parsed_input, context_data)
-                self._debug_step("Plan Generation", {
-                    "plan": plan.to_dict(),
-                    "action_count": len(plan.plan)
-                })
-            except Exception as e:
-                self._debug_step("Plan Generation Error", str(e))
-                raise Exception(f"Failed to generate plan: {str(e)}") from e
+                    # Prepare the executor for the paths involved while the plan is generated
+                    self._pool.submit(self.executor.prewarm, _intent_paths(intent, cwd))
+                    
+                    # 4. Generate plan
+                    try:
+                        plan = self._generate_plan(intent, reasoning, parsed_input, context_data)
+                        if self.debug:
+                            self._debug_step("Plan Generation", {
+                                "plan": plan.to_dict(),
+                                "action_count": len(plan.plan)
+                            })
+                    except Exception as e:
+                        self._debug_step("Plan Generation Error", str(e))
+                        raise Exception(f"Failed to generate plan: {str(e)}") from e
             
-            # 5. Convert to generated plan to ActionPlan for execution
+            # 5. Check the generated commands deterministically, then convert the plan to an
+            # ActionPlan for execution
+            problems = _plan_problems(plan)
+            if problems:
+                self._debug_step("Plan Validation Error", problems)
+                raise ValueError(f"Generated plan is invalid ({'; '.join(problems)})")
             try:
-                action_plan = self._convert_to_action_plan(plan)
-                self._debug_step("Action Plan", {
-                    "explanation": action_plan.explanation,
-                    "actions": action_plan.actions,
-                    "requires_backup": action_plan.requires_backup,
-                    "backup_paths": action_plan.backup_paths
-                })
+                action_plan = plan.as_action_plan()
+                if self.debug:
+                    self._debug_step("Action Plan", {
+                        "explanation": action_plan.explanation,
+                        "actions": action_plan.actions,
+                        "requires_backup": action_plan.requires_backup,
+                        "backup_paths": action_plan.backup_paths
+                    })
             except Exception as e:
                 self._debug_step("Action Plan Conversion Error", str(e))
                 raise Exception(f"Failed to convert plan: {str(e)}") from e
             
              # If in debug mode 
             if self.debug:
+                from rich.prompt import Confirm
                 if not Confirm.ask("Execute this plan?"):
                     return {
                         "executed": False,
@@ -206,32 +940,76 @@ class TermoraPipeline:
             
             # 6. Execute (with safety preview and confirmation)
             result = self.executor.execute_plan(action_plan)
+            # Where the plan came from: a built-in rule, an equivalent earlier request or the model
+            result["path"] = path
             self._debug_step("Execution Result", result)
             
-            # 7. Log history and return result
+            # 7. Log history in the background and return result
             if result.get("executed", False):
-                self.rollback_manager.save_execution_history(result)
-                self.history_manager.add_action_plan(action_plan, result, os.getcwd())
-                self._debug_step("History Updated", {
-                    "action_plan": action_plan.explanation,
-                    "success": True
-                })
+                # The commands may have changed files the cached context describes
+                self.context_provider.invalidate()
+                succeeded = all(output.get("success", False) for output in result.get("outputs", []))
+                if path == "llm" and succeeded and _is_replayable(plan):
+                    self._similar_plans.put(parsed_input, plan.to_dict(), scope=cwd)
+                self._io_pool.submit(self._save_execution, action_plan, result, cwd)
+                if self.debug:
+                    self._debug_step("History Queued", {
+                        "action_plan": action_plan.explanation,
+                        "success": True
+                    })
             
             return result
         except Exception as e:
-            error_details = {
-                "error": str(e),
-                "traceback": traceback.format_exc()
-            }
-            self._debug_step("Critical Error", error_details)
+            # Walking and formatting the frames is only worth it when someone will see them:
+            # in debug mode, or with --verbose, which turns on debug logging
+            if self.debug or logger.isEnabledFor(logging.DEBUG):
+                error_details = traceback.format_exc()
+            else:
+                error_details = str(e)
+            if self.debug:
+                self._debug_step("Critical Error", {"error": str(e), "traceback": error_details})
             return {
                 "executed": False,
                 "reason": f"Pipeline error: {str(e)}",
-                "error_details": traceback.format_exc()
+                "error_details": error_details
             }
     
+    async def process_async(self, user_input: str) -> Dict[str, Any]:
+        """
+        Process user input without blocking the calling event loop.
+
+        This is not a native async pipeline: process() runs unchanged on a worker thread
+        (asyncio.to_thread), and its model calls stay blocking calls on that thread. They
+        go through the agent's pooled HTTP session, so concurrent requests still reuse open
+        connections. Each request in flight holds a thread from the default executor, and
+        cancelling the awaiting task doesn't stop a request that has already started.
+        
+        Args:
+            user_input: Natural language input from user
+            
+        Returns:
+            Dictionary with execution results
+        """
+        return await asyncio.to_thread(self.process, user_input)
+    
+    def _save_execution(self, action_plan: ActionPlan, result: Dict[str, Any], directory: str) -> None:
+        """Write an execution result to the rollback and command histories (runs on the I/O worker)."""
+        try:
+            self.rollback_manager.save_execution_history(result)
+            self.history_manager.add_action_plan(action_plan, result, directory)
+        except Exception as e:
+            logger.warning("Could not save execution history: %s", e)
+    
     def cleanup(self) -> None:
         """Perform cleanup operations when shutting down."""
+        self._pool.shutdown(wait=True)
+        # Let queued history writes finish before the history manager flushes
+        self._io_pool.shutdown(wait=True)
+        if hasattr(self.agent, "close"):
+            self.agent.close()
+        self._prompt_cache.save()
+        if self._trace_file is not None:
+            self._trace_file.close()
         self.history_manager.cleanup()
     
     def _parse_input(self, user_input: str) -> str:
@@ -258,91 +1036,267 @@ class TermoraPipeline:
         Returns:
             Tuple of (Intent object, reasoning string)
         """
-        # Use the agent with an intent extraction prompt
-        intent_extraction_prompt = self._create_intent_extraction_prompt(user_input, context_data)
-
-        # Get intent from AI
-        response = self.agent.get_raw_completion(intent_extraction_prompt)
+        cache_key = self._intent_cache_key(user_input, context_data)
+        intent_data = self._get_cached_intent(cache_key)
         
-        # Parse the response
-        intent_data = self._parse_intent_response(response)
+        if intent_data is None:
+            # Use the agent with an intent extraction prompt
+            system_prompt, intent_extraction_prompt = self._create_intent_extraction_prompt(user_input, context_data)
 
-        # Create Intent object
-        intent = Intent(
-            action=intent_data.get("action", "unknown"),
-            target_dir=intent_data.get("target_dir"),
-            file_filter=intent_data.get("file_filter"),
-            time_filter=intent_data.get("time_filter"),
-            destination=intent_data.get("destination"),
-            limit=intent_data.get("limit"),
-            sort_by=intent_data.get("sort_by"),
-            recursive=intent_data.get("recursive", True)
-        )
+            # Try the draft model first and fall back to the main model if its answer is unusable
+            intent_data = self._draft_intent(intent_extraction_prompt, system_prompt)
+            if intent_data is None:
+                response = self._get_completion(intent_extraction_prompt, system_prompt=system_prompt, marker='"action"')
+                intent_data = self._parse_intent_response(response)
+            
+            # Only remember successful extractions
+            if _normalize_action(intent_data.get("action")) != "unknown":
+                self._intent_cache.put(cache_key, intent_data)
+        
+        return self._intent_from_data(intent_data)
+    
+    def _get_completion(self, prompt: str, system_prompt: Optional[str] = None, model: Optional[str] = None,
+                        marker: Optional[str] = None) -> str:
+        """
+        Get a completion whose answer is a JSON object, streaming it when the agent supports that.
+        
+        Reading stops as soon as the answer object in the stream is complete,
+        so any trailing commentary from the model is never waited for. Responses are
+        cached by exact prompt, so an identical prompt doesn't call the model again.
+        
+        Args:
+            prompt: The prompt to send to the AI
+            system_prompt: Static instructions sent as the system message (optional)
+            model: Model to use instead of the configured one (optional)
+            marker: Text the answer object must contain, such as '"plan"'. Objects
+                without it, like examples the model writes first, don't end the stream (optional)
+            
+        Returns:
+            The JSON object text if one was found, otherwise the full response
+        """
+        cache_key = PromptCache.key(prompt, system_prompt, model)
+        response = self._prompt_cache.get(cache_key)
+        if response is not None:
+            return response
+        
+        response = self._fetch_completion(prompt, system_prompt, model, marker)
+        # Only keep answers that contain JSON; errors and fallbacks should be retried
+        if _load_json_object(response, marker) is not None:
+            self._prompt_cache.put(cache_key, response)
+        return response
+    
+    def _fetch_completion(self, prompt: str, system_prompt: Optional[str], model: Optional[str],
+                          marker: Optional[str] = None) -> str:
+        """Request a completion from the agent, streaming it when supported (see _get_completion)."""
+        if not hasattr(self.agent, "stream_raw_completion"):
+            return self.agent.get_raw_completion(prompt, system_prompt=system_prompt, model=model)
+        
+        scanner = _JsonObjectScanner()
+        stream = self.agent.stream_raw_completion(prompt, system_prompt=system_prompt, model=model)
+        try:
+            for chunk in stream:
+                json_str = scanner.feed(chunk)
+                while json_str is not None:
+                    if (marker is None or marker in json_str) and _load_json_object(json_str) is not None:
+                        return json_str
+                    # Not the answer (e.g. a placeholder or example in prose); keep reading for it
+                    scanner.skip()
+                    json_str = scanner.feed("")
+        finally:
+            # Stop generation and release the connection if we returned early
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+        return scanner.text
+    
+    def _intent_from_data(self, intent_data: Dict[str, Any]) -> Tuple[Intent, str]:
+        """
+        Build an Intent from parsed model output.
+        
+        Args:
+            intent_data: Intent fields and reasoning parsed from the AI response
+            
+        Returns:
+            Tuple of (Intent object, reasoning string)
+        """
+        # Keep only the keys Intent knows about; the model may add others
+        fields = {key: intent_data[key] for key in _INTENT_KEYS & intent_data.keys()}
+        fields["action"] = _normalize_action(fields.get("action"))
+        intent = Intent(**fields)
         
         reasoning = intent_data.get("reasoning", "")
     
         return intent, reasoning
     
-    def _create_intent_extraction_prompt(self, user_input: str, context_data: Dict[str, Any]) -> str:
-        """Create prompt for intent extraction."""
-        context_str = self.context_provider.to_string()
+    def _intent_cache_key(self, user_input: str, context_data: Dict[str, Any]) -> str:
+        """Cache key for the intent of a request. Requests match case- and whitespace-insensitively within a directory."""
+        return make_cache_key(" ".join(user_input.lower().split()), context_data.get("cwd"))
+    
+    def _plan_cache_key(self, intent: Intent, user_input: str, context_data: Dict[str, Any]) -> Tuple:
+        """Cache key for a plan, which depends on the intent, the wording of the request and where it runs."""
+        return (intent, " ".join(user_input.lower().split()), context_data.get("cwd"), context_data.get("os"))
+    
+    def _get_cached_intent(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previously extracted intent, dropping it if it no longer applies.
         
-        prompt = f"""You are Termora, an intelligent terminal assistant.
+        Args:
+            cache_key: Key from _intent_cache_key
+            
+        Returns:
+            Cached intent data, or None
+        """
+        intent_data = self._intent_cache.get(cache_key)
+        if intent_data is not None and not self._is_cached_intent_valid(intent_data):
+            self._intent_cache.pop(cache_key)
+            return None
+        return intent_data
+    
+    def _draft_intent(self, prompt: str, system_prompt: str) -> Optional[Dict[str, Any]]:
+        """
+        Speculatively extract the intent with the draft model.
         
-        {context_str}
+        The draft answer is accepted when it parses and names a common action. Otherwise
+        it counts as a miss, and the draft model is switched off for the rest of the
+        session if misses become frequent enough that it only adds latency.
         
-        USER REQUEST: {user_input}
+        Args:
+            prompt: Intent extraction prompt
+            system_prompt: Intent extraction instructions
+            
+        Returns:
+            Intent data from the draft model, or None if the main model has to be asked
+        """
+        if not self.draft_model:
+            return None
         
-        TASK:
-        Extract the intent and parameters from this user request.
+        self._draft_attempts += 1
+        response = self._get_completion(prompt, system_prompt=system_prompt, model=self.draft_model, marker='"action"')
+        intent_data = self._parse_intent_response(response)
         
-        INSTRUCTIONS:
-        1. Identify the primary action (move, find, list, count, delete, etc.)
-        2. Extract all relevant parameters (paths, filters, options)
-        3. Map vague references to specific technical details
-        4. Provide step-by-step reasoning
+        if _normalize_action(intent_data.get("action")) in _DRAFT_ACTIONS:
+            return intent_data
         
-        Return your analysis as JSON with this structure:
-        {{
-            "action": "primary_action",
-            "target_dir": "directory to operate on",
-            "file_filter": {{ filters for selecting files }},
-            "time_filter": {{ date/time constraints }},
-            "destination": "destination path if relevant",
-            "limit": number_of_results,
-            "sort_by": "sorting_criterion",
-            "recursive": true_or_false,
-            "reasoning": "Your step-by-step reasoning process"
-        }}
+        self._draft_misses += 1
+        if (self._draft_attempts >= _DRAFT_MIN_ATTEMPTS
+                and self._draft_misses / self._draft_attempts > _DRAFT_MAX_MISS_RATE):
+            logger.info("Pipeline: Disabling draft model %s after %d misses", self.draft_model, self._draft_misses)
+            self.draft_model = None
+        return None
+    
+    def _is_cached_intent_valid(self, intent_data: Dict[str, Any]) -> bool:
+        """
+        Check whether a cached intent still applies to the file system.
         
-        For example, with "Move all screenshots from March into an archive folder":
-        {{
-            "action": "move",
-            "file_filter": {{ "name_pattern": "*screenshot*" }},
-            "time_filter": {{ "from": "2024-03-01", "to": "2024-04-01" }},
-            "destination": "~/archive",
-            "reasoning": "The user wants to move files..."
-        }}
+        Earlier actions may have moved or deleted the directory an intent refers to,
+        in which case the intent has to be extracted again.
         
-        IMPORTANT: Your response must be valid JSON and include thorough reasoning.
+        Args:
+            intent_data: Cached intent data
+            
+        Returns:
+            True if the cached intent can be reused
         """
+        target_dir = intent_data.get("target_dir")
+        if not target_dir or not isinstance(target_dir, str):
+            return True
+        return os.path.isdir(os.path.expanduser(target_dir))
+    
+    def _similar_plan(self, user_input: str, cwd: str) -> Optional[TermoraPlan]:
+        """
+        Reuse the plan of a previous, equivalently worded request made in the same directory.
         
-        return prompt
+        Args:
+            user_input: Parsed user request
+            cwd: Current working directory
+            
+        Returns:
+            TermoraPlan for the request, or None if no earlier request matches
+        """
+        plan_data = self._similar_plans.get(user_input, scope=cwd)
+        if plan_data is None:
+            return None
+        intent, _ = self._intent_from_data(plan_data.get("intent") or {})
+        return self._plan_from_data(intent, plan_data.get("reasoning", ""), user_input, plan_data)
+    
+    def _distinct_history(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep the most recent entry for each distinct command, code snippet or plan.
+        
+        Args:
+            entries: History entries, most recent first
+            
+        Returns:
+            Up to _HISTORY_LIMIT distinct entries, most recent first
+        """
+        seen = set()
+        distinct = []
+        for entry in entries:
+            # Action plans have neither a command nor code, so entries are compared by
+            # the text they contribute to the prompt
+            key = history_entry_text(entry)
+            if key in seen:
+                continue
+            seen.add(key)
+            distinct.append(entry)
+            if len(distinct) >= _HISTORY_LIMIT:
+                break
+        return distinct
+    
+    def _format_context(self, context_data: Dict[str, Any]) -> str:
+        """
+        Format the gathered context for prompts, reusing the last result when nothing changed.
+        
+        Args:
+            context_data: Context gathered for the current request
+            
+        Returns:
+            The prompt text for the context
+        """
+        cwd = context_data.get("cwd", "")
+        try:
+            mtime_ns = os.stat(cwd).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        sig = (
+            cwd,
+            mtime_ns,
+            tuple(context_data.get("history", ())),
+            tuple(map(history_entry_text, context_data.get("command_history", ()))),
+            orjson.dumps(context_data.get("git_status"), option=orjson.OPT_SORT_KEYS, default=str)
+        )
+        if sig != self._ctx_sig or self._ctx_str is None:
+            self._ctx_str = self.context_provider.to_string(context_data)
+            self._ctx_sig = sig
+        return self._ctx_str
+    
+    def _context_string(self, context_data: Dict[str, Any]) -> str:
+        """Get the prompt text for the gathered context, formatting it only if process() hasn't already."""
+        context_str = context_data.get("prompt_context")
+        if context_str is None:
+            context_str = self.context_provider.to_string(context_data)
+        return context_str
+    
+    def _create_intent_extraction_prompt(self, user_input: str, context_data: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Create prompt for intent extraction.
+        
+        Returns:
+            Tuple of (static system prompt, request-specific user prompt)
+        """
+        prompt = _request_prompt(self._context_string(context_data), user_input)
+        return _INTENT_SYSTEM_PROMPT, prompt
     
     def _parse_intent_response(self, response: str) -> Dict[str, Any]:
         """Parse the AI response to extract Intent data."""
-        import json
-        import re
-        
         # Try to extract JSON from response
         try:
-            # Look for JSON object in the response
-            match = re.search(r'({.*})', response, re.DOTALL)
-            if match:
-                json_str = match.group(1)
-                return json.loads(json_str)
-            else:
-                return {"action": "unknown", "reasoning": "Failed to parse intent from response"}
+            data = _load_json_object(response, '"action"')
+            if data is not None:
+                intent_data = _validate_model_output(_IntentSchema, data, ("action",))
+                if intent_data is not None:
+                    return intent_data
+            return {"action": "unknown", "reasoning": "Failed to parse intent from response"}
         except Exception:
             return {"action": "unknown", "reasoning": "Failed to parse intent from response"}
 
@@ -359,145 +1313,131 @@ class TermoraPipeline:
         Returns:
             TermoraPlan object
         """
-        # Create plan generation prompt
-        plan_prompt = self._create_plan_generation_prompt(intent, reasoning, user_input, context_data)
-        
-        # Get plan from AI
-        response = self.agent.get_raw_completion(plan_prompt)
+        cache_key = self._plan_cache_key(intent, user_input, context_data)
+        plan_data = self._plan_cache.get(cache_key)
         
-        # Parse the response
-        plan_data = self._parse_plan_response(response)
+        if plan_data is None:
+            # Create plan generation prompt
+            system_prompt, plan_prompt = self._create_plan_generation_prompt(intent, reasoning, user_input, context_data)
+            
+            # Get plan from AI
+            response = self._get_completion(plan_prompt, system_prompt=system_prompt, marker='"plan"')
+            
+            # Parse the response
+            plan_data = self._parse_plan_response(response)
+            
+            # Don't remember failed or empty plans
+            if plan_data.get("plan"):
+                self._plan_cache.put(cache_key, plan_data)
         
-        # Create plan object
-        return TermoraPlan(
-            user_input=user_input,
-            intent=intent,
-            reasoning=reasoning,
-            plan=plan_data.get("plan", []),
-            preview=plan_data.get("preview", {}),
-            requires_backup=plan_data.get("requires_backup", False),
-            backup_paths=plan_data.get("backup_paths", [])
-        )
-
-    def _create_plan_generation_prompt(self, intent: Intent, reasoning: str, user_input: str, context_data: Dict[str, Any]) -> str:
-        """Create prompt for plan generation."""
-        context_str = self.context_provider.to_string()
-        intent_json = json.dumps(intent.to_dict(), indent=2)
-        
-        # Get OS info from context
-        os_name = context_data.get("os", "Unknown")
-        os_version = context_data.get("environment", {}).get("OS_VERSION", "Unknown")
-        
-        os_specific_guidance = ""
-        if os_name == "Darwin":  # macOS
-            os_specific_guidance = """
-            IMPORTANT: You're generating commands for macOS which uses BSD versions of utilities:
-            1. macOS 'find' doesn't support -printf, use -exec or pipe to another command instead
-            2. Some GNU-style parameters may not work; use BSD variants
-            3. For complex file operations, consider using 'stat', 'ls -la', or other macOS compatible commands
-            """
-        elif os_name == "Linux":
-            os_specific_guidance = """
-            You're generating commands for Linux which typically uses GNU utilities.
-            """
-        elif os_name == "Windows":
-            os_specific_guidance = """
-            IMPORTANT: You're generating commands for Windows. Use PowerShell commands when possible as they are more consistent.
-            """
-        
-        prompt = f"""You are Termora, an intelligent terminal assistant.
-        
-        {context_str}
-        
-        USER REQUEST: {user_input}
-        
-        EXTRACTED INTENT:
-        {intent_json}
-        
-        REASONING:
-        {reasoning}
-        
-        OPERATING SYSTEM INFORMATION:
-        OS: {os_name}
-        Version: {os_version}
-        {os_specific_guidance}
-        
-        TASK:
-        Generate a specific, safe execution plan based on this intent.
-        
-        INSTRUCTIONS:
-        1. Design a sequence of shell commands to fulfill the intent
-        2. Ensure commands are compatible with the user's OS ({os_name})
-        3. VALIDATE: Double check syntax - NO unmatched quotes, parentheses, or syntax errors
-        4. Ensure commands are safe and include error checking
-        5. Add proper path resolution for all referenced directories
-        6. For potentially dangerous operations, implement a safe alternative
-        7. For file deletion, use trash system instead of permanent deletion
-        8. Use conditional execution (command && next_command) for commands that depend on each other
-        9. If a command fails, provide a fallback command using '||'
-        
-        Return your plan as JSON with this structure:
-        {{
-            "plan": [
-                {{
-                    "type": "shell_command",
-                    "content": "command to execute",
-                    "explanation": "what this command does",
-                    "fallback": "alternative command if this fails"
-                }},
-                // more actions...
-            ],
-            "preview": {{
-                "natural_language": "Human-readable explanation of plan",
-                "safety_notes": "Notes about safety precautions taken"
-            }},
-            "requires_backup": boolean,
-            "backup_paths": ["path1", "path2", ...]
-        }}
-        
-        IMPORTANT: Your response must be valid JSON with safe, properly escaped shell commands.
-        """
-        
-        return prompt
+        return self._plan_from_data(intent, reasoning, user_input, plan_data)
     
-    def _parse_plan_response(self, response: str) -> Dict[str, Any]:
-        """Parse the AI response to extract plan data."""
-        import json
-        import re
-        
-        # Try to extract JSON from response
-        try:
-            # Look for JSON object in the response
-            match = re.search(r'({.*})', response, re.DOTALL)
-            if match:
-                json_str = match.group(1)
-                return json.loads(json_str)
-            else:
-                return {"plan": [], "preview": {"natural_language": "Failed to generate plan"}}
-        except Exception:
-            return {"plan": [], "preview": {"natural_language": "Failed to generate plan"}}
+    def _plan_from_data(self, intent: Intent, reasoning: str, user_input: str, plan_data: Dict[str, Any]) -> TermoraPlan:
+        """
+        Build a TermoraPlan from parsed model output.
         
-    def _convert_to_action_plan(self, plan: TermoraPlan) -> ActionPlan:
+        Args:
+            intent: Extracted intent object
+            reasoning: Reasoning behind the intent extraction
+            user_input: Original user input
+            plan_data: Plan fields parsed from the AI response
+            
+        Returns:
+            TermoraPlan object
         """
-        Convert TermoraPlan to ActionPlan for execution.
+        fields = {key: plan_data[key] for key in _PLAN_DATA_KEYS & plan_data.keys()}
+        fields["plan"] = [Action.from_dict(action) for action in fields.get("plan", ())]
+        fields.setdefault("preview", {})
+        return TermoraPlan(user_input=user_input, intent=intent, reasoning=reasoning, **fields)
+    
+    def _extract_intent_and_plan(self, user_input: str, context_data: Dict[str, Any]) -> TermoraPlan:
+        """
+        Extract the intent and generate the plan with a single AI call.
         
         Args:
-            plan: TermoraPlan object
+            user_input: User's request
+            context_data: Current context
             
         Returns:
-            ActionPlan object
+            TermoraPlan object
         """
-        # Create explanation from preview
-        explanation = plan.preview.get("natural_language", "")
-        if "safety_notes" in plan.preview:
-            explanation += f"\n\n{plan.preview['safety_notes']}"
+        intent_key = self._intent_cache_key(user_input, context_data)
+        if self._get_cached_intent(intent_key) is not None:
+            # Intent is already known, so its plan is likely cached as well
+            intent, reasoning = self._extract_intent(user_input, context_data)
+            return self._generate_plan(intent, reasoning, user_input, context_data)
         
-        # Convert to ActionPlan format
-        return ActionPlan(
-            explanation=explanation,
-            actions=plan.plan,
-            requires_confirmation=True,  # Always confirm
-            requires_backup=plan.requires_backup,
-            backup_paths=plan.backup_paths,
-            reasoning=plan.reasoning
-        )
\ No newline at end of file
+        system_prompt, prompt = self._create_combined_prompt(user_input, context_data)
+        response = self._get_completion(prompt, system_prompt=system_prompt, marker='"plan"')
+        data = self._parse_plan_response(response)
+        
+        intent_data = data.get("intent")
+        if not isinstance(intent_data, dict):
+            intent_data = {"action": "unknown", "reasoning": "Failed to parse intent from response"}
+        intent, reasoning = self._intent_from_data(intent_data)
+        
+        # Remember both halves so either path can reuse them
+        if intent.action != "unknown":
+            self._intent_cache.put(intent_key, intent_data)
+            if not data.get("plan"):
+                # The intent came through but the plan didn't; ask for the plan on its own
+                return self._generate_plan(intent, reasoning, user_input, context_data)
+            plan_data = {key: data[key] for key in _PLAN_DATA_KEYS & data.keys()}
+            self._plan_cache.put(self._plan_cache_key(intent, user_input, context_data), plan_data)
+        
+        return self._plan_from_data(intent, reasoning, user_input, data)
+    
+    def _create_combined_prompt(self, user_input: str, context_data: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Create prompt for extracting the intent and generating the plan in one call.
+        
+        Returns:
+            Tuple of (static system prompt, request-specific user prompt)
+        """
+        prompt = _request_prompt(self._context_string(context_data), user_input)
+        return self._combined_system_prompt, prompt
+    
+    @cached_property
+    def _plan_system_prompt(self) -> str:
+        """Plan generation instructions specialized for this machine's operating system."""
+        return f"{_PLAN_SYSTEM_PROMPT}\n{self._os_information}"
+    
+    @cached_property
+    def _combined_system_prompt(self) -> str:
+        """Combined intent and plan instructions specialized for this machine's operating system."""
+        return f"{_COMBINED_SYSTEM_PROMPT}\n{self._os_information}"
+    
+    @cached_property
+    def _os_information(self) -> str:
+        """
+        Describe the user's operating system for plan generation prompts.
+        
+        The OS doesn't change while Termora runs, so this is part of the static system
+        prompt rather than of every request.
+        """
+        os_name = getattr(self.context_provider, "os_name", None) or platform.system()
+        os_version = getattr(self.context_provider, "os_version", None) or "Unknown"
+        return _format_os_information(os_name, os_version)
+    
+    def _create_plan_generation_prompt(self, intent: Intent, reasoning: str, user_input: str, context_data: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Create prompt for plan generation.
+        
+        Returns:
+            Tuple of (static system prompt, request-specific user prompt)
+        """
+        prompt = _plan_request_prompt(self._context_string(context_data), user_input, intent.as_prompt_json(), reasoning)
+        return self._plan_system_prompt, prompt
+    
+    def _parse_plan_response(self, response: str) -> Dict[str, Any]:
+        """Parse the AI response to extract plan data."""
+        # Try to extract JSON from response
+        try:
+            data = _load_json_object(response, '"plan"')
+            if data is not None:
+                plan_data = _validate_model_output(_PlanSchema, data, ("plan",))
+                if plan_data is not None:
+                    return plan_data
+            return {"plan": [], "preview": {"natural_language": "Failed to generate plan"}}
+        except Exception:
+            return {"plan": [], "preview": {"natural_language": "Failed to generate plan"}}
@@ -9,26 +9,35 @@ Key functionality:
 - record_execution: Stores information about executed commands
 - rollback_last: Restores files from the most recent backup
 - rollback_specific: Restores files from a specific backup ID
+- rollback_many: Restores several backups, decompressing them in parallel
 - list_backups: Lists all available backups
 - display_backups: Shows available backups in a formatted table
 - _restore_from_backup: Extracts and restores files from a backup archive
 """
 
 import os
-import json
-import tarfile
-import tempfile
-import shutil
+import re
+import time
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
+import orjson
 from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress
 
+from termora.core.archive import BACKUP_SUFFIXES, extract_archive, gnu_tar, restore_with_tar
 from termora.utils.helpers import get_termora_dir, get_timestamp
 
+# Shared by every RollbackManager; creating a Console isn't free
+_CONSOLE = Console()
+
+# Timestamp in backup file names (YYYYMMDD_HHMMSS)
+_BACKUP_TIMESTAMP_RE = re.compile(r"\d{8}_\d{6}")
+
+# Coarsest directory timestamp resolution expected (some filesystems store whole seconds)
+_MTIME_GRANULARITY_NS = 2_000_000_000
+
+
 class RollbackManager:
     """
     Manages backup and rollback operations.
@@ -39,7 +48,7 @@ class RollbackManager:
     
     def __init__(self):
         """Initialize the rollback manager."""
-        self.console = Console()
+        self.console = _CONSOLE
         self.termora_dir = get_termora_dir()
         self.backup_dir = self.termora_dir / "backups"
         self.history_file = self.termora_dir / "execution_history.json"
@@ -47,48 +56,80 @@ class RollbackManager:
         # Ensure directories exist
         if not self.backup_dir.exists():
             self.backup_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Last backup listing and the backup directory's modification time when it was made
+        self._backup_cache: Optional[List[Dict[str, Any]]] = None
+        self._backup_cache_mtime: Optional[int] = None
     
     def list_backups(self) -> List[Dict[str, Any]]:
         """
         List available backups.
         
+        The listing is cached until the backup directory changes (a backup is added or
+        removed), so repeated calls don't scan it again.
+        
         Returns:
             A list of backup information dictionaries
         """
-        backups = []
+        try:
+            dir_mtime = self.backup_dir.stat().st_mtime_ns
+        except OSError:
+            dir_mtime = None
         
-        for backup_file in self.backup_dir.glob("backup_*.tar.gz"):
-            try:
-                # Extract timestamp
-                filename = backup_file.name
-                if filename.startswith("backup_") and filename.endswith(".tar.gz"):
-                    timestamp_str = filename[7:-7]      # Slicing timestamp from filename 
+        if self._backup_cache is None or dir_mtime is None or dir_mtime != self._backup_cache_mtime:
+            backups = self._scan_backups()
+            # A change within the filesystem's timestamp granularity of the scan might not
+            # move the mtime, so a listing made right after a change isn't trusted
+            recent = dir_mtime is not None and time.time_ns() - dir_mtime < _MTIME_GRANULARITY_NS
+            self._backup_cache = None if recent else backups
+            self._backup_cache_mtime = dir_mtime
+        else:
+            backups = self._backup_cache
+        
+        # Copies, so callers can't change the cached listing
+        return [dict(backup) for backup in backups]
+    
+    def _scan_backups(self) -> List[Dict[str, Any]]:
+        """Read the backup directory and describe each backup, newest first."""
+        backups = []  # (raw timestamp, backup information)
+        
+        # scandir reports the entry type from the directory listing itself, so each backup
+        # costs a single stat call (for its size)
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                filename = entry.name
+                suffix = next((s for s in BACKUP_SUFFIXES if filename.endswith(s)), None)
+                if not filename.startswith("backup_") or suffix is None:
+                    continue
+                
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
                     
-                    # Try to parse the timestamp
-                    try:
-                        timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                        formatted_time = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                    except ValueError:
-                        formatted_time = "Unknown"
+                    # Extract timestamp
+                    timestamp_str = filename[7:-len(suffix)]      # Slicing timestamp from filename 
                     
-                    # Get file size 
-                    size_bytes = os.path.getsize(backup_file)
-                    size_mb = size_bytes / (1024 * 1024)
+                    # Fall back to when the file was written if the name has no timestamp
+                    if not _BACKUP_TIMESTAMP_RE.fullmatch(timestamp_str):
+                        timestamp_str = datetime.fromtimestamp(stat.st_mtime).strftime("%Y%m%d_%H%M%S")
                     
-                    backups.append({
+                    size_mb = stat.st_size / (1024 * 1024)
+                    
+                    backups.append((timestamp_str, {
                         "id": filename,
-                        "path": str(backup_file),
-                        "timestamp": formatted_time,
+                        "path": entry.path,
+                        "timestamp": _format_backup_timestamp(timestamp_str),
                         "size_mb": round(size_mb, 2)
-                    })
-            
-            except Exception as e:
-                # Skip problematic backups
-                self.console.print(f"[yellow]Error processing backup {backup_file}: {str(e)}[/yellow]")
+                    }))
+                
+                except Exception as e:
+                    # Skip problematic backups
+                    self.console.print(f"[yellow]Error processing backup {entry.path}: {str(e)}[/yellow]")
         
-        # Sort by timestamp (newest first)
-        backups.sort(key=lambda x: x["timestamp"], reverse=True)
-        return backups
+        # Sort by timestamp (newest first); YYYYMMDD_HHMMSS strings sort chronologically
+        backups.sort(key=lambda item: item[0], reverse=True)
+        return [backup for _, backup in backups]
     
     def display_backups(self):
         """Display available backups in a formatted table."""
@@ -98,6 +139,8 @@ class RollbackManager:
             self.console.print("[yellow]No backups found.[/yellow]")
             return
         
+        from rich.table import Table
+        
         # Create a table
         table = Table(title="Available Backups")
         table.add_column("ID", style="cyan")
@@ -126,9 +169,8 @@ class RollbackManager:
         # Load existing history
         if self.history_file.exists():
             try:
-                with open(self.history_file, "r") as f:
-                    history = json.load(f)
-            except json.JSONDecodeError:
+                history = orjson.loads(self.history_file.read_bytes())
+            except orjson.JSONDecodeError:
                 # If file is corrupted, start with empty history
                 history = []
         
@@ -144,8 +186,7 @@ class RollbackManager:
         history = history[-20:]
         
         # Save updated history
-        with open(self.history_file, "w") as f:
-            json.dump(history, f, indent=2)
+        self.history_file.write_bytes(orjson.dumps(history, option=orjson.OPT_INDENT_2))
     
     def get_last_execution(self) -> Optional[Dict[str, Any]]:
         """
@@ -158,15 +199,14 @@ class RollbackManager:
             return None
         
         try:
-            with open(self.history_file, "r") as f:
-                history = json.load(f)
-                
+            history = orjson.loads(self.history_file.read_bytes())
+            
             if not history:
                 return None
                 
             return history[-1]  # Return the latest entry
             
-        except (json.JSONDecodeError, FileNotFoundError):
+        except (orjson.JSONDecodeError, FileNotFoundError):
             return None
         except IndexError:
             # Handle the case when history exists but is empty
@@ -230,6 +270,35 @@ class RollbackManager:
             
         return result
     
+    def rollback_many(self, backup_ids: List[str]) -> bool:
+        """
+        Restore several backups in one go.
+        
+        The archives are restored in the order given, so where backups overlap the last
+        one wins.
+        
+        Args:
+            backup_ids: IDs of the backups to restore
+            
+        Returns:
+            True if every backup was restored, False otherwise
+        """
+        backup_paths = [self.backup_dir / backup_id for backup_id in backup_ids]
+        missing = [path.name for path in backup_paths if not path.exists()]
+        if missing:
+            self.console.print(f"[red]Backup file not found: {', '.join(missing)}[/red]")
+            return False
+        
+        self.console.print(f"[blue]Rolling back using {len(backup_paths)} backups[/blue]")
+        result = self._restore_from_backups([str(path) for path in backup_paths])
+        
+        if result:
+            self.console.print("[green]Rollback completed successfully.[/green]")
+        else:
+            self.console.print("[red]Rollback failed.[/red]")
+            
+        return result
+    
     def _restore_from_backup(self, backup_path: str) -> bool:
         """
         Restore files from a backup archive.
@@ -240,43 +309,137 @@ class RollbackManager:
         Returns:
             True if restoration was successful, False otherwise
         """
+        return self._restore_from_backups([backup_path])
+    
+    def _restore_from_backups(self, backup_paths: List[str]) -> bool:
+        """
+        Restore files from backup archives, in order.
+        
+        Args:
+            backup_paths: Paths to the backup archives
+            
+        Returns:
+            True if restoration was successful, False otherwise
+        """
+        # GNU tar restores the files in place, without the temporary copy
+        if gnu_tar() is not None:
+            try:
+                with self.console.status("[blue]Restoring files...[/blue]"):
+                    for backup_path in backup_paths:
+                        restore_with_tar(backup_path)
+                self.console.print("[green]Restoration complete.[/green]")
+                return True
+            except RuntimeError as e:
+                self.console.print(f"[yellow]{str(e)}; retrying without tar[/yellow]")
+        
+        # Only needed when restoring, so they aren't loaded for every run
+        import tempfile
+        from concurrent.futures import ProcessPoolExecutor
+        from rich.progress import Progress
+        
         try:
-            # Create a temporary directory to extract the backup
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
+            # Create a temporary directory to extract the backups into. It is kept in the
+            # Termora directory, under the home directory, which is usually on the same
+            # filesystem as the restored files, so they can be renamed into place.
+            with tempfile.TemporaryDirectory(dir=self.termora_dir) as temp_dir:
+                if len(backup_paths) == 1:
+                    temp_paths = [Path(temp_dir)]
+                else:
+                    temp_paths = [Path(tempfile.mkdtemp(dir=temp_dir)) for _ in backup_paths]
                 
-                # Extract the backup
+                # Extract the backups; decompression is CPU-bound, so several archives are
+                # extracted in separate processes. Each extraction lists the files it wrote
+                # from the archive index, so the extracted trees are never walked.
                 self.console.print("[blue]Extracting backup...[/blue]")
-                with tarfile.open(backup_path, "r:gz") as tar:
-                    tar.extractall(path=temp_path)
+                if len(backup_paths) == 1:
+                    names = [_extract_archive(backup_paths[0], str(temp_paths[0]))]
+                else:
+                    workers = min(len(backup_paths), os.cpu_count() or 1)
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        names = list(pool.map(_extract_archive, backup_paths, map(str, temp_paths)))
                 
-                # Restore files from the extracted backup
+                # Restore files from the extracted backups
                 self.console.print("[blue]Restoring files...[/blue]")
-                
-                # Count total files for progress bar
-                file_count = sum(1 for _ in temp_path.glob("**/*") if _.is_file())
+                files = [[temp_path / name for name in archive_names]
+                         for temp_path, archive_names in zip(temp_paths, names)]
                 
                 with Progress() as progress:
-                    restore_task = progress.add_task("[green]Restoring...", total=file_count)
-                    
-                    for source_path in temp_path.glob("**/*"):
-                        if source_path.is_file():
-                            # Compute the target path (relative to root)
-                            rel_path = source_path.relative_to(temp_path)
-                            # Restore to the original location, not to root
-                            target_path = Path("/") / rel_path
-                            
-                            # Create parent directories if needed
-                            target_path.parent.mkdir(parents=True, exist_ok=True)
-                            
-                            # Copy the file
-                            shutil.copy2(source_path, target_path)
-                            
-                            # Update progress
-                            progress.update(restore_task, advance=1)
+                    restore_task = progress.add_task("[green]Restoring...", total=sum(map(len, files)))
+                    for temp_path, source_paths in zip(temp_paths, files):
+                        self._copy_back(temp_path, source_paths, lambda: progress.update(restore_task, advance=1))
                 self.console.print("[green]Restoration complete.[/green]")
                 return True
                 
         except Exception as e:
             self.console.print(f"[red]Error during rollback: {str(e)}[/red]")
-            return False
\ No newline at end of file
+            return False
+    
+    def _copy_back(self, temp_path: Path, source_paths: List[Path], advance) -> None:
+        """
+        Move extracted files back to their original locations.
+        
+        The extracted files are temporary, so they are renamed into place rather than
+        copied; only files on another filesystem are copied.
+        
+        Args:
+            temp_path: Directory the backup was extracted into
+            source_paths: Extracted files
+            advance: Called after each file is restored
+        """
+        import errno
+        import shutil
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # Restore to the original locations (paths relative to root), not to root
+        targets = [Path("/") / source_path.relative_to(temp_path) for source_path in source_paths]
+        
+        # Create parent directories first, once each, so the workers don't race on them
+        parents = set()
+        for target_path in targets:
+            if target_path.parent not in parents:
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                parents.add(target_path.parent)
+        
+        lock = threading.Lock()
+        
+        def restore(source_path: Path, target_path: Path) -> None:
+            # Move the file; extraction already restored its permissions and timestamps
+            try:
+                os.replace(source_path, target_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.copy2(source_path, target_path)
+            # The progress bar isn't thread-safe
+            with lock:
+                advance()
+        
+        # Each target appears once per backup, so the files can be restored concurrently;
+        # threads overlap the per-file open and stat latency, especially for copies
+        workers = min(32, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="termora-restore") as pool:
+            list(pool.map(restore, source_paths, targets))
+
+
+def _format_backup_timestamp(timestamp_str: str) -> str:
+    """Turn a YYYYMMDD_HHMMSS timestamp into YYYY-MM-DD HH:MM:SS without parsing it as a date."""
+    t = timestamp_str
+    return f"{t[0:4]}-{t[4:6]}-{t[6:8]} {t[9:11]}:{t[11:13]}:{t[13:15]}"
+
+
+def _extract_archive(backup_path: str, dest: str) -> List[str]:
+    """
+    Extract a backup archive into a directory.
+    
+    This is a module-level function so it can run in a worker process.
+    
+    Args:
+        backup_path: Path to the backup archive
+        dest: Directory to extract into
+        
+    Returns:
+        Paths of the extracted files, relative to dest
+    """
+    os.makedirs(dest, exist_ok=True)
+    return extract_archive(backup_path, dest)
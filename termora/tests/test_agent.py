@@ -262,3 +262,19 @@ async def test_execute_python_code(mock_run, agent):
     assert result["output"] == "Hello, World!"
     assert result["error"] == ""
 
+
+
+def test_build_messages_marks_anthropic_system_prompt_for_caching():
+    """Test that only Anthropic gets an explicit cache marker on the system prompt."""
+    anthropic_agent = TermoraAgent({"ai_provider": "anthropic", "send_to_api": False})
+    messages = anthropic_agent._build_messages("list files", "You are Termora")
+    
+    assert messages[0]["content"] == [
+        {"type": "text", "text": "You are Termora", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert messages[1] == {"role": "user", "content": "list files"}
+    
+    groq_agent = TermoraAgent({"ai_provider": "groq", "send_to_api": False})
+    assert groq_agent._build_messages("list files", "You are Termora")[0] == {
+        "role": "system", "content": "You are Termora"
+    }
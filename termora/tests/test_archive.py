@@ -0,0 +1,68 @@
+"""
+Tests for the archive module.
+
+This module contains tests for writing and extracting backups in termora.core.archive.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from termora.core.archive import extract_archive, gnu_tar, restore_with_tar, write_archive
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    """Create a directory with a nested file to archive."""
+    source = tmp_path / "source"
+    (source / "home" / "user").mkdir(parents=True)
+    (source / "home" / "user" / "notes.txt").write_text("keep me")
+    return source
+
+
+def test_gzip_round_trip(source_dir, tmp_path):
+    """Test that a .tar.gz backup extracts to the original files."""
+    archive = tmp_path / "backup_20230101_120000.tar.gz"
+    write_archive(source_dir, archive)
+    assert archive.read_bytes()[:2] == b"\x1f\x8b"
+
+    assert extract_archive(archive, tmp_path / "out") == ["home/user/notes.txt"]
+    assert (tmp_path / "out" / "home" / "user" / "notes.txt").read_text() == "keep me"
+
+
+def test_zstd_round_trip(source_dir, tmp_path):
+    """Test that a .tar.zst backup is recognized by its magic number and extracts."""
+    pytest.importorskip("zstandard")
+    archive = tmp_path / "backup_20230101_120000.tar.zst"
+    write_archive(source_dir, archive)
+    assert archive.read_bytes()[:4] == b"\x28\xb5\x2f\xfd"
+
+    assert extract_archive(archive, tmp_path / "out") == ["home/user/notes.txt"]
+    assert (tmp_path / "out" / "home" / "user" / "notes.txt").read_text() == "keep me"
+
+
+def test_zstd_backup_without_zstandard(tmp_path):
+    """Test that restoring a Zstandard backup without the package explains what is missing."""
+    archive = tmp_path / "backup_20230101_120000.tar.zst"
+    archive.write_bytes(b"\x28\xb5\x2f\xfd" + b"\0" * 16)
+
+    with patch('termora.core.archive._zstandard', return_value=None):
+        with pytest.raises(RuntimeError, match="zstandard"):
+            extract_archive(archive, tmp_path / "out")
+
+
+@pytest.mark.skipif(gnu_tar() is None, reason="GNU tar is not installed")
+def test_restore_with_tar_keeps_existing_directories(source_dir, tmp_path):
+    """Test that tar restores files in place without changing existing directories."""
+    archive = tmp_path / "backup_20230101_120000.tar.gz"
+    write_archive(source_dir, archive)
+
+    root = tmp_path / "root"
+    (root / "home" / "user").mkdir(parents=True)
+    (root / "home" / "user" / "notes.txt").write_text("changed")
+    root.chmod(0o755)
+
+    restore_with_tar(archive, root)
+
+    assert (root / "home" / "user" / "notes.txt").read_text() == "keep me"
+    assert root.stat().st_mode & 0o777 == 0o755
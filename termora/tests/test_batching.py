@@ -0,0 +1,53 @@
+"""
+Tests for the batching module.
+
+This module contains tests for the BatchingAgent class in termora.core.batching.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from termora.core.batching import BatchingAgent
+
+
+class RecordingAgent:
+    """Agent stand-in that echoes prompts and records the batches it receives."""
+
+    def __init__(self):
+        self.config = {"ai_model": "test"}
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def get_raw_completions(self, prompts, model=None):
+        with self.lock:
+            self.batches.append((model, [prompt for prompt, _ in prompts]))
+        return [f"{model}:{prompt}" for prompt, _ in prompts]
+
+
+def test_concurrent_prompts_share_a_batch():
+    """Test that prompts arriving together are sent together and answered in order."""
+    agent = RecordingAgent()
+    batcher = BatchingAgent(agent, max_batch=4, max_wait=0.5)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda i: batcher.get_raw_completion(f"p{i}", "system"), range(4)))
+    batcher.close()
+
+    assert results == ["None:p0", "None:p1", "None:p2", "None:p3"]
+    assert len(agent.batches) == 1
+    assert sorted(agent.batches[0][1]) == ["p0", "p1", "p2", "p3"]
+    assert batcher.config is agent.config
+
+
+def test_batches_are_split_by_model():
+    """Test that prompts for different models go out in separate calls."""
+    agent = RecordingAgent()
+    batcher = BatchingAgent(agent, max_batch=2, max_wait=0.5)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        draft = pool.submit(batcher.get_raw_completion, "a", None, "draft")
+        main = pool.submit(batcher.get_raw_completion, "b")
+        assert (draft.result(), main.result()) == ("draft:a", "None:b")
+    batcher.close()
+
+    assert sorted(agent.batches, key=str) == sorted([("draft", ["a"]), (None, ["b"])], key=str)
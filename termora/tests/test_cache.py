@@ -0,0 +1,131 @@
+"""
+Tests for the cache module.
+
+This module contains tests for the LRUCache, FrozenDict, PromptCache and SimilarityCache classes and make_cache_key in termora.core.cache.
+"""
+
+import time
+from unittest.mock import patch
+
+import orjson
+import pytest
+
+from termora.core.cache import FrozenDict, LRUCache, PromptCache, SimilarityCache, make_cache_key
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the oldest unused entry is evicted once the cache is full."""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    # Touch "a" so "b" becomes the least recently used
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_returns_copies():
+    """Test that modifying a returned value doesn't change the cached one."""
+    cache = LRUCache()
+    cache.put("plan", {"plan": [{"content": "ls"}]})
+
+    value = cache.get("plan")
+    value["plan"].append({"content": "rm -rf /"})
+
+    assert cache.get("plan") == {"plan": [{"content": "ls"}]}
+    assert cache.get("missing") is None
+
+
+def test_make_cache_key_ignores_dict_order():
+    """Test that keys are stable regardless of dictionary key order."""
+    assert make_cache_key({"a": 1, "b": 2}, "/tmp") == make_cache_key({"b": 2, "a": 1}, "/tmp")
+    assert make_cache_key("ls", "/tmp") != make_cache_key("ls", "/home")
+
+
+def test_frozen_dict_is_hashable_and_immutable():
+    """Test that FrozenDict hashes by content, freezes nested values and rejects changes."""
+    a = FrozenDict({"extensions": [".jpg", ".png"], "size": {"min": 1}})
+    b = FrozenDict({"size": {"min": 1}, "extensions": [".jpg", ".png"]})
+
+    assert a == b and hash(a) == hash(b)
+    assert a["extensions"] == (".jpg", ".png")
+    assert orjson.loads(orjson.dumps(a)) == {"extensions": [".jpg", ".png"], "size": {"min": 1}}
+
+    with pytest.raises(TypeError):
+        a["size"] = 2
+    with pytest.raises(TypeError):
+        a["size"].update(max=2)
+
+
+def test_prompt_cache_keys_and_expiry():
+    """Test that responses are keyed by every prompt part and expire after the TTL."""
+    cache = PromptCache(maxsize=2, ttl=60)
+    key = PromptCache.key("list files", "system", None)
+    cache.put(key, '{"plan": []}')
+
+    assert cache.get(PromptCache.key("list files", "system")) == '{"plan": []}'
+    assert cache.get(PromptCache.key("list files", "system", "draft")) is None
+    assert cache.get(PromptCache.key("list files", "other system")) is None
+
+    with patch('termora.core.cache.time.time', return_value=time.time() + 61):
+        assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_similarity_cache_matches_rewordings_in_scope():
+    """Test that case, punctuation and filler words don't prevent a hit, but other scopes and requests miss."""
+    cache = SimilarityCache()
+    cache.put("list all the python files", {"plan": [{"content": "ls *.py"}]}, scope="/project")
+
+    assert cache.get("Please list python files!", scope="/project") == {"plan": [{"content": "ls *.py"}]}
+    assert cache.get("list python files", scope="/elsewhere") is None
+    assert cache.get("delete python files", scope="/project") is None
+    assert cache.get("the", scope="/project") is None
+
+
+@pytest.mark.parametrize("reworded", [
+    "copy report.txt to notes.txt",      # Arguments swapped
+    "copy notes.txt from report.txt",    # Direction changed
+    "notes.txt copy to report.txt",      # Word order changed
+])
+def test_similarity_cache_misses_reordered_requests(reworded):
+    """Test that requests with the same words in another order or direction don't reuse a plan."""
+    cache = SimilarityCache()
+    cache.put("copy notes.txt to report.txt", {"plan": [{"content": "cp notes.txt report.txt"}]})
+
+    assert cache.get("copy the notes.txt to report.txt") is not None
+    assert cache.get(reworded) is None
+
+
+def test_similarity_cache_misses_changed_numbers_and_paths():
+    """Test that a single changed number or path in a long request is a miss."""
+    cache = SimilarityCache()
+    request = "show the largest 10 files modified in the last 7 days under src/app sorted by size"
+    cache.put(request, {"plan": [{"content": "find src/app -mtime -7 | head -10"}]})
+
+    assert cache.get(request) is not None
+    assert cache.get(request.replace("10", "20")) is None
+    assert cache.get(request.replace("7 days", "8 days")) is None
+    assert cache.get(request.replace("src/app", "src/lib")) is None
+
+
+def test_prompt_cache_persists_to_file(tmp_path):
+    """Test that saved responses are loaded by a new cache, without expired entries."""
+    path = tmp_path / "prompt_cache.json"
+    cache = PromptCache(ttl=60, path=path)
+    cache.put(PromptCache.key("list files", "system"), '{"plan": []}')
+    cache.save()
+
+    reloaded = PromptCache(ttl=60, path=path)
+    assert reloaded.get(PromptCache.key("list files", "system")) == '{"plan": []}'
+
+    with patch('termora.core.cache.time.time', return_value=time.time() + 61):
+        assert len(PromptCache(ttl=60, path=path)) == 0
+
+    path.write_text("not json")
+    assert len(PromptCache(path=path)) == 0
@@ -0,0 +1,48 @@
+"""
+Tests for the command validator module.
+
+This module contains tests for validate_command and validate_python in termora.core.cmd_validator.
+"""
+
+import pytest
+
+from termora.core.cmd_validator import validate_command, validate_python
+
+
+@pytest.mark.parametrize("command", [
+    "ls -la",
+    r"find . -name '*.py' -exec wc -l {} \;",
+    'echo "it\'s $(date +%Y)"',
+    'echo "$(echo "nested")"',
+    "(cd src && ls) | grep -E '(a|b)'",
+    "echo it\\'s",
+    "rm -rf ./build /tmp/cache",
+    "cat <<EOF\nit's\nEOF",
+])
+def test_valid_commands(command):
+    """Test that ordinary commands, including quoting and nesting, pass."""
+    assert validate_command(command) is None
+
+
+@pytest.mark.parametrize("command, problem", [
+    ("", "empty"),
+    ("echo 'unterminated", "single quote"),
+    ('echo "unterminated', "double quote"),
+    ("echo `date", "backtick"),
+    ("echo $(date", "parenthesis"),
+    ("rm -rf /", "forbidden"),
+    ("sudo rm -rf ~ && ls", "forbidden"),
+    ('rm -rf "$HOME"', "forbidden"),
+    (":(){ :|:& };:", "forbidden"),
+    ("mkfs.ext4 /dev/sdb1", "forbidden"),
+    ("dd if=/dev/zero of=/dev/sda bs=1M", "forbidden"),
+])
+def test_invalid_commands(command, problem):
+    """Test that broken quoting and fatal operations are reported."""
+    assert problem in validate_command(command)
+
+
+def test_validate_python():
+    """Test that Python actions must compile."""
+    assert validate_python("import os\nprint(os.getcwd())") is None
+    assert "invalid Python" in validate_python("print(")
@@ -0,0 +1,131 @@
+"""
+Tests for the context module.
+
+This module contains tests for the TerminalContext class and helpers in termora.core.context.
+"""
+
+import os
+import subprocess
+import time
+from unittest.mock import patch
+
+from termora.core.context import _CONTEXT_TTL, TerminalContext, dedupe_recent, history_entry_text
+
+
+def test_dedupe_recent_keeps_latest_occurrence():
+    """Test that duplicates collapse to their most recent position, oldest first."""
+    commands = ["ls", "cd ..", "ls", "git status", "cd ..", "ls"]
+
+    assert dedupe_recent(commands, 10) == ["git status", "cd ..", "ls"]
+    assert dedupe_recent(commands, 2) == ["cd ..", "ls"]
+    assert dedupe_recent([], 5) == []
+
+
+def test_dedupe_recent_with_key():
+    """Test that a key function decides which items count as duplicates."""
+    entries = [{"command": "ls", "cwd": "/a"}, {"command": "ls", "cwd": "/b"}]
+
+    assert dedupe_recent(entries, 10, key=lambda e: e["command"]) == [{"command": "ls", "cwd": "/b"}]
+
+
+def test_get_context_is_reused_until_directory_changes(tmp_path, monkeypatch):
+    """Test that context is gathered again only after the directory changes or is invalidated."""
+    monkeypatch.chdir(tmp_path)
+    context = TerminalContext()
+
+    with patch.object(context, "get_directory_contents", wraps=context.get_directory_contents) as listing:
+        first = context.get_context()
+        first["command_history"] = ["added by caller"]
+        second = context.get_context()
+        assert listing.call_count == 1
+        assert "command_history" not in second
+
+        (tmp_path / "new_file.txt").write_text("x")
+        os.utime(tmp_path, ns=(0, time.time_ns() + 10**9))
+        assert any(f.get("name") == "new_file.txt" for f in context.get_context()["files"])
+        assert listing.call_count == 2
+
+        context.invalidate()
+        context.get_context()
+        assert listing.call_count == 3
+
+
+def test_git_status_runs_in_given_directory(tmp_path, monkeypatch):
+    """Test that git reports on the directory passed by the caller, not the process's working directory."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q", "-b", "feature"], cwd=repo, check=True)
+    (repo / "new.txt").write_text("x")
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+
+    git_status = TerminalContext().get_git_status(str(repo))
+
+    assert git_status["branch"] == "feature"
+    assert git_status["changed_files"] == 1 and git_status["status_counts"]["untracked"] == 1
+
+
+def test_git_root_lookup_expires(tmp_path):
+    """Test that a cached git root is looked up again once the context TTL has passed."""
+    (tmp_path / ".git").mkdir()
+    context = TerminalContext()
+
+    with patch("termora.core.context.time.monotonic", return_value=1000.0):
+        assert context._find_git_root(tmp_path) == tmp_path
+    (tmp_path / ".git").rmdir()
+
+    with patch("termora.core.context.time.monotonic", return_value=1001.0):
+        assert context._find_git_root(tmp_path) == tmp_path
+    with patch("termora.core.context.time.monotonic", return_value=1000.0 + _CONTEXT_TTL):
+        assert context._find_git_root(tmp_path) is None
+
+
+def test_to_string_leads_with_static_part(monkeypatch):
+    """Test that the machine details come first and are shared across requests in different directories."""
+    monkeypatch.setenv("SHELL", "/bin/zsh")
+    monkeypatch.setenv("HOME", "/home/user")
+    context = TerminalContext()
+    base = {"os": "Linux", "files": [], "history": ["ls"], "git_status": None}
+
+    first = context.to_string({**base, "cwd": "/a"})
+    second = context.to_string({**base, "cwd": "/b"})
+
+    static = context.to_static_string(base)
+    assert static == "SYSTEM CONTEXT:\nOS: Linux\nShell: zsh\nHome: /home/user"
+    assert context.to_static_string(base) is static
+    assert first.startswith(static + "\nCurrent Directory: /a")
+    assert second.startswith(static + "\nCurrent Directory: /b")
+    assert "  $ ls" in first
+
+
+def test_get_context_uses_given_directory(tmp_path):
+    """Test that a working directory passed by the caller is used instead of looking it up again."""
+    (tmp_path / "marker.txt").write_text("x")
+    context = TerminalContext()
+
+    with patch.object(context, "get_current_directory") as get_current_directory:
+        gathered = context.get_context(str(tmp_path))
+
+    get_current_directory.assert_not_called()
+    assert gathered["cwd"] == str(tmp_path)
+    assert [f["name"] for f in gathered["files"]] == ["marker.txt"]
+
+
+def test_termora_history_is_rendered():
+    """Test that plans, commands and code Termora ran are described in the context."""
+    context = TerminalContext()
+    entries = [
+        {"action_type": "action_plan", "explanation": "List files",
+         "actions": [{"type": "shell_command", "content": "ls -la"}, {"type": "shell_command", "content": "pwd"}]},
+        {"action_type": "action_plan", "explanation": "Nothing to run", "actions": []},
+        {"action_type": "shell_command", "command": "git status"},
+        {"action_type": "python_code", "code": "\nimport os\nprint(os.getcwd())"},
+    ]
+
+    assert [history_entry_text(entry) for entry in entries] == [
+        "ls -la; pwd", "Nothing to run", "$ git status", "python: import os"
+    ]
+    text = context.to_string({"os": "Linux", "cwd": "/a", "files": [], "history": [], "git_status": None,
+                              "command_history": entries[:1]})
+    assert "Recent Termora Actions:\n  ls -la; pwd" in text
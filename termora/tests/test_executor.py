@@ -13,6 +13,7 @@ from unittest.mock import patch, MagicMock
 
 # Import the class we want to test
 from termora.core.executor import CommandExecutor
+from termora.core.archive import backup_suffix
 
 # Import the ActionPlan class
 from termora.core.agent import ActionPlan
@@ -131,8 +132,51 @@ def test_create_backup(executor, temp_dir):
         # Check that backup file exists
         assert os.path.exists(backup_path)
         
-        # Check that it's a tar.gz file
-        assert backup_path.endswith('.tar.gz')
+        # Check that it's a tar.gz file, or tar.zst when zstandard is installed
+        assert backup_path.endswith(backup_suffix())
+
+
+def test_create_backup_reuses_unchanged_backup(executor, temp_dir):
+    """Test that backing up unchanged files reuses the previous archive."""
+    paths = [str(Path(temp_dir) / "test_file1.txt")]
+    
+    with patch.object(executor, 'console'):
+        first = executor.create_backup(paths)
+        assert executor.create_backup(paths) == first
+        
+        # Changed content needs a new archive
+        (Path(temp_dir) / "test_file1.txt").write_text("changed")
+        with patch('termora.core.executor.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "20990101_000000"
+            second = executor.create_backup(paths)
+    
+    assert second != first
+    assert os.path.exists(second)
+
+
+@pytest.mark.parametrize("change", [
+    lambda path: os.chmod(path, 0o600),
+    lambda path: os.utime(path, ns=(0, 10**18)),
+])
+def test_create_backup_detects_mode_and_mtime_changes(executor, temp_dir, change):
+    """Test that a file with the same content but new permissions or mtime gets a new archive."""
+    path = Path(temp_dir) / "test_file1.txt"
+    os.chmod(path, 0o644)
+    
+    with patch.object(executor, 'console'):
+        first = executor.create_backup([str(path)])
+        change(path)
+        with patch('termora.core.executor.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "20990101_000000"
+            second = executor.create_backup([str(path)])
+    
+    assert second != first
+    assert os.path.exists(second)
+
+
+def test_prewarm_tolerates_any_path(executor, temp_dir):
+    """Test that prewarming looks up existing and missing paths without raising."""
+    executor.prewarm([temp_dir, str(Path(temp_dir) / "missing"), "~/"])
 
 
 def test_infer_backup_paths(executor, temp_dir):
@@ -0,0 +1,38 @@
+"""
+Tests for the fast_intents module.
+
+This module contains tests for try_fast_match in termora.core.fast_intents.
+"""
+
+import pytest
+
+from termora.core.fast_intents import try_fast_match
+
+
+@pytest.mark.parametrize("request_text, command", [
+    ("ls", "ls -la"),
+    ("list files in ~/My Downloads", None),
+    ("list files in '~/My Downloads'", "ls -la -- ~/'My Downloads'"),
+    ("Show disk usage of Build", "du -sh -- Build"),
+    ("create a new folder called reports", "mkdir -p -- reports"),
+    ("find files named *.py", "find . -name '*.py'"),
+])
+def test_commands_quote_targets(request_text, command):
+    """Test that matched targets keep their case and are quoted for the shell."""
+    match = try_fast_match(request_text)
+    assert (match.command if match else None) == command
+
+
+def test_target_fills_intent():
+    """Test that the target becomes the target directory unless the rule uses it elsewhere."""
+    assert try_fast_match("du src").intent == {"action": "disk_usage", "target_dir": "src"}
+    assert try_fast_match("find files named *.md").intent == {
+        "action": "find", "target_dir": ".", "file_filter": {"name": "*.md"}
+    }
+    assert try_fast_match("show the largest files").intent["target_dir"] == "."
+
+
+@pytest.mark.parametrize("request_text", ["ls -la", "mkdir", "find big files", "rm -rf build", ""])
+def test_unmatched_requests(request_text):
+    """Test that options, missing targets and anything else are left to the model."""
+    assert try_fast_match(request_text) is None
@@ -17,7 +17,8 @@ from termora.utils.helpers import (
     resolve_path,
     get_timestamp,
     get_system_info,
-    is_destructive_command
+    is_destructive_command,
+    read_tail_lines
 )
 
 
@@ -70,6 +71,13 @@ def test_get_timestamp():
         assert custom_timestamp == "2023/01/01"
 
 
+def test_get_timestamp_from_unix_time():
+    """Test that get_timestamp formats a given unix time instead of the current time."""
+    unix_ts = datetime.datetime(2023, 1, 1, 12, 0, 0).timestamp()
+    assert get_timestamp(unix_ts=unix_ts) == "2023-01-01 12:00:00"
+    assert get_timestamp("%Y/%m/%d", unix_ts) == "2023/01/01"
+
+
 def test_get_system_info():
     """Test that get_system_info returns a dictionary with required keys."""
     info = get_system_info()
@@ -97,4 +105,27 @@ def test_is_destructive_command():
     
     # Test edge cases
     assert is_destructive_command("firmware update") is False  # contains 'rm' but not as a command
-    assert is_destructive_command("rm") is True  # just the command itself
\ No newline at end of file
+    assert is_destructive_command("rm") is True  # just the command itself
+
+
+def test_read_tail_lines(tmp_path):
+    """Test that the last lines are returned oldest first, and lines cut by the byte cap are dropped."""
+    path = tmp_path / "history"
+    path.write_text("".join(f"line {i}\n" for i in range(100)))
+    
+    assert read_tail_lines(path, 3) == ["line 97", "line 98", "line 99"]
+    assert read_tail_lines(path, 3, max_bytes=12) == ["line 99"]
+    
+    path.write_text("")
+    assert read_tail_lines(path, 3) == []
+    
+    # Blank lines are kept, only the final line's terminator is dropped
+    path.write_text("bb\naa\nccababcb\naca\n\n")
+    assert read_tail_lines(path, 4) == ["aa", "ccababcb", "aca", ""]
+    path.write_text("a\n\nb\n")
+    assert read_tail_lines(path, 3) == ["a", "", "b"]
+    assert read_tail_lines(path, 2) == ["", "b"]
+    path.write_text("a\nb")
+    assert read_tail_lines(path, 5) == ["a", "b"]
+    path.write_text("\n")
+    assert read_tail_lines(path, 3) == [""]
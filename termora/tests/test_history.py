@@ -0,0 +1,293 @@
+"""
+Tests for the history module.
+
+This module contains tests for the HistoryManager class in termora.core.history.
+"""
+
+import logging
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+
+from termora.core.history import HistoryManager, _categorize_command, _categorize_python_code
+
+
+@pytest.fixture
+def history_manager(tmp_path):
+    """Create a HistoryManager that stores its files in a temporary directory."""
+    with patch('termora.core.history.get_termora_dir') as mock_get_termora_dir:
+        mock_get_termora_dir.return_value = tmp_path / ".termora"
+        manager = HistoryManager()
+        yield manager
+        manager.cleanup()
+
+
+def test_search_history_substring(history_manager):
+    """Test that search matches substrings anywhere in the command, case-insensitively."""
+    history_manager.add_command("git status", "/tmp")
+    history_manager.add_command("ls -la", "/tmp")
+    history_manager.add_command("git commit -m 'Fix Parser'", "/tmp")
+
+    results = history_manager.search_history("parse")
+    assert [r["command"] for r in results] == ["git commit -m 'Fix Parser'"]
+
+    # Most recent first
+    results = history_manager.search_history("git")
+    assert [r["command"] for r in results] == ["git commit -m 'Fix Parser'", "git status"]
+
+    # Short queries and misses
+    assert len(history_manager.search_history("s")) == 3
+    assert history_manager.search_history("docker") == []
+
+
+def test_search_history_filters(history_manager):
+    """Test that search respects the action type, directory and limit filters."""
+    history_manager.add_command("python train.py", "/a")
+    history_manager.add_python_execution("import os\nprint('python')", "/b")
+    history_manager.add_command("python eval.py", "/b")
+
+    results = history_manager.search_history("python", action_type="python_code")
+    assert len(results) == 1
+    assert results[0]["action_type"] == "python_code"
+
+    results = history_manager.search_history("python", directory="/b")
+    assert len(results) == 2
+
+    results = history_manager.search_history("python", limit=1)
+    assert [r.get("command") for r in results] == ["python eval.py"]
+
+    # No filters: most recent entries first
+    results = history_manager.search_history(limit=2)
+    assert [r["action_type"] for r in results] == ["shell_command", "python_code"]
+    assert len(history_manager.search_history(limit=10)) == 3
+
+
+def test_search_history_after_reload(history_manager, tmp_path):
+    """Test that entries loaded from disk are searchable."""
+    history_manager.add_command("make build", "/tmp")
+    history_manager.cleanup()
+
+    with patch('termora.core.history.get_termora_dir') as mock_get_termora_dir:
+        mock_get_termora_dir.return_value = tmp_path / ".termora"
+        reloaded = HistoryManager()
+
+    results = reloaded.search_history("build")
+    assert [r["command"] for r in results] == ["make build"]
+
+
+def test_evicted_entries_are_forgotten(tmp_path):
+    """Test that entries evicted from the bounded history leave search results and patterns."""
+    with patch('termora.core.history.get_termora_dir') as mock_get_termora_dir, \
+         patch('termora.core.history.MAX_HISTORY_ENTRIES', 3):
+        mock_get_termora_dir.return_value = tmp_path / ".termora"
+        manager = HistoryManager()
+
+    for i in range(5):
+        manager.add_command(f"echo step{i}", "/tmp")
+    manager.cleanup()
+
+    assert len(manager.history) == 3
+    assert manager.search_history("step0") == []
+    assert [r["command"] for r in manager.search_history("echo")] == ["echo step4", "echo step3", "echo step2"]
+    assert {p["command"] for p in manager.get_command_patterns()} == {"echo step2", "echo step3", "echo step4"}
+
+
+def test_history_file_is_compacted_on_load(tmp_path):
+    """Test that an overgrown history file is rewritten with only the entries kept in memory."""
+    with patch('termora.core.history.get_termora_dir') as mock_get_termora_dir, \
+         patch('termora.core.history.MAX_HISTORY_ENTRIES', 3):
+        mock_get_termora_dir.return_value = tmp_path / ".termora"
+        manager = HistoryManager()
+        for i in range(5):
+            manager.add_command(f"echo step{i}", "/tmp")
+        manager.cleanup()
+
+        history_file = tmp_path / ".termora" / "history" / "command_history.jsonl"
+        assert len(history_file.read_text().splitlines()) == 5
+
+        reloaded = HistoryManager()
+        reloaded.cleanup()
+
+    assert [entry["command"] for entry in reloaded.history] == ["echo step2", "echo step3", "echo step4"]
+    assert len(history_file.read_text().splitlines()) == 3
+    assert not history_file.with_name("command_history.jsonl.tmp").exists()
+
+
+def test_history_write_failures_are_logged(history_manager, tmp_path, caplog):
+    """Test that the background writer reports a failed write through logging."""
+    history_manager.history_file = tmp_path / "missing" / "command_history.jsonl"
+
+    with caplog.at_level(logging.WARNING, logger="termora.core.history"):
+        history_manager.add_command("ls", "/tmp")
+        history_manager.cleanup()
+
+    assert "Could not save command history" in caplog.text
+
+
+def test_cleanup_stops_writer_thread(history_manager):
+    """Test that cleanup flushes queued entries, stops the writer and drops the exit hook."""
+    writer = history_manager._io_thread
+    history_manager.add_command("ls", "/tmp")
+
+    with patch('termora.core.history.atexit') as mock_atexit:
+        history_manager.cleanup()
+        history_manager.cleanup()
+
+    assert not writer.is_alive()
+    mock_atexit.unregister.assert_called_with(history_manager.cleanup)
+
+    # Entries recorded after cleanup are still saved, straight to the file
+    history_manager.add_command("pwd", "/tmp")
+    lines = history_manager.history_file.read_text().splitlines()
+    assert [orjson.loads(line)["command"] for line in lines] == ["ls", "pwd"]
+
+
+def test_repl_history_is_appended_and_reloaded(history_manager, tmp_path):
+    """Test that each REPL command is appended to the JSONL file and read back after a restart."""
+    history_manager.add_repl_command("list files")
+    history_manager.add_repl_command('echo "quoted"')
+
+    lines = (tmp_path / ".termora" / "repl_history.jsonl").read_text().splitlines()
+    assert lines == ['"list files"', '"echo \\"quoted\\""']
+
+    with patch('termora.core.history.get_termora_dir') as mock_get_termora_dir:
+        mock_get_termora_dir.return_value = tmp_path / ".termora"
+        reloaded = HistoryManager()
+    assert reloaded.get_repl_history() == ["list files", 'echo "quoted"']
+
+
+def test_repl_history_migrates_and_compacts(tmp_path):
+    """Test that the legacy JSON array is converted and an overgrown file is cut to the kept commands."""
+    termora_dir = tmp_path / ".termora"
+    termora_dir.mkdir()
+    (termora_dir / "repl_history.json").write_text('["a", "b"]')
+
+    with patch('termora.core.history.get_termora_dir') as mock_get_termora_dir, \
+         patch('termora.core.history.MAX_REPL_ENTRIES', 3):
+        mock_get_termora_dir.return_value = termora_dir
+        manager = HistoryManager()
+        assert manager.get_repl_history() == ["a", "b"]
+        assert not (termora_dir / "repl_history.json").exists()
+
+        for i in range(5):
+            manager.add_repl_command(f"cmd{i}")
+        manager.cleanup()
+
+        reloaded = HistoryManager()
+        assert reloaded.get_repl_history() == ["cmd2", "cmd3", "cmd4"]
+        assert (termora_dir / "repl_history.jsonl").read_text().splitlines() == ['"cmd2"', '"cmd3"', '"cmd4"']
+
+
+@pytest.mark.parametrize("command, category", [
+    ("git status", "version_control"),
+    ("  ls -la", "filesystem"),
+    ("git\tstatus", "version_control"),
+    ("kubectl\nget pods", "container"),
+    ("pip install rich", "python_dev"),
+    ("npm test", "node_dev"),
+    ("docker-compose up", "container"),
+    ("gitk", "other"),
+    ("", "other"),
+])
+def test_categorize_command(command, category):
+    """Test that commands are categorized by their first word."""
+    assert _categorize_command(command) == category
+
+
+@pytest.mark.parametrize("code, category", [
+    ("import os\nos.path.join('a', 'b')", "file_operation"),
+    ("import os\nwith open('f') as f:\n    pass", "file_operation"),
+    ("import os.path", "file_operation"),
+    ("import os\nprint(os.getcwd())", "general"),
+    ("import requests\nrequests.get(url)", "networking"),
+    ("from urllib.request import urlopen", "networking"),
+    ("data = urllib.parse.quote(x)", "networking"),
+    ("IMPORT PANDAS AS PD", "data_analysis"),
+    ("x = numpy.zeros(3)", "data_analysis"),
+    ("import subprocess\nsubprocess.run(['ls'])", "system_command"),
+    ("import os, requests\nopen('f')", "file_operation"),
+    ("print('hello')", "general"),
+])
+def test_categorize_python_code(code, category):
+    """Test that Python code is categorized by the markers it contains, in priority order."""
+    assert _categorize_python_code(code) == category
+
+
+def test_python_context_lists_imports(history_manager):
+    """Test that only import statement lines are recorded as imports."""
+    code = "import os\n    from pathlib import Path\nx = 'import nothing'\nimportlib = 1\n"
+    entry = history_manager.add_python_execution(code, "/tmp")
+
+    assert entry["context"]["imports"] == ["import os", "from pathlib import Path"]
+    assert entry["context"]["code_type"] == "general"
+
+
+def test_command_patterns_by_type_and_directory(history_manager):
+    """Test that patterns are counted per action type and per directory, most frequent first."""
+    for directory in ("/a", "/a", "/b"):
+        history_manager.add_command("make", directory)
+    history_manager.add_command("ls", "/a")
+    history_manager.add_python_execution("print(1)", "/a")
+
+    assert history_manager.get_command_patterns() == [{"count": 3, "command": "make"}, {"count": 1, "command": "ls"}]
+    assert history_manager.get_command_patterns(directory="/b") == [{"count": 1, "command": "make"}]
+    assert history_manager.get_command_patterns(action_type="python_code") == [{"count": 1, "code": "print(1)"}]
+    assert history_manager.get_command_patterns(directory="/c") == []
+
+
+def test_search_history_matches_code_and_explanations(history_manager):
+    """Test that Python code and action plan explanations are searchable like commands."""
+    history_manager.add_python_execution("import os\nprint(os.path.basename(p))", "/tmp")
+    plan = MagicMock(explanation="Archive the Old Logs", actions=[])
+    history_manager.add_action_plan(plan, {"executed": True}, "/tmp")
+
+    assert [r["action_type"] for r in history_manager.search_history("os.path")] == ["python_code"]
+    assert [r["action_type"] for r in history_manager.search_history("old logs")] == ["action_plan"]
+    # Every trigram of this query occurs in some entry, but never all of them in one
+    assert history_manager.search_history("logs os.path") == []
+
+
+def test_detect_project(history_manager, tmp_path):
+    """Test that projects are named from the git remote, project files or the directory."""
+    repo = tmp_path / "checkout"
+    (repo / ".git").mkdir(parents=True)
+    config = repo / ".git" / "config"
+    config.write_text('[remote "origin"]\n\turl = https://github.com/someone/termora.git\n')
+    assert history_manager._detect_project(str(repo)) == "termora"
+
+    # A changed config is read again
+    config.write_text('[remote "origin"]\n\turl = git@github.com:someone/renamed\n')
+    os.utime(config, ns=(0, time.time_ns() + 10**9))
+    assert history_manager._detect_project(str(repo)) == "renamed"
+
+    config.unlink()
+    assert history_manager._detect_project(str(repo)) == "checkout"
+
+    node = tmp_path / "web"
+    node.mkdir()
+    assert history_manager._detect_project(str(node)) is None
+    (node / "package.json").write_text("{}")
+    os.utime(node, ns=(0, time.time_ns() + 10**9))
+    assert history_manager._detect_project(str(node)) == "web (Node.js)"
+    assert history_manager._detect_project(str(tmp_path / "missing")) is None
+
+
+def test_history_load_skips_partial_lines(tmp_path):
+    """Test that a line cut short by an interrupted write is skipped on load."""
+    history_dir = tmp_path / ".termora" / "history"
+    history_dir.mkdir(parents=True)
+    (history_dir / "command_history.jsonl").write_text(
+        '{"action_type": "shell_command", "command": "ls", "directory": "/tmp"}\n\n'
+        '{"action_type": "shell_command", "comm'
+    )
+
+    with patch('termora.core.history.get_termora_dir') as mock_get_termora_dir:
+        mock_get_termora_dir.return_value = tmp_path / ".termora"
+        manager = HistoryManager()
+    manager.cleanup()
+
+    assert [entry["command"] for entry in manager.history] == ["ls"]
+    assert [r["command"] for r in manager.search_history("ls")] == ["ls"]
@@ -0,0 +1,421 @@
+"""
+Tests for the pipeline module.
+
+This module contains tests for response parsing helpers in termora.core.pipeline.
+"""
+
+import dataclasses
+import json
+import logging
+import os
+import random
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+
+from termora.core.pipeline import (
+    Action, Intent, TermoraPipeline, TermoraPlan, _INTENT_FIELDS, _JsonObjectScanner, _extract_json, _is_replayable, _load_json_object, _match_fast_intent, _match_fast_rule, _normalize_action,
+    _IntentSchema, _PlanSchema, _validate_model_output
+)
+
+
+def test_intent_to_dict_skips_unset_fields():
+    """Test that to_dict covers every Intent field and omits the ones left as None."""
+    assert _INTENT_FIELDS == tuple(field.name for field in dataclasses.fields(Intent) if field.init)
+
+    intent = Intent(action="find", target_dir="~/Downloads", limit=5)
+    assert intent.to_dict() == {"action": "find", "target_dir": "~/Downloads", "limit": 5, "recursive": True}
+
+
+def test_extract_json_ignores_surrounding_text():
+    """Test that prose before and after the JSON object is ignored."""
+    response = 'Here is the plan:\n{"plan": [{"content": "ls"}]}\nLet me know if you need {more}.'
+    assert _extract_json(response) == '{"plan": [{"content": "ls"}]}'
+
+
+def test_extract_json_braces_in_strings():
+    """Test that braces and escaped quotes inside strings don't end the object early."""
+    response = r'{"content": "find . -exec echo {} \\; \"}\"", "nested": {"a": 1}}'
+    assert _extract_json(response) == response
+    assert orjson.loads(_extract_json(response))["nested"] == {"a": 1}
+
+
+@pytest.mark.parametrize("response", ["no json here", '{"action": "move"'])
+def test_extract_json_missing_or_incomplete(response):
+    """Test that None is returned when there is no complete JSON object."""
+    assert _extract_json(response) is None
+
+
+def test_scanner_handles_streamed_chunks():
+    """Test that the scanner finds the object when it arrives one character at a time."""
+    response = r'Plan: {"content": "echo \"}\" {}", "n": {"a": 1}} trailing'
+    scanner = _JsonObjectScanner()
+
+    results = [scanner.feed(char) for char in response]
+    complete = [result for result in results if result is not None]
+
+    assert complete == [r'{"content": "echo \"}\" {}", "n": {"a": 1}}']
+    # Nothing is reported before the closing brace arrives
+    assert results.index(complete[0]) == response.index(" trailing") - 1
+
+
+def test_as_action_plan_is_built_once():
+    """Test that the ActionPlan is built once, with dictionary actions, and joins the preview text."""
+    plan = TermoraPlan(
+        user_input="list files",
+        intent=Intent(action="list"),
+        reasoning="r",
+        plan=[Action(type="shell_command", content="ls")],
+        preview={"natural_language": "List files", "safety_notes": "Read only"},
+    )
+
+    action_plan = plan.as_action_plan()
+    assert action_plan.actions == [{"type": "shell_command", "content": "ls", "explanation": "", "fallback": None}]
+    assert action_plan.explanation == "List files\n\nRead only"
+    assert action_plan.requires_confirmation
+    assert plan.as_action_plan() is action_plan
+
+
+def test_action_from_dict():
+    """Test that plan entries become actions with defaults filled in and shared type strings."""
+    action = Action.from_dict({"type": "".join(["shell_", "command"]), "content": "ls", "explanation": None})
+    assert action.type is Action(type="shell_command", content="").type
+    assert action.to_dict() == {"type": "shell_command", "content": "ls", "explanation": "", "fallback": None}
+    assert Action.from_dict({"content": "pwd"}).type == "shell_command"
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Move", "move"), (" mv ", "move"), ("remove", "delete"), ("compress", "compress"), (None, "unknown"), ("", "unknown"),
+])
+def test_normalize_action(raw, expected):
+    """Test that action synonyms map to one canonical name and unknown actions pass through."""
+    assert _normalize_action(raw) == expected
+
+
+@pytest.mark.parametrize("request_text, command", [
+    ("list files", "ls -la"),
+    ("  Show me all the hidden files. ", "ls -la"),
+    ("where am I?", "pwd"),
+    ("git status", "git status"),
+])
+def test_fast_rules_match_trivial_requests(request_text, command):
+    """Test that trivial requests get a built-in plan."""
+    plan = _match_fast_rule(request_text)
+    assert plan is not None
+    assert plan.user_input == request_text
+    assert [action.content for action in plan.plan] == [command]
+
+
+@pytest.mark.parametrize("request_text", ["list files larger than 1GB", "show me photos", "", "git push"])
+def test_fast_rules_leave_other_requests_to_the_model(request_text):
+    """Test that anything beyond the exact trivial requests isn't matched."""
+    assert _match_fast_rule(request_text) is None
+
+
+def test_intent_is_hashable():
+    """Test that equal intents, including their filters, hash alike and can't be modified."""
+    a = Intent(action="find", file_filter={"extensions": [".py"]}, time_filter={"older_than": "7d"})
+    b = Intent(action="find", file_filter={"extensions": [".py"]}, time_filter={"older_than": "7d"})
+
+    assert a == b and hash(a) == hash(b)
+    assert {a: "plan"}[b] == "plan"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        a.action = "delete"
+
+
+def test_intent_prompt_json_is_reused():
+    """Test that the prompt JSON matches the intent and is only built once."""
+    intent = Intent(action="count", target_dir="src", file_filter={"extensions": [".py"]})
+
+    first = intent.as_prompt_json()
+    assert orjson.loads(first) == {"action": "count", "target_dir": "src", "file_filter": {"extensions": [".py"]}, "recursive": True}
+    assert intent.as_prompt_json() is first
+    assert "\n" not in first and ", " not in first
+    assert intent == Intent(action="count", target_dir="src", file_filter={"extensions": [".py"]})
+
+    # An equal intent, such as one rebuilt from the intent cache, reuses the same JSON
+    rebuilt = Intent(action="count", target_dir="src", file_filter={"extensions": [".py"]})
+    assert rebuilt.as_prompt_json() is first
+
+
+def test_validate_model_output_drops_invalid_optional_fields():
+    """Test that badly typed optional fields are dropped while the rest is kept."""
+    data = {"action": "find", "limit": "ten", "file_filter": {"name_pattern": "*.py"}, "note": "kept"}
+
+    assert _validate_model_output(_IntentSchema, data, ("action",)) == {
+        "action": "find", "file_filter": {"name_pattern": "*.py"}, "note": "kept"
+    }
+
+
+def test_validate_model_output_rejects_invalid_required_fields():
+    """Test that output missing what the pipeline needs is rejected."""
+    assert _validate_model_output(_PlanSchema, {"plan": [{"explanation": "no command"}]}, ("plan",)) is None
+    assert _validate_model_output(_IntentSchema, {"action": ["move"]}, ("action",)) is None
+    assert _validate_model_output(_PlanSchema, ["not", "an", "object"], ("plan",)) is None
+
+
+@pytest.mark.parametrize("actions, expected", [
+    ([{"type": "shell_command", "content": "find . -name '*.py'"}], True),
+    ([{"type": "shell_command", "content": "ls"}, {"type": "shell_command", "content": "rm -rf build"}], False),
+    ([{"type": "python_code", "content": "print(1)"}], False),
+    ([], False),
+])
+def test_is_replayable(actions, expected):
+    """Test that only non-destructive shell plans are reused for similar requests."""
+    plan = TermoraPlan(user_input="x", intent=Intent(action="find"), reasoning="", plan=[Action.from_dict(action) for action in actions], preview={})
+    assert _is_replayable(plan) is expected
+
+
+def test_load_json_object_skips_invalid_blocks():
+    """Test that brace-delimited prose before the answer doesn't hide the real JSON."""
+    response = 'Fill in {target} and {"unterminated": } then: {"action": "find"} and {"action": "ignored"}'
+    assert _load_json_object(response) == {"action": "find"}
+    assert _load_json_object("no json {here}") is None
+    assert _load_json_object('{"open": ') is None
+
+
+def test_scanner_matches_whole_text_for_any_chunking():
+    """Test that splitting the response differently never changes the object found."""
+    response = r'Sure {x} here: {"a": "b\\\"}{", "c": [{"d": "é"}], "e": "\\"} done {"f": 1}'
+    expected = _extract_json(response)
+    rng = random.Random(0)
+
+    for _ in range(200):
+        scanner = _JsonObjectScanner()
+        cuts = sorted(rng.sample(range(1, len(response)), rng.randint(1, 12)))
+        pieces = [response[i:j] for i, j in zip([0] + cuts, cuts + [len(response)])]
+        found = [result for result in map(scanner.feed, pieces) if result is not None]
+        assert found[0] == expected
+        assert scanner.text == response
+
+
+def test_load_json_object_marker_skips_other_objects():
+    """Test that objects without the expected key are passed over without parsing."""
+    response = 'Example: {"action": "move"} Answer: {"plan": [{"content": "ls"}]}'
+    assert _load_json_object(response, '"plan"') == {"plan": [{"content": "ls"}]}
+    assert _load_json_object("Nothing {here} or {there}", '"plan"') is None
+
+
+@pytest.mark.parametrize("request_text, action, target", [
+    ("count files in ~/Downloads", "count", "~/Downloads"),
+    ("How many files are there?", "count", "."),
+    ("list the files in 'My Documents'", "list", "My Documents"),
+    ("show disk usage", "disk_usage", "."),
+])
+def test_fast_intents(request_text, action, target):
+    """Test that common requests get their intent without the model, keeping path case."""
+    intent, _ = _match_fast_intent(request_text)
+    assert (intent.action, intent.target_dir) == (action, target)
+
+
+def test_fast_intents_leave_other_requests_to_the_model():
+    """Test that requests with extra conditions aren't matched."""
+    assert _match_fast_intent("count files modified yesterday in src") is None
+    assert _match_fast_intent("move all screenshots to archive") is None
+    assert _match_fast_intent("list files owned by root") is None
+
+
+@pytest.fixture
+def pipeline():
+    """Create a pipeline whose components are mocks."""
+    context_provider = MagicMock(os_name="Linux", os_version="6.1")
+    pipeline = TermoraPipeline(MagicMock(config={}), MagicMock(), context_provider, MagicMock(), MagicMock())
+    yield pipeline
+    pipeline.cleanup()
+
+
+def test_prompts_keep_static_prefix(pipeline):
+    """Test that only the user message varies between requests, ending with the request-specific parts."""
+    first = {"prompt_context": "CONTEXT A"}
+    second = {"prompt_context": "CONTEXT B"}
+
+    system_a, prompt_a = pipeline._create_intent_extraction_prompt("list files", first)
+    system_b, prompt_b = pipeline._create_intent_extraction_prompt("count files", second)
+    assert system_a is system_b
+    assert prompt_a.startswith("CONTEXT A") and prompt_a.rstrip().endswith("list files")
+
+    intent = Intent(action="count")
+    system_a, _ = pipeline._create_plan_generation_prompt(intent, "r", "count files", first)
+    system_b, prompt_b = pipeline._create_plan_generation_prompt(intent, "r", "count files", second)
+    assert system_a is system_b and "Linux" in system_a
+    assert prompt_b.index("CONTEXT B") < prompt_b.index("USER REQUEST") < prompt_b.index("EXTRACTED INTENT")
+
+
+def test_plan_prompt_extends_request_prompt_with_os_guidance(pipeline):
+    """Test that the plan prompt starts with the intent prompt and the system prompt carries the OS guidance."""
+    context = {"prompt_context": "CONTEXT"}
+    _, request_prompt = pipeline._create_intent_extraction_prompt("find {braces}", context)
+    _, plan_prompt = pipeline._create_plan_generation_prompt(Intent(action="find"), "r", "find {braces}", context)
+    assert plan_prompt.startswith(request_prompt)
+
+    mac = TermoraPipeline(MagicMock(config={}), MagicMock(), MagicMock(os_name="Darwin", os_version="14"),
+                          MagicMock(), MagicMock())
+    assert "BSD" in mac._plan_system_prompt and "BSD" not in pipeline._plan_system_prompt
+    mac.cleanup()
+
+
+def test_repeated_prompts_are_reused(pipeline):
+    """Test that an identical request in an unchanged context gets the very same prompt string."""
+    context = {"prompt_context": "CONTEXT"}
+    intent = Intent(action="find")
+
+    assert pipeline._create_intent_extraction_prompt("find logs", context)[1] is \
+        pipeline._create_intent_extraction_prompt("find logs", dict(context))[1]
+    assert pipeline._create_plan_generation_prompt(intent, "r", "find logs", context)[1] is \
+        pipeline._create_plan_generation_prompt(intent, "r", "find logs", dict(context))[1]
+    assert pipeline._create_intent_extraction_prompt("find logs", {"prompt_context": "OTHER"})[1].startswith("OTHER")
+
+
+def test_fused_call_without_plan_falls_back_to_plan_generation(pipeline):
+    """Test that an empty plan from the fused call is generated again from the extracted intent."""
+    fused = '{"intent": {"action": "count", "target_dir": "src"}, "plan": []}'
+    planned = '{"plan": [{"type": "shell_command", "content": "ls src | wc -l"}]}'
+    pipeline._get_completion = MagicMock(side_effect=[fused, planned])
+
+    plan = pipeline._extract_intent_and_plan("count files in src", {"prompt_context": "CTX", "cwd": "/tmp"})
+
+    assert plan.intent.action == "count"
+    assert [action.content for action in plan.plan] == ["ls src | wc -l"]
+    assert pipeline._get_completion.call_count == 2
+    assert "EXTRACTED INTENT" in pipeline._get_completion.call_args.args[0]
+
+
+@pytest.mark.parametrize("response", [
+    '  {"action": "find", "target_dir": "."}\n',
+    '{"action": "find", "target_dir": "."} and {"note": "}"}',
+    'Sure: {"action": "find", "target_dir": "."}',
+])
+def test_load_json_object_with_and_without_surrounding_text(response):
+    """Test that bare objects and objects in prose parse to the same first object."""
+    assert _load_json_object(response, '"action"') == {"action": "find", "target_dir": "."}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="built-in commands are POSIX")
+def test_fast_path_skips_context_gathering(pipeline):
+    """Test that a request answered by a built-in rule doesn't gather context or call the model."""
+    pipeline.executor.execute_plan.return_value = {"executed": False, "reason": "Cancelled by user"}
+
+    result = pipeline.process("list files")
+
+    assert result["path"] == "fast"
+    pipeline.context_provider.get_context.assert_not_called()
+    pipeline.history_manager.search_history.assert_not_called()
+    pipeline.agent.get_raw_completion.assert_not_called()
+    pipeline.history_manager.add_repl_command.assert_called_once_with("list files")
+
+
+def test_streamed_completion_waits_for_answer_object(pipeline):
+    """Test that example objects before the answer don't end the stream early."""
+    stream = MagicMock()
+    stream.__iter__.return_value = iter(['Example: {"type": "shell_com', 'mand"}. Answer: {"plan": [{"con',
+                                         'tent": "ls"}]} trailing', ' commentary'])
+    pipeline.agent.stream_raw_completion.return_value = stream
+
+    response = pipeline._get_completion("prompt", system_prompt="system", marker='"plan"')
+
+    assert response == '{"plan": [{"content": "ls"}]}'
+    stream.close.assert_called_once()
+
+
+def test_plan_backup_paths_default_to_separate_lists():
+    """Test that plans created without backup paths each get their own empty list."""
+    first = TermoraPlan(user_input="a", intent=Intent(action="list"), reasoning="", plan=[], preview={})
+    second = TermoraPlan(user_input="b", intent=Intent(action="list"), reasoning="", plan=[], preview={})
+
+    first.backup_paths.append("/tmp/x")
+    assert second.to_dict()["backup_paths"] == []
+
+
+def test_executor_is_prewarmed_with_intent_paths(pipeline):
+    """Test that the executor is prepared for the intent's paths before the plan is generated."""
+    pipeline._get_completion = MagicMock(return_value='{"plan": [{"type": "shell_command", "content": "ls src | wc -l"}]}')
+    pipeline.executor.execute_plan.return_value = {"executed": False}
+    pipeline.context_provider.get_context.return_value = {}
+    pipeline.history_manager.search_history.return_value = []
+
+    result = pipeline.process("count files in src")
+    pipeline._pool.shutdown(wait=True)
+
+    assert result["path"] == "llm"
+    pipeline.executor.prewarm.assert_called_once_with([os.path.join(os.getcwd(), "src")])
+
+
+def test_debug_steps_are_traced_without_pausing(tmp_path, monkeypatch):
+    """Test that debug steps are recorded and written to the trace file instead of waiting for Enter."""
+    monkeypatch.delenv("TERMORA_DEBUG_PAUSE", raising=False)
+    pipeline = TermoraPipeline(MagicMock(config={}), MagicMock(), MagicMock(), MagicMock(), MagicMock(), debug=True)
+    pipeline.console = MagicMock()
+
+    with patch('termora.core.pipeline.get_termora_dir', return_value=tmp_path), \
+         patch('builtins.input', side_effect=AssertionError("paused")):
+        pipeline._debug_step("Input", {"user_input": "list files"})
+        pipeline._debug_step("Error", "boom")
+    pipeline.cleanup()
+
+    assert [(entry["step"], entry["data"]) for entry in pipeline.dump_trace()] == [
+        ("Input", {"user_input": "list files"}), ("Error", "boom")
+    ]
+    (trace_file,) = (tmp_path / "traces").iterdir()
+    assert [orjson.loads(line)["step"] for line in trace_file.read_bytes().splitlines()] == ["Input", "Error"]
+
+
+def test_invalid_generated_command_is_not_executed(pipeline):
+    """Test that a plan with a broken command is rejected before it reaches the executor."""
+    pipeline._get_completion = MagicMock(return_value='{"plan": [{"type": "shell_command", "content": "echo \'oops"}]}')
+    pipeline.context_provider.get_context.return_value = {}
+    pipeline.history_manager.search_history.return_value = []
+
+    result = pipeline.process("count files in src")
+
+    assert result["executed"] is False
+    assert "unmatched single quote" in result["reason"]
+    pipeline.executor.execute_plan.assert_not_called()
+
+
+def test_distinct_history_keeps_distinct_action_plans(pipeline):
+    """Test that action plan entries are told apart by their commands, keeping the latest of each."""
+    def plan(explanation, *commands):
+        return {"action_type": "action_plan", "explanation": explanation,
+                "actions": [{"type": "shell_command", "content": command} for command in commands]}
+
+    entries = [plan("List files", "ls -la"), plan("Count files", "ls | wc -l"),
+               plan("List files again", "ls -la"), plan("Show usage", "du -sh .")]
+
+    assert [entry["explanation"] for entry in pipeline._distinct_history(entries)] == [
+        "List files", "Count files", "Show usage"
+    ]
+
+
+def test_pipeline_error_reports_error_details(pipeline, caplog):
+    """Test that a pipeline error returns its traceback as a string and the result stays JSON-serializable."""
+    pipeline._parse_input = MagicMock(side_effect=ValueError("bad plan"))
+
+    with caplog.at_level(logging.DEBUG, logger="termora.core.pipeline"):
+        result = pipeline.process("list files")
+
+    assert result["executed"] is False and result["reason"] == "Pipeline error: bad plan"
+    assert result["error_details"].startswith("Traceback") and "ValueError: bad plan" in result["error_details"]
+    json.dumps(result)
+
+
+def test_pipeline_error_skips_traceback_without_debug(pipeline, caplog):
+    """Test that the traceback isn't formatted when neither debug mode nor debug logging is on."""
+    pipeline._parse_input = MagicMock(side_effect=ValueError("bad plan"))
+
+    with caplog.at_level(logging.WARNING, logger="termora.core.pipeline"), \
+         patch("termora.core.pipeline.traceback.format_exc") as format_exc:
+        result = pipeline.process("list files")
+
+    format_exc.assert_not_called()
+    assert result == {"executed": False, "reason": "Pipeline error: bad plan", "error_details": "bad plan"}
+
+
+def test_pipeline_registers_no_exit_hooks():
+    """Test that creating a pipeline doesn't register exit hooks that would keep it alive."""
+    with patch("atexit.register") as register:
+        pipeline = TermoraPipeline(MagicMock(config={}), MagicMock(), MagicMock(), MagicMock(), MagicMock())
+    register.assert_not_called()
+
+    pipeline.cleanup()
+    assert pipeline._io_pool._shutdown
@@ -9,10 +9,14 @@ import json
 import tempfile
 import tarfile
 import shutil
+from datetime import datetime
 from pathlib import Path
 import pytest
 from unittest.mock import patch, MagicMock
 
+from rich.console import Console
+
+from termora.core.archive import gnu_tar
 from termora.core.rollback import RollbackManager
 
 
@@ -88,6 +92,11 @@ def rollback_manager(test_environment):
     return RollbackManager()
 
 
+def test_console_is_shared_console(rollback_manager):
+    """Test that the manager prints through a real, shared Console."""
+    assert isinstance(rollback_manager.console, Console)
+    assert RollbackManager().console is rollback_manager.console
+
 def test_list_backups(rollback_manager, test_environment):
     """Test that list_backups correctly identifies backup files."""
     # Call list_backups
@@ -99,6 +108,19 @@ def test_list_backups(rollback_manager, test_environment):
     assert backups[0]["timestamp"] == "2023-01-01 12:00:00"
 
 
+def test_list_backups_dates_unparseable_names_by_mtime(rollback_manager, test_environment):
+    """Test that a backup whose name has no valid timestamp is dated by its modification time."""
+    odd = test_environment["mock_backup_dir"] / "backup_manual.tar.gz"
+    shutil.copy(test_environment["backup_path"], odd)
+    os.utime(odd, (1_600_000_000, 1_600_000_000))
+    (test_environment["mock_backup_dir"] / "backup_dir.tar.gz").mkdir()
+
+    backups = {backup["id"]: backup for backup in rollback_manager.list_backups()}
+
+    assert set(backups) == {"backup_20230101_120000.tar.gz", "backup_manual.tar.gz"}
+    assert backups["backup_manual.tar.gz"]["timestamp"] == datetime.fromtimestamp(1_600_000_000).strftime("%Y-%m-%d %H:%M:%S")
+    assert backups["backup_manual.tar.gz"]["path"] == str(odd)
+
 def test_get_last_execution(rollback_manager, test_environment):
     """Test that get_last_execution returns the last execution info."""
     # Call get_last_execution
@@ -149,8 +171,9 @@ def test_restore_from_backup(rollback_manager, test_environment):
     target_dir = test_environment["temp_path"] / "restore_target"
     target_dir.mkdir(parents=True, exist_ok=True)
     
-    # Create a patching context
+    # Create a patching context; the extract-and-copy path is used when GNU tar isn't installed
     with patch.object(Path, "__new__") as mock_path_new, \
+         patch("termora.core.rollback.gnu_tar", return_value=None), \
          patch.object(rollback_manager, "console"), \
          patch("tarfile.open"), \
          patch("shutil.copy2"), \
@@ -188,4 +211,93 @@ def test_restore_from_backup(rollback_manager, test_environment):
             result = rollback_manager._restore_from_backup(str(test_environment["backup_path"]))
         
         # Verify the result
-        assert result is True
\ No newline at end of file
+        assert result is True
+
+@pytest.mark.parametrize("use_tar", [True, False])
+def test_rollback_many_applies_backups_in_order(rollback_manager, test_environment, use_tar):
+    """Test that several backups are restored to their original paths, the last one winning on overlap."""
+    if use_tar and gnu_tar() is None:
+        pytest.skip("GNU tar is not installed")
+    target = test_environment["test_content_dir"] / "file1.txt"
+    other = test_environment["test_content_dir"] / "file2.txt"
+    backup_dir = test_environment["mock_backup_dir"]
+
+    # Members are stored relative to the root, the way the executor writes them
+    for backup_id, files in (("backup_20230101_130000.tar.gz", {target: "first", other: "kept"}),
+                             ("backup_20230101_140000.tar.gz", {target: "second"})):
+        staging = Path(tempfile.mkdtemp(dir=test_environment["temp_dir"]))
+        with tarfile.open(backup_dir / backup_id, "w:gz") as tar:
+            for path, content in files.items():
+                (staging / path.name).write_text(content)
+                tar.add(staging / path.name, arcname=str(path).lstrip("/"))
+
+    target.write_text("changed")
+    other.write_text("changed")
+
+    with patch.object(rollback_manager, "console"), \
+         patch("termora.core.rollback.gnu_tar", return_value=gnu_tar() if use_tar else None):
+        assert rollback_manager.rollback_many(["backup_20230101_130000.tar.gz", "backup_20230101_140000.tar.gz"])
+        assert not rollback_manager.rollback_many(["backup_missing.tar.gz"])
+
+    assert target.read_text() == "second"
+    assert other.read_text() == "kept"
+
+
+def test_copy_back_falls_back_to_copy_across_filesystems(rollback_manager, test_environment):
+    """Test that files are copied when they can't be renamed into place."""
+    import errno
+
+    temp_path = test_environment["temp_path"] / "extracted"
+    target = test_environment["test_content_dir"] / "file1.txt"
+    source = temp_path / str(target).lstrip("/")
+    source.parent.mkdir(parents=True)
+    source.write_text("restored")
+
+    advance = MagicMock()
+    with patch("termora.core.rollback.os.replace", side_effect=OSError(errno.EXDEV, "cross-device link")):
+        rollback_manager._copy_back(temp_path, [source], advance)
+
+    assert target.read_text() == "restored"
+    advance.assert_called_once_with()
+
+
+def test_save_execution_history_round_trip(rollback_manager, test_environment):
+    """Test that saved executions are read back, newest last, and the file stays plain JSON."""
+    rollback_manager.save_execution_history({"commands": ["ls"], "backup_path": None,
+                                             "outputs": [{"success": True}]})
+
+    last = rollback_manager.get_last_execution()
+    assert last["commands"] == ["ls"] and last["success"] is True
+
+    with open(test_environment["mock_history_file"]) as f:
+        assert len(json.load(f)) == 2
+
+    test_environment["mock_history_file"].write_text("{not json")
+    assert rollback_manager.get_last_execution() is None
+
+
+def test_list_backups_is_cached_until_the_directory_changes(rollback_manager, test_environment):
+    """Test that the backup directory is only scanned again after a backup is added."""
+    backup_dir = test_environment["mock_backup_dir"]
+    os.utime(backup_dir, (1_600_000_000, 1_600_000_000))
+
+    with patch.object(rollback_manager, "_scan_backups", wraps=rollback_manager._scan_backups) as scan:
+        first = rollback_manager.list_backups()
+        first[0]["id"] = "modified by caller"
+        assert rollback_manager.list_backups()[0]["id"] == "backup_20230101_120000.tar.gz"
+        assert scan.call_count == 1
+
+        shutil.copy(test_environment["backup_path"], backup_dir / "backup_20230102_120000.tar.gz")
+        os.utime(backup_dir, (1_600_000_100, 1_600_000_100))
+        assert len(rollback_manager.list_backups()) == 2
+        assert scan.call_count == 2
+
+
+def test_list_backups_newest_first(rollback_manager, test_environment):
+    """Test that backups are ordered by the timestamp in their names, newest first."""
+    for name in ("backup_20221231_235959.tar.gz", "backup_20230101_120001.tar.gz"):
+        shutil.copy(test_environment["backup_path"], test_environment["mock_backup_dir"] / name)
+
+    assert [backup["id"] for backup in rollback_manager.list_backups()] == [
+        "backup_20230101_120001.tar.gz", "backup_20230101_120000.tar.gz", "backup_20221231_235959.tar.gz"
+    ]
@@ -6,10 +6,12 @@ for tasks like path resolution, timestamp formatting, and system information.
 """
 
 import os
+import mmap
 import platform
 import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, Optional
+from typing import List, Union, Optional
 
 def get_termora_dir() -> Path:
     """
@@ -49,17 +51,20 @@ def resolve_path(path_str: str) -> Path:
     # Converting to absolute path 
     return Path(path_str).absolute()
 
-def get_timestamp(format_str: str = "%Y-%m-%d %H:%M:%S") -> str:
+def get_timestamp(format_str: str = "%Y-%m-%d %H:%M:%S", unix_ts: Optional[float] = None) -> str:
     """
     Get a formatted timestamp string.
     
     Args:
         format_str: The datetime format string (default: "%Y-%m-%d %H:%M:%S")
+        unix_ts: Unix time to format instead of the current time (optional)
         
     Returns:
         str: A formatted timestamp string
     """
-    return datetime.datetime.now().strftime(format_str)
+    if unix_ts is None:
+        return datetime.datetime.now().strftime(format_str)
+    return datetime.datetime.fromtimestamp(unix_ts).strftime(format_str)
         
 def get_system_info() -> dict:
     """
@@ -68,6 +73,11 @@ def get_system_info() -> dict:
     Returns:
         dict: A dictionary containing system information
     """
+    return dict(_system_info())
+
+@lru_cache(maxsize=1)
+def _system_info() -> dict:
+    """System information doesn't change while Termora runs, so it is looked up once."""
     return {
         "os": platform.system(),
         "os_version": platform.version(),
@@ -76,6 +86,56 @@ def get_system_info() -> dict:
         "hostname": platform.node()
     }
     
+def read_tail_lines(path: Union[str, Path], max_lines: int, max_bytes: int = 1024 * 1024) -> List[str]:
+    """
+    Read the last lines of a file without loading the whole file.
+    
+    The file is memory-mapped and scanned backwards for newlines, never looking
+    further back than max_bytes, so very large files cost O(1) memory.
+    
+    Args:
+        path: Path to the file
+        max_lines: Maximum number of lines to return
+        max_bytes: Maximum number of bytes to scan from the end of the file
+        
+    Returns:
+        The last lines of the file, oldest first
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            floor = max(0, size - max_bytes)
+            end = size
+            
+            # Drop the terminator of the last line, so it doesn't count as an empty line.
+            # Blank lines before it are real (empty) lines and are kept.
+            if mm[end - 1] == ord('\n'):
+                end -= 1
+            
+            # Walk back one newline per line; the oldest kept line starts just after the last one found
+            start = end
+            for _ in range(max_lines):
+                newline = mm.rfind(b'\n', floor, start)
+                if newline < 0:
+                    start = floor
+                    break
+                start = newline
+            else:
+                start += 1
+            
+            data = mm[start:end]
+            truncated = start == floor and floor > 0 and mm[floor - 1] != ord('\n')
+    
+    lines = data.decode('utf-8', errors='ignore').split('\n')
+    if truncated and lines:
+        # The first line was cut by the byte cap
+        lines = lines[1:]
+    
+    return lines[-max_lines:]
+
 def is_destructive_command(command: str) -> bool:
     """
     Check if a command is potentially destructive.